@@ -1555,6 +1555,8 @@ from frappe.config import get_common_site_config, get_conf, get_site_config
 from frappe.core.doctype.system_settings.system_settings import get_system_settings
 from frappe.model.document import (
 	get_doc,
+	get_docs,
+	bulk_insert_validated,
 	get_lazy_doc,
 	copy_doc,
 	new_doc,
@@ -53,6 +53,7 @@ user_cache_keys = (
 	"lang",
 	"defaults",
 	"user_permissions",
+	"user_permission_predicates",
 	"home_page",
 	"linked_with",
 	"desktop_icons",
@@ -132,7 +133,8 @@ def _clear_doctype_cache_from_redis(doctype: str | None = None):
 	from frappe.email.doctype.notification.notification import clear_notification_cache
 	from frappe.model.meta import clear_meta_cache
 
-	to_del = ["is_table", "doctype_modules"]
+	# compiled user permission conditions depend on link fields of any doctype
+	to_del = ["is_table", "doctype_modules", "user_permission_predicates"]
 
 	if doctype:
 
@@ -9,6 +9,7 @@ import frappe.desk.query_report
 from frappe import _, scrub
 from frappe.core.doctype.custom_role.custom_role import get_custom_allowed_roles
 from frappe.core.doctype.page.page import delete_custom_role
+from frappe.desk.report_cache import clear_report_cache
 from frappe.desk.reportview import append_totals_row
 from frappe.model.document import Document
 from frappe.modules import make_boilerplate
@@ -31,6 +32,9 @@ class Report(Document):
 
 		add_total_row: DF.Check
 		add_translate_data: DF.Check
+		cache_result: DF.Check
+		cache_source_doctypes: DF.SmallText | None
+		cache_ttl: DF.Int
 		columns: DF.Table[ReportColumn]
 		disabled: DF.Check
 		filters: DF.Table[ReportFilter]
@@ -47,6 +51,7 @@ class Report(Document):
 		report_script: DF.Code | None
 		report_type: DF.Literal["Report Builder", "Query Report", "Script Report", "Custom Report"]
 		roles: DF.Table[HasRole]
+		share_cached_result: DF.Check
 		timeout: DF.Int
 	# end: auto-generated types
 
@@ -82,6 +87,7 @@ class Report(Document):
 
 	def on_update(self):
 		self.export_doc()
+		clear_report_cache(self.reference_report or self.name)
 
 	def before_export(self, doc):
 		doc.letterhead = None
@@ -96,6 +102,7 @@ class Report(Document):
 		):
 			frappe.throw(_("You are not allowed to delete Standard Report"))
 		delete_custom_role("report", self.name)
+		clear_report_cache(self.reference_report or self.name)
 
 	def get_permission_log_options(self, event=None):
 		return {"fields": ["roles"]}
@@ -4,11 +4,14 @@
 import json
 import os
 import textwrap
+from unittest.mock import patch
 
 import frappe
 from frappe.core.doctype.user_permission.test_user_permission import create_user
 from frappe.custom.doctype.customize_form.customize_form import reset_customization
+from frappe.desk import query_report
 from frappe.desk.query_report import add_total_row, run, save_report
+from frappe.desk.report_cache import clear_stale_report_results, get_result_cache_key
 from frappe.desk.reportview import delete_report
 from frappe.desk.reportview import save_report as _save_report
 from frappe.tests import IntegrationTestCase
@@ -436,3 +439,54 @@ result = [
 			self.assertGreaterEqual(len(rows), 1)
 		elif frappe.db.db_type == "postgres":
 			self.assertRaises(frappe.PermissionError, report.execute_query_report, filters={})
+
+	def test_cached_report_result(self):
+		report_name = "Test Cached Script Report"
+		if frappe.db.exists("Report", report_name):
+			frappe.delete_doc("Report", report_name)
+
+		frappe.get_doc(
+			{
+				"doctype": "Report",
+				"ref_doctype": "ToDo",
+				"report_name": report_name,
+				"report_type": "Script Report",
+				"is_standard": "No",
+				"cache_result": 1,
+				"cache_source_doctypes": "Note",
+				"report_script": textwrap.dedent(
+					"""
+					columns = [{"fieldname": "count", "label": "Count", "fieldtype": "Int"}]
+					data = columns, [{"count": frappe.db.count("Note")}]
+					"""
+				),
+			}
+		).insert(ignore_permissions=True)
+
+		with patch(
+			"frappe.desk.query_report.get_report_result", wraps=query_report.get_report_result
+		) as get_report_result:
+			count = run(report_name)["result"][0]["count"]
+			self.assertEqual(run(report_name)["result"][0]["count"], count)
+			self.assertEqual(get_report_result.call_count, 1)
+
+			# writes to source doctypes clear cached results once committed
+			frappe.get_doc(doctype="Note", title="Cached Report Note").insert()
+			clear_stale_report_results()
+			self.assertEqual(run(report_name)["result"][0]["count"], count + 1)
+			self.assertEqual(get_report_result.call_count, 2)
+
+	def test_cached_report_result_is_per_user(self):
+		report = frappe._dict(name="Test Cached Report", share_cached_result=0)
+		with (
+			patch("frappe.get_roles", return_value=["System Manager"]),
+			patch(
+				"frappe.core.doctype.user_permission.user_permission.get_user_permissions",
+				return_value={},
+			),
+		):
+			users = ("a@example.com", "b@example.com")
+			self.assertEqual(len({get_result_cache_key(report, {}, user) for user in users}), 2)
+
+			report.share_cached_result = 1
+			self.assertEqual(len({get_result_cache_key(report, {}, user) for user in users}), 1)
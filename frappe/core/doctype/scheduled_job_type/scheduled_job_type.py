@@ -72,13 +72,7 @@ class ScheduledJobType(Document):
 		# enqueue event if last execution is done
 		if self.is_event_due() or force:
 			if not self.is_job_in_queue():
-				enqueue(
-					"frappe.core.doctype.scheduled_job_type.scheduled_job_type.run_scheduled_job",
-					queue=self.get_queue_name(),
-					job_type=self.method,  # Not actually used, kept for logging
-					job_id=self.rq_job_id,
-					scheduled_job_type=self.name,
-				)
+				self.enqueue_job()
 				return True
 			else:
 				frappe.logger("scheduler").error(
@@ -87,6 +81,16 @@ class ScheduledJobType(Document):
 
 		return False
 
+	def enqueue_job(self) -> None:
+		"""Enqueue the job without checking if it is due or already in queue."""
+		enqueue(
+			"frappe.core.doctype.scheduled_job_type.scheduled_job_type.run_scheduled_job",
+			queue=self.get_queue_name(),
+			job_type=self.method,  # Not actually used, kept for logging
+			job_id=self.rq_job_id,
+			scheduled_job_type=self.name,
+		)
+
 	def is_event_due(self, current_time=None):
 		"""Return true if event is due based on time lapsed since last execution"""
 		# if the next scheduled event is before NOW, then its due!
@@ -34,11 +34,11 @@ class UserPermission(Document):
 		self.validate_default_permission()
 
 	def on_update(self):
-		frappe.cache.hdel("user_permissions", self.user)
+		clear_user_permissions_cache(self.user)
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def on_trash(self):
-		frappe.cache.hdel("user_permissions", self.user)
+		clear_user_permissions_cache(self.user)
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def validate_user_permission(self):
@@ -147,6 +147,11 @@ def get_user_permissions(user=None):
 	return out
 
 
+def clear_user_permissions_cache(user: str):
+	"""Clear cached user permissions and conditions compiled from them, see `DatabaseQuery`."""
+	frappe.cache.hdel_names(["user_permissions", "user_permission_predicates"], user)
+
+
 def user_permission_exists(user, allow, for_value, applicable_for=None):
 	"""Checks if similar user permission already exists"""
 	user_permissions = get_user_permissions(user).get(allow, [])
@@ -345,3 +350,8 @@ def update_applicable(already_applied, to_apply, user, doctype, docname):
 					"user": user,
 				},
 			)
+
+
+def on_doctype_update():
+	"""Index for permission subqueries in `DatabaseQuery.get_user_permission_subquery_condition`"""
+	frappe.db.add_index("User Permission", ["user", "allow"])
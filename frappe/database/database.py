@@ -18,6 +18,7 @@ from pypika.queries import QueryBuilder
 import frappe
 import frappe.defaults
 from frappe import _, _dict
+from frappe.database.row import ROWS, Row, get_row_class
 from frappe.database.utils import (
 	DefaultOrderBy,
 	EmptyQueryValues,
@@ -30,6 +31,7 @@ from frappe.database.utils import (
 	get_query_type,
 	is_query_type,
 )
+from frappe.database.write_batch import WriteBatch
 from frappe.exceptions import DoesNotExistError, ImplicitCommitError
 from frappe.monitor import get_trace_id
 from frappe.query_builder import Case
@@ -37,6 +39,7 @@ from frappe.query_builder.functions import Count
 from frappe.utils import (
 	CallbackManager,
 	cint,
+	cstr,
 	get_datetime,
 	get_table_name,
 	getdate,
@@ -74,6 +77,9 @@ QUERY_TYPES_FOR_LOG_TOUCHED_TABLES = frozenset(("insert", "delete", "update", "a
 
 SQL_ITERATOR_BATCH_SIZE = 1000
 
+# Tables which are read and written through their own caches.
+DOCTYPES_WITHOUT_ROW_CACHE = frozenset(("DocType", "DocField", "DocPerm", "Custom Field", "Property Setter"))
+
 
 TRANSACTION_DISABLED_MSG = """Commit/rollback are disabled during certain events. This command will
 be ignored. Commit/Rollback from here WILL CAUSE very hard to debug problems with atomicity and
@@ -119,9 +125,16 @@ class Database:
 		self._conn = None
 
 		self.transaction_writes = 0
+		# Time at which first query of current transaction was executed, see `invalidate_row_cache`.
+		self._transaction_started_at: float | None = None
 		self.auto_commit_on_many_writes = 0
 
 		self.value_cache = recursive_defaultdict()
+		# Rows written in current transaction, see `invalidate_row_cache`.
+		self._row_cache_invalidations: set[tuple[str, str | None]] = set()
+		self._row_cache_dirty_doctypes: set[str] = set()
+		# Document writes buffered by `batch_writes`.
+		self.write_batch: WriteBatch | None = None
 		self.logger = frappe.logger("database")
 		self.logger.setLevel("WARNING")
 
@@ -143,7 +156,7 @@ class Database:
 	def connect(self):
 		"""Connects to a database as set in `site_config.json`."""
 		self._conn: MySQLdbConnection | MariadbConnection | PostgresConnection | SQLiteConnection = (
-			self.get_connection()
+			self.checkout_connection()
 		)
 		self._cursor: MySQLdbCursor | MariadbCursor | PostgresCursor | SQLiteCursor = self._conn.cursor()
 
@@ -167,6 +180,24 @@ class Database:
 		"""Return a Database connection object that conforms with https://peps.python.org/pep-0249/#connection-objects."""
 		raise NotImplementedError
 
+	def checkout_connection(self):
+		"""Return a connection from the connection pool if pooling is enabled, else a new connection."""
+		from frappe.database.pool import _close_quietly, get_pool
+
+		if pool := get_pool(self):
+			while conn := pool.get():
+				if self.reset_connection(conn):
+					return conn
+				_close_quietly(conn)
+
+		return self.get_connection()
+
+	def reset_connection(self, conn) -> bool:
+		"""Reset session state of a pooled connection before reuse.
+
+		Return False if the connection is no longer usable."""
+		raise NotImplementedError
+
 	def get_database_size(self):
 		raise NotImplementedError
 
@@ -194,12 +225,14 @@ class Database:
 		run=True,
 		pluck=False,
 		as_iterator=False,
+		batch_size=None,
 	):
 		"""Execute a SQL query and fetch all rows.
 
 		:param query: SQL query.
 		:param values: Tuple / List / Dict of values to be escaped and substituted in the query.
-		:param as_dict: Return as a dictionary.
+		:param as_dict: Return as a dictionary. Pass `"rows"` to get compact read-only `Row` objects,
+		        see `frappe.database.row`.
 		:param as_list: Always return as a list.
 		:param debug: Print query and `EXPLAIN` in debug log.
 		:param ignore_ddl: Catch exception if table, column missing.
@@ -210,7 +243,8 @@ class Database:
 		:param explain: Print `EXPLAIN` in error log.
 		:param as_iterator: Returns iterator over results instead of fetching all results at once.
 		        This should be used with unbuffered cursor as default cursors used by pymysql and postgres
-		        buffer the results internally. See `Database.unbuffered_cursor`.
+		        buffer the results internally. See `Database.unbuffered_cursor` and `Database.sql_iterator`.
+		:param batch_size: Number of rows fetched from cursor at once when `as_iterator` is set.
 		Examples:
 
 		        # return customer names as dicts
@@ -247,6 +281,9 @@ class Database:
 		if not self._conn:
 			self.connect()
 
+		if self.write_batch and self.write_batch.pending:
+			self.write_batch.flush_for_query(query)
+
 		# in transaction validations
 		self.check_transaction_status(query, query_type)
 		self.clear_db_table_cache(query_type)
@@ -318,7 +355,14 @@ class Database:
 			return ()
 
 		if as_iterator:
-			return self._return_as_iterator(pluck=pluck, as_dict=as_dict, as_list=as_list, update=update)
+			return self._return_as_iterator(
+				self._cursor,
+				batch_size or SQL_ITERATOR_BATCH_SIZE,
+				pluck=pluck,
+				as_dict=as_dict,
+				as_list=as_list,
+				update=update,
+			)
 
 		last_result = self._transform_result(self._cursor.fetchall())
 		if pluck:
@@ -327,7 +371,10 @@ class Database:
 			return last_result
 
 		# scrub output if required
-		if as_dict:
+		if as_dict == ROWS:
+			last_result = self.fetch_as_rows(last_result, update)
+
+		elif as_dict:
 			last_result = self.fetch_as_dict(last_result)
 			if update:
 				for r in last_result:
@@ -339,14 +386,19 @@ class Database:
 		self._clean_up()
 		return last_result
 
-	def _return_as_iterator(self, *, pluck, as_dict, as_list, update):
-		while result := self._transform_result(self._cursor.fetchmany(SQL_ITERATOR_BATCH_SIZE)):
+	def _return_as_iterator(self, cursor, batch_size, *, pluck, as_dict, as_list, update):
+		# Cursor is bound when query is executed, other queries might replace `self._cursor` while
+		# the results are being consumed.
+		while result := self._transform_result(cursor.fetchmany(batch_size)):
 			if pluck:
 				for row in result:
 					yield row[0]
 
+			elif as_dict == ROWS:
+				yield from self.fetch_as_rows(result, update, cursor=cursor)
+
 			elif as_dict:
-				keys = [column[0] for column in self._cursor.description]
+				keys = [column[0] for column in cursor.description]
 				for row in result:
 					row = _dict(zip(keys, row, strict=False))
 					if update:
@@ -361,6 +413,16 @@ class Database:
 
 		self._clean_up()
 
+	def sql_iterator(self, query: Query, values: QueryValues = EmptyQueryValues, **kwargs):
+		"""Stream results of a SELECT query using an unbuffered cursor.
+
+		Same as `frappe.db.sql(query, as_iterator=True)` inside `frappe.db.unbuffered_cursor()`,
+		except that the cursor is held until the returned iterator is exhausted or closed.
+		Read the notes on `Database.unbuffered_cursor` before using this.
+		"""
+		with self.unbuffered_cursor():
+			yield from self.sql(query, values, as_iterator=True, **kwargs)
+
 	def execute_query(self, query, values=None):
 		return self._cursor.execute(query, values)
 
@@ -462,8 +524,13 @@ class Database:
 
 		if query_type in COMMIT_OR_ROLLBACK:
 			self.transaction_writes = 0
+			if "savepoint" not in query.lower():
+				self._transaction_started_at = None
 			return
 
+		if self._transaction_started_at is None:
+			self._transaction_started_at = time()
+
 		if query_type in WRITE_QUERY_TYPES:
 			self.transaction_writes += 1
 			if self.transaction_writes > self.MAX_WRITES_PER_TRANSACTION:
@@ -486,6 +553,19 @@ class Database:
 		keys = [column[0] for column in self._cursor.description]
 		return [_dict(zip(keys, row, strict=False)) for row in result]
 
+	def fetch_as_rows(self, result, update: dict | None = None, *, cursor=None) -> list[Row]:
+		"""Internal. Convert results to `Row` objects, values of `update` are added as columns."""
+		if not result:
+			return []
+
+		keys = tuple(column[0] for column in (cursor or self._cursor).description)
+		if not update:
+			return list(map(get_row_class(keys), result))
+
+		row_class = get_row_class(keys + tuple(update))
+		extra_values = tuple(update.values())
+		return [row_class((*row, *extra_values)) for row in result]
+
 	@staticmethod
 	def clear_db_table_cache(query_type: str):
 		if query_type in CREATE_OR_DROP:
@@ -531,7 +611,8 @@ class Database:
 		:param as_dict: Return values as dict.
 		:param debug: Print query in error log.
 		:param order_by: Column to order by
-		:param cache: Use cached results fetched during current job/request
+		:param cache: Use cached results fetched during current job/request. If `shared_value_cache_size`
+		        is set in site config, lookups by name are also cached across requests.
 		:param pluck: pluck first column instead of returning as nested list or dict.
 		:param for_update: All the affected/read rows will be locked.
 		:param skip_locked: Skip selecting currently locked rows.
@@ -625,6 +706,17 @@ class Database:
 		if cache and isinstance(filters, str) and fieldname in self.value_cache[doctype][filters]:
 			return self.value_cache[doctype][filters][fieldname]
 
+		if (
+			cache
+			and run
+			and not (for_update or update or pluck or distinct or debug)
+			and isinstance(filters, str)
+			and (row_cache_size := self._get_row_cache_size(doctype, filters, fieldname))
+		):
+			out = self._get_values_from_row_cache(doctype, filters, fieldname, as_dict, row_cache_size)
+			self.value_cache[doctype][filters][fieldname] = out
+			return out
+
 		if distinct:
 			order_by = None
 
@@ -710,6 +802,100 @@ class Database:
 
 		return out
 
+	def _get_row_cache_size(self, doctype: str, name: str, fieldname: str | list[str]) -> int:
+		"""Return size of the cross request row cache if it can be used for this lookup, else 0.
+
+		Enabled by setting `shared_value_cache_size` and the DocTypes to cache in
+		`shared_value_cache_doctypes` in site config, see `invalidate_row_cache`."""
+		size = cint(frappe.conf.get("shared_value_cache_size"))
+		if size <= 0 or not frappe.client_cache or name == doctype or not self._is_row_cached(doctype):
+			return 0
+
+		if doctype in self._row_cache_dirty_doctypes:
+			return 0
+
+		meta = frappe.get_meta(doctype)
+		if meta.issingle or meta.istable or meta.is_virtual:
+			return 0
+
+		if fieldname != "*":
+			fields = (fieldname,) if isinstance(fieldname, str) else fieldname
+			valid_columns = meta.get_valid_columns()
+			if not all(isinstance(f, str) and f in valid_columns for f in fields):
+				return 0
+
+		return size
+
+	def _get_values_from_row_cache(
+		self, doctype: str, name: str, fieldname: str | list[str], as_dict: bool, size: int
+	) -> list:
+		def get_row():
+			rows = self.sql(
+				f"SELECT * FROM {get_table_name(doctype, wrap_in_backticks=True)} WHERE `name` = %s",
+				(name,),
+				as_dict=True,
+			)
+			return dict(rows[0]) if rows else None
+
+		if self._transaction_started_at is None:
+			# row is read in a new snapshot
+			self._transaction_started_at = time()
+
+		row = frappe.client_cache.get_row(
+			doctype, name, get_row, maxsize=size, snapshot_time=self._transaction_started_at
+		)
+		# MariaDB compares names case insensitively, only cache rows under their exact name so
+		# invalidation by name works. Names of autoincrement doctypes are integers in rows.
+		if row is not None and cstr(row["name"]) != cstr(name):
+			frappe.client_cache.delete_rows([(doctype, name)])
+			row = get_row()
+
+		if row is None:
+			return []
+
+		if fieldname == "*":
+			return [_dict(row)]
+
+		fields = [fieldname] if isinstance(fieldname, str) else fieldname
+		if as_dict:
+			return [_dict((f, row[f]) for f in fields)]
+		return [tuple(row[f] for f in fields)]
+
+	@staticmethod
+	def _is_row_cached(doctype: str) -> bool:
+		return doctype not in DOCTYPES_WITHOUT_ROW_CACHE and doctype in (
+			frappe.conf.get("shared_value_cache_doctypes") or ()
+		)
+
+	def invalidate_row_cache(self, doctype: str, name: str | None = None) -> None:
+		"""Invalidate rows cached across requests by `get_value(..., cache=True)` after commit.
+
+		Until then, cross request cache isn't used for this DocType in current transaction.
+
+		Rows are invalidated by document writes, `set_value`, `delete`, `bulk_update` and
+		`bulk_insert`. Writes with raw SQL or query builder don't invalidate cached rows, only
+		add DocTypes which aren't written that way to `shared_value_cache_doctypes`."""
+		if cint(frappe.conf.get("shared_value_cache_size")) <= 0 or not self._is_row_cached(doctype):
+			return
+
+		if not self._row_cache_invalidations:
+			self.after_commit.add(self._flush_row_cache_invalidations)
+			self.after_rollback.add(self._reset_row_cache_invalidations)
+
+		self._row_cache_invalidations.add((doctype, name))
+		self._row_cache_dirty_doctypes.add(doctype)
+
+	def _flush_row_cache_invalidations(self):
+		rows = list(self._row_cache_invalidations)
+		self._reset_row_cache_invalidations()
+
+		if rows and frappe.client_cache:
+			frappe.client_cache.delete_rows(rows)
+
+	def _reset_row_cache_invalidations(self):
+		self._row_cache_invalidations.clear()
+		self._row_cache_dirty_doctypes.clear()
+
 	def get_values_from_single(
 		self,
 		fields,
@@ -1000,6 +1186,7 @@ class Database:
 		for column, value in to_update.items():
 			query = query.set(column, value)
 
+		self.flush_write_batch(dt)
 		query.run(debug=debug)
 
 	def bulk_update(
@@ -1054,6 +1241,9 @@ class Database:
 		total_docs = len(doc_updates)
 		iterator = iter(doc_updates.items())
 
+		for name in doc_updates:
+			self.invalidate_row_cache(doctype, name)
+
 		for __ in range(0, total_docs, chunk_size):
 			doc_chunk = dict(itertools.islice(iterator, chunk_size))
 			self._build_and_run_bulk_update_query(doctype, doc_chunk, modified_dict, debug)
@@ -1185,6 +1375,7 @@ class Database:
 		self.after_rollback.reset()
 
 		self.before_commit.run()
+		self.flush_write_batch()
 
 		if chain:
 			self.sql("commit and chain")
@@ -1196,6 +1387,10 @@ class Database:
 
 	def rollback(self, *, save_point=None, chain=False):
 		"""`ROLLBACK` current transaction. Optionally rollback to a known save_point."""
+		if self.write_batch:
+			# pending writes were made after the savepoint, see `savepoint`
+			self.write_batch.clear()
+
 		if save_point:
 			self.sql(f"rollback to savepoint {save_point}")
 		elif not self._disable_transaction_control:
@@ -1222,6 +1417,7 @@ class Database:
 		Note: rollback watchers can not work with save points.
 		        so only changes to database are undone when rolling back to a savepoint.
 		        Avoid using savepoints when writing to filesystem."""
+		self.flush_write_batch()
 		self.sql(f"savepoint {save_point}")
 
 	def release_savepoint(self, save_point):
@@ -1377,12 +1573,28 @@ class Database:
 		return frappe.get_system_settings(key)
 
 	def close(self):
-		"""Close database connection."""
+		"""Close database connection, or return it to the connection pool if pooling is enabled."""
+		from frappe.database.pool import get_pool
+
 		if self._conn:
-			self._conn.close()
+			if not self._release_to_pool(get_pool(self)):
+				self._conn.close()
 			self._cursor = None
 			self._conn = None
 
+	def _release_to_pool(self, pool) -> bool:
+		if not pool:
+			return False
+
+		try:
+			# Don't keep locks or snapshots of this request around while the connection is idle.
+			self._cursor.close()
+			self._conn.rollback()
+		except Exception:
+			return False
+
+		return pool.put(self._conn)
+
 	@staticmethod
 	def escape(s, percent=True):
 		"""Escape quotes and percent in given string."""
@@ -1426,6 +1638,8 @@ class Database:
 		)
 		if "debug" not in kwargs:
 			kwargs["debug"] = debug
+		self.flush_write_batch(doctype)
+		self.invalidate_row_cache(doctype)
 		return query.run(**kwargs)
 
 	def truncate(self, doctype: str):
@@ -1500,8 +1714,16 @@ class Database:
 			elif frappe.conf.db_type == "postgres":
 				query = query.on_conflict().do_nothing()
 
+		# rows missing before are cached too
+		name_index = fields.index("name") if "name" in fields else None
+		if name_index is None:
+			self.invalidate_row_cache(doctype)
+
 		value_iterator = iter(values)
 		while value_chunk := tuple(itertools.islice(value_iterator, chunk_size)):
+			if name_index is not None:
+				for row in value_chunk:
+					self.invalidate_row_cache(doctype, cstr(row[name_index]))
 			query.insert(*value_chunk).run()
 
 	def create_sequence(self, *args, **kwargs):
@@ -1526,6 +1748,48 @@ class Database:
 	def rename_column(self, doctype: str, old_column_name: str, new_column_name: str):
 		raise NotImplementedError
 
+	@contextmanager
+	def batch_writes(self):
+		"""Buffer row writes of documents and write them per table in bulk.
+
+		Inside this context, `Document.db_insert` and `Document.db_update` collect rows instead of
+		running one query per row. Pending rows are written with multi-row statements when the
+		context exits, on commit and before a savepoint is created. Writes to the same row are
+		merged, e.g. a row inserted and then updated by `on_update` is written once.
+
+		Usage:
+		        with frappe.db.batch_writes():
+		                for row in rows:
+		                        frappe.get_doc(row).insert()
+
+		Note:
+		        - Pending rows of a doctype are written before any query which refers to its table,
+		                e.g. link validation or raw SQL, so queries see them. Batching works best for
+		                code which writes many documents but doesn't read them back, like imports.
+		        - Errors like duplicate entries are raised when the rows are written and not
+		                by the `insert` or `save` call which caused them.
+		        - Saving a document which is already pending writes the batch before it is loaded
+		                for `check_if_latest`.
+		        - Pending rows are discarded on rollback or if the block raises an exception.
+		        - Nested calls reuse the outermost batch.
+		"""
+		if self.write_batch is not None:
+			yield self.write_batch
+			return
+
+		self.write_batch = batch = WriteBatch(self)
+		try:
+			yield batch
+			self.write_batch = None
+			batch.flush()
+		finally:
+			self.write_batch = None
+
+	def flush_write_batch(self, doctype: str | None = None):
+		"""Write rows buffered by `batch_writes`, optionally only those of a single doctype."""
+		if self.write_batch:
+			self.write_batch.flush(doctype)
+
 	@contextmanager
 	def unbuffered_cursor(self):
 		"""Context manager to temporarily use unbuffered cursor.
@@ -1535,6 +1799,12 @@ class Database:
 		NOTE: You MUST do entire result set processing in the context, otherwise underlying cursor
 		will be switched and you'll not get complete results.
 
+		NOTE: Other queries can be executed while iterating. Postgres and SQLite use a separate cursor
+		for every SELECT query, Postgres cursors also survive commits. MariaDB streams the result on a
+		separate connection which doesn't see uncommitted writes of the transaction. After writes,
+		the result is streamed on the same connection and other queries raise an error until it is
+		consumed.
+
 		Usage:
 		        with frappe.db.unbuffered_cursor():
 		                for row in frappe.db.sql("query with huge result", as_iterator=True):
@@ -3,13 +3,21 @@ from contextlib import contextmanager
 import pymysql
 from pymysql.constants import ER, FIELD_TYPE
 from pymysql.converters import conversions, escape_string
+from pymysql.cursors import SSCursor
 
 import frappe
+from frappe import _
 from frappe.database.database import Database
 from frappe.database.mariadb.schema import MariaDBTable
+from frappe.database.pool import _close_quietly, get_pool
+from frappe.database.utils import LOCKING_READ_PATTERN, is_query_type
 from frappe.utils import UnicodeWithAttrs, cstr, get_datetime, get_table_name
 
 
+def _has_unread_rows(cursor: SSCursor) -> bool:
+	return cursor._result is not None and cursor._result.unbuffered_active
+
+
 class MariaDBExceptionUtil:
 	ProgrammingError = pymysql.ProgrammingError
 	TableMissingError = pymysql.ProgrammingError
@@ -117,6 +125,17 @@ class MariaDBConnectionUtil:
 	def set_execution_timeout(self, seconds: int):
 		self.sql("set session max_statement_time = %s", int(seconds))
 
+	def reset_connection(self, conn) -> bool:
+		try:
+			conn.ping(reconnect=False)
+			conn.rollback()
+			cursor = conn.cursor()
+			cursor.execute("set session max_statement_time = DEFAULT, lock_wait_timeout = DEFAULT")
+			cursor.close()
+		except Exception:
+			return False
+		return True
+
 	def get_connection_settings(self) -> dict:
 		conn_settings = {
 			"user": self.user,
@@ -167,6 +186,11 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 	}
 	default_port = "3306"
 	MAX_ROW_SIZE_LIMIT = 65_535  # bytes
+	# Regular and unbuffered cursor, only set inside `unbuffered_cursor` context.
+	_buffered_cursor = None
+	_stream_cursor: SSCursor | None = None
+	# Connections used for streaming results, see `unbuffered_cursor`.
+	_idle_stream_connections: list | None = None
 
 	def setup_type_map(self):
 		self.db_type = "mariadb"
@@ -551,18 +575,79 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 
 	@contextmanager
 	def unbuffered_cursor(self):
-		from pymysql.cursors import SSCursor
-
+		if not self._conn:
+			self.connect()
+
+		original_cursor = self._cursor
+		previous_cursors = self._buffered_cursor, self._stream_cursor
+		self._buffered_cursor = self._buffered_cursor or original_cursor
+
+		# A connection can't execute other queries until an unbuffered result is consumed. Results are
+		# streamed on a separate connection, so that queries in the loop run on this one. That
+		# connection doesn't see uncommitted writes, after writes the result is streamed on this
+		# connection and other queries can't be executed until it is consumed.
+		conn = self._conn if self.transaction_writes else self._checkout_stream_connection()
+		self._stream_cursor = conn.cursor(SSCursor)
 		try:
-			if not self._conn:
-				self.connect()
-
-			original_cursor = self._cursor
-			new_cursor = self._cursor = self._conn.cursor(SSCursor)
 			yield
 		finally:
+			stream = self._stream_cursor
+			if conn is not self._conn and _has_unread_rows(stream):
+				# closing the cursor would read the rest of the result
+				_close_quietly(conn)
+			else:
+				stream.close()
+				if conn is not self._conn:
+					self._release_stream_connection(conn)
+
 			self._cursor = original_cursor
-			new_cursor.close()
+			self._buffered_cursor, self._stream_cursor = previous_cursors
+
+	def _checkout_stream_connection(self):
+		if self._idle_stream_connections:
+			return self._idle_stream_connections.pop()
+		return self.checkout_connection()
+
+	def _release_stream_connection(self, conn) -> None:
+		try:
+			# don't keep the snapshot of this result around
+			conn.rollback()
+		except Exception:
+			_close_quietly(conn)
+			return
+
+		if self._idle_stream_connections is None:
+			self._idle_stream_connections = []
+		self._idle_stream_connections.append(conn)
+
+	def execute_query(self, query, values=None):
+		stream = self._stream_cursor
+		if stream is not None:
+			streaming = _has_unread_rows(stream)
+			if streaming and stream.connection is self._conn:
+				frappe.throw(
+					_(
+						"Queries can not be executed while iterating over an unbuffered result after writes"
+						" in the same transaction. Commit before iterating or read the whole result first."
+					),
+					title=_("Unbuffered Result"),
+				)
+
+			# Only SELECT queries are streamed, everything else runs on the main connection.
+			if streaming or not is_query_type(query, "select") or LOCKING_READ_PATTERN.search(query):
+				self._cursor = self._buffered_cursor
+			else:
+				self._cursor = stream
+
+		return self._cursor.execute(query, values)
+
+	def close(self):
+		pool = get_pool(self)
+		for conn in self._idle_stream_connections or ():
+			if not (pool and pool.put(conn)):
+				_close_quietly(conn)
+		self._idle_stream_connections = None
+		super().close()
 
 	def estimate_count(self, doctype: str):
 		"""Get estimated count of total rows in a table."""
@@ -119,6 +119,17 @@ class MariaDBConnectionUtil:
 	def set_execution_timeout(self, seconds: int):
 		self.sql("set session max_statement_time = %s", int(seconds))
 
+	def reset_connection(self, conn) -> bool:
+		try:
+			conn.ping()
+			conn.rollback()
+			cursor = conn.cursor()
+			cursor.execute("set session max_statement_time = DEFAULT, lock_wait_timeout = DEFAULT")
+			cursor.close()
+		except Exception:
+			return False
+		return True
+
 	def get_connection_settings(self) -> dict:
 		conn_settings = {
 			"user": self.user,
@@ -0,0 +1,128 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Per-process pool of database connections.
+
+Every request normally opens a new connection in `frappe.connect` and closes it in
+`frappe.destroy`. With pooling enabled, closed connections are instead parked in a pool for
+the site and handed out to the next request in the same process, saving the TCP/TLS and
+authentication handshake.
+
+Pooling is opt-in and configured from site config:
+
+- `db_connection_pool_size`: maximum number of idle connections kept per site and process.
+        `0` (default) disables pooling.
+- `db_connection_pool_idle_timeout`: seconds after which an idle connection is discarded
+        instead of reused (default: 300). Keep this below the server's `wait_timeout`.
+
+Connections are rolled back when they are returned to the pool. On checkout, they are checked
+for liveness and session variables changed by Frappe are reset to defaults, see
+`Database.reset_connection`.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+import frappe
+from frappe.utils import cint
+
+if TYPE_CHECKING:
+	from frappe.database.database import Database
+
+DEFAULT_IDLE_TIMEOUT = 300
+
+_pools: dict[tuple, "ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+	"""LIFO stack of idle connections for a single database."""
+
+	def __init__(self, size: int, idle_timeout: int = DEFAULT_IDLE_TIMEOUT):
+		self.size = size
+		self.idle_timeout = idle_timeout
+		self._idle: deque[tuple[float, Any]] = deque()
+		self._lock = threading.Lock()
+
+	def __len__(self) -> int:
+		return len(self._idle)
+
+	def get(self) -> Any | None:
+		"""Return the most recently used idle connection, if any.
+
+		Connections which have been idle for longer than `idle_timeout` are closed."""
+		now = time.monotonic()
+		while True:
+			with self._lock:
+				if not self._idle:
+					return None
+				released_at, conn = self._idle.pop()
+
+			if now - released_at <= self.idle_timeout:
+				return conn
+			_close_quietly(conn)
+
+	def put(self, conn) -> bool:
+		"""Park a connection in the pool. Return False if the pool is full."""
+		with self._lock:
+			if len(self._idle) >= self.size:
+				return False
+			self._idle.append((time.monotonic(), conn))
+			return True
+
+	def clear(self) -> None:
+		"""Close all idle connections."""
+		with self._lock:
+			idle, self._idle = self._idle, deque()
+
+		for _, conn in idle:
+			_close_quietly(conn)
+
+
+def get_pool(db: "Database") -> ConnectionPool | None:
+	"""Return connection pool for the database, None if pooling is disabled."""
+	size = cint(frappe.conf.get("db_connection_pool_size"))
+	if size <= 0 or db.db_type == "sqlite":
+		return None
+
+	key = (getattr(frappe.local, "site", None), db.socket, db.host, db.port, db.user, db.cur_db_name)
+	if pool := _pools.get(key):
+		pool.size = size
+		return pool
+
+	with _pools_lock:
+		if key not in _pools:
+			idle_timeout = frappe.conf.get("db_connection_pool_idle_timeout")
+			_pools[key] = ConnectionPool(
+				size, DEFAULT_IDLE_TIMEOUT if idle_timeout is None else cint(idle_timeout)
+			)
+		return _pools[key]
+
+
+def clear_pools() -> None:
+	"""Close all pooled connections of current process."""
+	with _pools_lock:
+		pools = list(_pools.values())
+		_pools.clear()
+
+	for pool in pools:
+		pool.clear()
+
+
+def _forget_pools() -> None:
+	# Forked children must not reuse or close connections, the sockets are shared with parent.
+	global _pools_lock
+	_pools.clear()
+	_pools_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pools)
+
+
+def _close_quietly(conn) -> None:
+	try:
+		conn.close()
+	except Exception:
+		pass
@@ -1,4 +1,5 @@
 import re
+from contextlib import contextmanager
 
 import psycopg2
 import psycopg2.extensions
@@ -25,7 +26,7 @@ from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
 import frappe
 from frappe.database.database import Database
 from frappe.database.postgres.schema import PostgresTable
-from frappe.database.utils import EmptyQueryValues, LazyDecode
+from frappe.database.utils import LOCKING_READ_PATTERN, EmptyQueryValues, LazyDecode, is_query_type
 from frappe.utils import cstr, get_table_name
 
 # cast decimals as floats
@@ -123,9 +124,61 @@ class PostgresExceptionUtil:
 		return isinstance(e, InterfaceError)
 
 
+class PostgresServerSideCursor:
+	"""Wrapper over psycopg2's named (server side) cursor.
+
+	psycopg2 sets `description` of named cursors only after first fetch, so the first row is
+	fetched as soon as the query is executed.
+
+	Cursors are declared `WITH HOLD` so that they survive commits while iterating. Such cursors live
+	until the end of the session, they are closed when the result is consumed or when the
+	`unbuffered_cursor` context ends."""
+
+	def __init__(self, conn):
+		self._cursor = conn.cursor(name=f"frappe_{frappe.generate_hash(length=12)}", withhold=True)
+		self._prefetched = []
+
+	def execute(self, query, values=None):
+		self._cursor.execute(query, values)
+		self._prefetched = self._cursor.fetchmany(1)
+
+	def fetchmany(self, size=None):
+		size = size or self._cursor.itersize
+		rows, self._prefetched = self._prefetched, []
+		if len(rows) < size and not self._cursor.closed:
+			rows += self._cursor.fetchmany(size - len(rows))
+
+		if len(rows) < size:
+			self.close()
+		return rows
+
+	def fetchall(self):
+		rows, self._prefetched = self._prefetched, []
+		if not self._cursor.closed:
+			rows += self._cursor.fetchall()
+			self.close()
+		return rows
+
+	def close(self):
+		if self._cursor.closed:
+			return
+
+		try:
+			self._cursor.close()
+		except psycopg2.Error:
+			# cursor is gone already if the transaction was rolled back
+			pass
+
+	def __getattr__(self, name):
+		return getattr(self._cursor, name)
+
+
 class PostgresDatabase(PostgresExceptionUtil, Database):
 	REGEX_CHARACTER = "~"
 	default_port = "5432"
+	# Regular cursor and server side cursors created in it, only set inside `unbuffered_cursor` context.
+	_buffered_cursor = None
+	_server_side_cursors: list[PostgresServerSideCursor] | None = None
 
 	def setup_type_map(self):
 		self.db_type = "postgres"
@@ -200,6 +253,19 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 		# Postgres expects milliseconds as input
 		self.sql("set local statement_timeout = %s", int(seconds) * 1000)
 
+	def reset_connection(self, conn) -> bool:
+		if conn.closed:
+			return False
+
+		try:
+			conn.rollback()
+			with conn.cursor() as cursor:
+				cursor.execute("RESET ALL")
+			conn.rollback()
+		except Exception:
+			return False
+		return True
+
 	def escape(self, s, percent=True):
 		"""Escape quotes and percent in given string."""
 		if isinstance(s, bytes):
@@ -483,6 +549,36 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 	def get_database_list(self):
 		return self.sql("SELECT datname FROM pg_database", pluck=True)
 
+	@contextmanager
+	def unbuffered_cursor(self):
+		if not self._conn:
+			self.connect()
+
+		original_cursor = self._cursor
+		previous_buffered_cursor = self._buffered_cursor
+		previous_server_side_cursors = self._server_side_cursors
+		self._buffered_cursor = previous_buffered_cursor or original_cursor
+		self._server_side_cursors = []
+		try:
+			yield
+		finally:
+			for cursor in self._server_side_cursors:
+				cursor.close()
+			self._cursor = original_cursor
+			self._buffered_cursor = previous_buffered_cursor
+			self._server_side_cursors = previous_server_side_cursors
+
+	def execute_query(self, query, values=None):
+		if self._buffered_cursor is not None:
+			# Inside `unbuffered_cursor` every SELECT query gets its own server side cursor.
+			# Cursors `WITH HOLD` can't lock rows, locking reads use the regular cursor.
+			if is_query_type(query, "select") and not LOCKING_READ_PATTERN.search(query):
+				self._cursor = PostgresServerSideCursor(self._conn)
+				self._server_side_cursors.append(self._cursor)
+			else:
+				self._cursor = self._buffered_cursor
+		return self._cursor.execute(query, values)
+
 	def estimate_count(self, doctype: str):
 		"""Get estimated count of total rows in a table."""
 		from frappe.utils.data import cint
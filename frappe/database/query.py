@@ -313,13 +313,13 @@ class Engine:
 				# This part might need refinement if nested set operators are used with dynamic fields.
 				ref_doctype = self.doctype
 
-			nodes = get_nested_set_hierarchy_result(ref_doctype, docname, hierarchy)
+			nodes = get_nested_set_hierarchy_query(ref_doctype, docname, hierarchy)
 			operator_fn = (
 				OPERATOR_MAP["not in"]
 				if hierarchy in ("not ancestors of", "not descendants of")
 				else OPERATOR_MAP["in"]
 			)
-			return operator_fn(_field, nodes or ("",))
+			return operator_fn(_field, nodes)
 
 		operator_fn = OPERATOR_MAP[_operator.casefold()]
 		if _value is None and isinstance(_field, Field):
@@ -1253,6 +1253,23 @@ class ChildQuery:
 		)
 
 
+def get_nested_set_hierarchy_query(doctype: str, name: str, hierarchy: str) -> QueryBuilder:
+	"""Subquery selecting matching nodes, compared on `lft` and `rgt` in the database.
+
+	Unlike `get_nested_set_hierarchy_result`, size of the query doesn't depend on the number of nodes."""
+	tree = frappe.qb.DocType(doctype).as_("tree")
+	node = frappe.qb.DocType(doctype).as_("node")
+
+	if hierarchy in ("descendants of", "not descendants of"):
+		condition = (tree.lft > node.lft) & (tree.rgt < node.rgt)
+	elif hierarchy == "descendants of (inclusive)":
+		condition = (tree.lft >= node.lft) & (tree.rgt <= node.rgt)
+	else:
+		condition = (tree.lft < node.lft) & (tree.rgt > node.rgt)
+
+	return frappe.qb.from_(tree).from_(node).select(tree.name).where(node.name == name).where(condition)
+
+
 def get_nested_set_hierarchy_result(doctype: str, name: str, hierarchy: str) -> list[str]:
 	"""Get matching nodes based on operator."""
 	table = frappe.qb.DocType(doctype)
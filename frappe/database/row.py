@@ -0,0 +1,112 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Compact read-only rows for large query results.
+
+`as_dict=True` builds a `frappe._dict` for every row, which costs a hash table per row.
+With `as_dict="rows"`, rows are returned as `Row` objects instead. These are plain tuples of
+values, the column names are stored once on a class shared by all rows with the same columns.
+
+Rows support access by attribute (`row.name`), by key (`row["name"]`) and by position
+(`row[0]`). Unlike `frappe._dict` they are immutable and iterating over them yields values.
+Use `row.as_dict()` or `dict(row)` to get a mutable copy.
+
+Column names take precedence over attributes of rows, e.g. `row.count` is the value of a `count`
+column and not `tuple.count`. If a column shadows one of the helpers (`get`, `keys`, `values`,
+`items`, `as_dict`), use its underscore variant instead (`row._as_dict()`).
+
+Rows compare and hash like tuples of their values, column names are ignored.
+"""
+
+from functools import lru_cache
+from typing import Any, ClassVar
+
+import frappe
+
+ROWS = "rows"
+
+
+class Row(tuple):
+	"""Read-only result row with access to values by column name."""
+
+	__slots__ = ()
+
+	_fields: ClassVar[tuple[str, ...]] = ()
+	_index: ClassVar[dict[str, int]] = {}
+
+	def __getitem__(self, key):
+		if isinstance(key, str):
+			try:
+				return tuple.__getitem__(self, type(self)._index[key])
+			except KeyError:
+				raise KeyError(key) from None
+
+		return tuple.__getitem__(self, key)
+
+	def __getattribute__(self, key: str):
+		# columns shadow methods of tuple and of this class
+		index = type(self)._index.get(key)
+		if index is None:
+			return tuple.__getattribute__(self, key)
+
+		return tuple.__getitem__(self, index)
+
+	def __getattr__(self, key: str):
+		if key.startswith("__"):
+			raise AttributeError(key)
+
+		# same as `frappe._dict`, missing columns are None
+		return None
+
+	def __setattr__(self, key, value):
+		raise AttributeError(f"{type(self).__name__} is read-only, use `as_dict()` for a mutable copy")
+
+	def __contains__(self, key) -> bool:
+		return key in type(self)._index
+
+	def __repr__(self) -> str:
+		values = ", ".join(f"{key}={value!r}" for key, value in Row._items(self))
+		return f"Row({values})"
+
+	def __reduce__(self):
+		return make_row, (type(self)._fields, tuple(self))
+
+	def _get(self, key: str, default: Any = None) -> Any:
+		index = type(self)._index.get(key)
+		return default if index is None else tuple.__getitem__(self, index)
+
+	def _keys(self) -> tuple[str, ...]:
+		return type(self)._fields
+
+	def _values(self) -> tuple:
+		return tuple(self)
+
+	def _items(self):
+		return zip(type(self)._fields, self, strict=True)
+
+	def _as_dict(self) -> "frappe._dict":
+		return frappe._dict(Row._items(self))
+
+	get = _get
+	keys = _keys
+	values = _values
+	items = _items
+	as_dict = _as_dict
+
+
+@lru_cache(maxsize=512)
+def get_row_class(fields: tuple[str, ...]) -> type[Row]:
+	"""Return `Row` class for a set of columns. Rows of all results with the same columns share it."""
+	return type(
+		"Row",
+		(Row,),
+		{
+			"__slots__": (),
+			"_fields": fields,
+			# duplicate column names resolve to the last column, same as `frappe._dict`
+			"_index": {field: i for i, field in enumerate(fields)},
+		},
+	)
+
+
+def make_row(fields: tuple[str, ...], values: tuple) -> Row:
+	return get_row_class(tuple(fields))(values)
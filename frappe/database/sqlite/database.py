@@ -1,6 +1,7 @@
 import re
 import sqlite3
 import warnings
+from contextlib import contextmanager
 from datetime import date, datetime, time
 from pathlib import Path
 
@@ -11,6 +12,7 @@ from frappe.database.database import (
 	ImplicitCommitError,
 )
 from frappe.database.sqlite.schema import SQLiteTable
+from frappe.database.utils import is_query_type
 from frappe.utils import get_table_name
 
 _PARAM_COMP = re.compile(r"%\([\w]*\)s")
@@ -102,6 +104,8 @@ class SQLiteDatabase(SQLiteExceptionUtil, Database):
 	REGEX_CHARACTER = "regexp"
 	default_port = None
 	MAX_ROW_SIZE_LIMIT = None
+	# Regular cursor, only set inside `unbuffered_cursor` context.
+	_buffered_cursor = None
 
 	def get_connection(self, read_only: bool = False):
 		conn = self.create_connection(read_only)
@@ -439,8 +443,28 @@ class SQLiteDatabase(SQLiteExceptionUtil, Database):
 		except TypeError:
 			pass
 
+		if self._buffered_cursor is not None:
+			# Inside `unbuffered_cursor` every SELECT query gets its own cursor.
+			self._cursor = self._conn.cursor() if is_query_type(query, "select") else self._buffered_cursor
+
 		return self._cursor.execute(query, values or ())
 
+	@contextmanager
+	def unbuffered_cursor(self):
+		"""SQLite cursors already step through results lazily, this only makes sure that other
+		queries executed while iterating don't reset the cursor."""
+		if not self._conn:
+			self.connect()
+
+		original_cursor = self._cursor
+		previous_buffered_cursor = self._buffered_cursor
+		self._buffered_cursor = previous_buffered_cursor or original_cursor
+		try:
+			yield
+		finally:
+			self._cursor = original_cursor
+			self._buffered_cursor = previous_buffered_cursor
+
 	def sql(self, *args, **kwargs):
 		if args:
 			# since tuple is immutable
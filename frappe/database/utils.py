@@ -26,6 +26,8 @@ NestedSetHierarchy = (
 )
 # split when non-alphabetical character is found
 QUERY_TYPE_PATTERN = re.compile(r"\s*([A-Za-z]*)")
+# SELECT queries which lock rows, these must run on the cursor of the transaction
+LOCKING_READ_PATTERN = re.compile(r"\s(for\s+update|for\s+share|lock\s+in\s+share\s+mode)\b", re.IGNORECASE)
 
 
 def convert_to_value(o: FilterValue):
@@ -0,0 +1,114 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Buffer for row writes made by `Document.db_insert` and `Document.db_update`.
+
+Inside `frappe.db.batch_writes()`, documents are not written one row at a time. Their rows are
+collected here instead and written per table in as few statements as possible:
+
+- inserts are written with multi-row `INSERT` statements, see `Database.bulk_insert`.
+- updates are written with a single `UPDATE ... SET col = CASE ...` statement per chunk of
+        rows, see `Database.bulk_update`.
+
+Writes to the same row are merged, only the last state of a row is written. A row which is
+inserted and then updated in the same batch is written once as an insert.
+
+Pending rows of a doctype are written before any query which refers to its table, so that
+queries see them and run in order with them, see `Database.sql`.
+"""
+
+import itertools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from frappe.database.database import Database
+
+INSERT = "insert"
+INSERT_IGNORE = "insert_ignore"
+UPDATE = "update"
+
+INSERT_CHUNK_SIZE = 1000
+UPDATE_CHUNK_SIZE = 100
+
+
+class WriteBatch:
+	"""Pending row writes of current transaction, grouped by doctype."""
+
+	def __init__(self, db: "Database"):
+		self.db = db
+		# doctype -> name -> (operation, row)
+		self.pending: dict[str, dict[str, tuple[str, dict]]] = {}
+
+	def __len__(self) -> int:
+		return sum(len(rows) for rows in self.pending.values())
+
+	def has_row(self, doctype: str, name: str) -> bool:
+		return name in self.pending.get(doctype, ())
+
+	def add_insert(self, doctype: str, row: dict, ignore_if_duplicate: bool = False) -> None:
+		self.pending.setdefault(doctype, {})[row["name"]] = (
+			INSERT_IGNORE if ignore_if_duplicate else INSERT,
+			row,
+		)
+
+	def add_update(self, doctype: str, name: str, row: dict) -> None:
+		rows = self.pending.setdefault(doctype, {})
+		if (existing := rows.get(name)) and existing[0] != UPDATE:
+			# row is not in the database yet, insert it with latest values
+			rows[name] = (existing[0], {**existing[1], **row})
+		else:
+			rows[name] = (UPDATE, row)
+
+	def discard_children(
+		self, doctype: str, parent: str, parenttype: str, parentfield: str, keep: list[str]
+	) -> None:
+		"""Drop pending writes of child rows which are being deleted from a parent's table."""
+		rows = self.pending.get(doctype)
+		if not rows:
+			return
+
+		keep = set(keep)
+		owner = (parent, parenttype, parentfield)
+		for name, (_operation, row) in list(rows.items()):
+			if name in keep:
+				continue
+			if (row.get("parent"), row.get("parenttype"), row.get("parentfield")) == owner:
+				del rows[name]
+
+	def flush(self, doctype: str | None = None) -> None:
+		"""Write pending rows to the database, either for a single doctype or for all of them."""
+		doctypes = [doctype] if doctype else list(self.pending)
+		for dt in doctypes:
+			if rows := self.pending.pop(dt, None):
+				self._write(dt, rows)
+
+	def flush_for_query(self, query: str) -> None:
+		"""Write pending rows of doctypes whose tables are referred to in the query."""
+		for doctype in [doctype for doctype in self.pending if f"tab{doctype}" in query]:
+			self.flush(doctype)
+
+	def clear(self) -> None:
+		self.pending.clear()
+
+	def _write(self, doctype: str, rows: dict[str, tuple[str, dict]]) -> None:
+		inserts: dict[tuple[bool, tuple[str, ...]], list[tuple]] = {}
+		updates: dict[str, dict] = {}
+
+		for name, (operation, row) in rows.items():
+			if operation == UPDATE:
+				updates[name] = row
+			else:
+				key = (operation == INSERT_IGNORE, tuple(row))
+				inserts.setdefault(key, []).append(tuple(row.values()))
+
+		for (ignore_duplicates, columns), values in inserts.items():
+			self.db.bulk_insert(
+				doctype,
+				list(columns),
+				values,
+				ignore_duplicates=ignore_duplicates,
+				chunk_size=INSERT_CHUNK_SIZE,
+			)
+
+		iterator = iter(updates.items())
+		while chunk := dict(itertools.islice(iterator, UPDATE_CHUNK_SIZE)):
+			self.db._build_and_run_bulk_update_query(doctype, chunk)
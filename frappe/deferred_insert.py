@@ -1,9 +1,11 @@
 import json
+import time
 from typing import TYPE_CHECKING, Union
 
 import redis
 
 import frappe
+from frappe.monitor import add_data_to_monitor
 from frappe.utils import cstr
 
 if TYPE_CHECKING:
@@ -11,6 +13,12 @@ if TYPE_CHECKING:
 
 queue_prefix = "insert_queue_for_"
 
+# Queue entries popped from each queue per round trip, an entry can hold many records
+QUEUE_BATCH_SIZE = 100
+INSERT_CHUNK_SIZE = 500
+MAX_RECORDS_PER_RUN = 10000
+SAVEPOINT = "deferred_insert"
+
 
 def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 	if isinstance(records, dict | list):
@@ -26,26 +34,85 @@ def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 
 
 def save_to_db():
-	queue_keys = frappe.cache.get_keys(queue_prefix)
-	for key in queue_keys:
-		record_count = 0
-		queue_key = get_key_name(key)
-		doctype = get_doctype_name(key)
-		while frappe.cache.llen(queue_key) > 0 and record_count <= 10000:
-			records = frappe.cache.lpop(queue_key)
-			records = json.loads(records.decode("utf-8"))
-			if isinstance(records, dict):
-				record_count += 1
-				insert_record(records, doctype)
-				continue
-			for record in records:
-				record_count += 1
+	"""Insert records queued with `deferred_insert`.
+
+	Queues of all doctypes are drained together, each round trip to Redis pops a batch from every
+	queue. Records are inserted in chunks per doctype with `bulk_insert_validated`."""
+	start = time.monotonic()
+	queues = {key: get_doctype_name(key) for key in frappe.cache.get_keys(queue_prefix)}
+	inserted = dict.fromkeys(queues.values(), 0)
+
+	while queues:
+		pipeline = frappe.cache.pipeline()
+		for key in queues:
+			pipeline.lpop(key, QUEUE_BATCH_SIZE)
+
+		for (key, doctype), entries in zip(list(queues.items()), pipeline.execute(), strict=True):
+			if entries:
+				records = []
+				for entry in entries:
+					entry = json.loads(entry.decode("utf-8"))
+					records.extend([entry] if isinstance(entry, dict) else entry)
+
+				insert_records(records, doctype)
+				frappe.db.commit()
+				inserted[doctype] += len(records)
+
+			if not entries or len(entries) < QUEUE_BATCH_SIZE or inserted[doctype] >= MAX_RECORDS_PER_RUN:
+				del queues[key]
+
+	if any(inserted.values()):
+		add_data_to_monitor(
+			deferred_insert={
+				"inserted": inserted,
+				"backlog": get_backlog(),
+				"duration": round(time.monotonic() - start, 3),
+			}
+		)
+
+
+def get_backlog() -> dict[str, int]:
+	"""Return number of queue entries waiting to be inserted, per doctype."""
+	keys = frappe.cache.get_keys(queue_prefix)
+	pipeline = frappe.cache.pipeline()
+	for key in keys:
+		pipeline.llen(key)
+
+	return {get_doctype_name(key): length for key, length in zip(keys, pipeline.execute(), strict=True)}
+
+
+def insert_records(records: list[dict], doctype: str):
+	"""Insert records in chunks, one record at a time only if a chunk fails."""
+	from frappe.model.document import bulk_insert_validated
+
+	for i in range(0, len(records), INSERT_CHUNK_SIZE):
+		chunk = records[i : i + INSERT_CHUNK_SIZE]
+		try:
+			frappe.db.savepoint(SAVEPOINT)
+			docs = bulk_insert_validated(doctype, chunk, chunk_size=INSERT_CHUNK_SIZE)
+		except Exception:
+			frappe.db.rollback(save_point=SAVEPOINT)
+			for record in chunk:
 				insert_record(record, doctype)
-				if record_count % 100 == 0:
-					frappe.db.commit()
+			continue
 
-			if record_count % 100 == 0:
-				frappe.db.commit()
+		frappe.db.release_savepoint(SAVEPOINT)
+		# side effects (jobs, realtime events, callbacks) only run once the whole chunk is written,
+		# a failed chunk is inserted again one by one
+		for doc in docs:
+			_run_after_insert_methods(doc)
+
+
+def _run_after_insert_methods(doc: "Document"):
+	# `bulk_insert_validated` stops after writing rows, rest of `Document.insert`
+	try:
+		doc.run_method("after_insert")
+		doc.flags.in_insert = True
+		doc.run_post_save_methods()
+	except Exception as e:
+		frappe.logger().error(f"Error in after insert methods of deferred {doc.doctype} record: {e}")
+	finally:
+		doc.flags.in_insert = False
 
 
 def insert_record(record: Union[dict, "Document"], doctype: str):
@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 
 import frappe
+from frappe.desk.reportview import clear_stats_cache
 from frappe.model.document import Document
 from frappe.query_builder import DocType
 from frappe.utils import unique
@@ -113,6 +114,7 @@ class DocTags:
 			tags = ",".join(tl)
 		try:
 			frappe.db.set_value(self.dt, dn, "_user_tags", tags, update_modified=False)
+			clear_stats_cache(self.dt)
 			doc = frappe.get_lazy_doc(self.dt, dn)
 			update_tags(doc, tags)
 		except Exception as e:
@@ -10,6 +10,7 @@ import frappe
 import frappe.desk.reportview
 from frappe import _
 from frappe.core.utils import ljust_list
+from frappe.desk.report_cache import get_cached_result, get_result_cache_key, set_cached_result
 from frappe.desk.reportview import clean_params, parse_json
 from frappe.model.utils import render_include
 from frappe.modules import get_module_path, scrub
@@ -82,6 +83,20 @@ def generate_report_result(
 	if filters and isinstance(filters, str):
 		filters = json.loads(filters)
 
+	cache_key = None
+	if cint(report.get("cache_result")):
+		cache_key = get_result_cache_key(
+			report,
+			filters,
+			user,
+			custom_columns=custom_columns,
+			is_tree=is_tree,
+			parent_field=parent_field,
+		)
+		if cached := get_cached_result(cache_key):
+			cached["execution_time"] = frappe.cache.hget("report_execution_time", report.name) or 0
+			return cached
+
 	res = get_report_result(report, filters) or []
 
 	columns, result, message, chart, report_summary, skip_total_row = ljust_list(res, 6)
@@ -116,7 +131,7 @@ def generate_report_result(
 		total_row = cint(report.add_total_row) and result and not skip_total_row
 		result = translate_report_data(result, total_row)
 
-	return {
+	data = {
 		"result": result,
 		"columns": columns,
 		"message": message,
@@ -126,6 +141,10 @@ def generate_report_result(
 		"status": None,
 		"execution_time": frappe.cache.hget("report_execution_time", report.name) or 0,
 	}
+	if cache_key:
+		set_cached_result(report, cache_key, data)
+
+	return data
 
 
 def normalize_result(result, columns):
@@ -0,0 +1,118 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Cache for results of query and script reports.
+
+Reports with "Cache Result" enabled keep the result of each run for `cache_ttl` seconds. Results
+are cached per user and filters. With "Share Cached Result", users with the same roles and user
+permissions share cached results.
+
+Cached results of a report are invalidated when a transaction which inserted or updated documents
+of the report's Reference DocType or its "Cache Source DocTypes" is committed. Rows changed without
+documents (e.g. `frappe.db.set_value`, deletes) are not tracked, results expire after `cache_ttl`.
+
+Every result is stored in its own key with its own expiry. Keys contain a generation number of the
+report which is incremented to invalidate all cached results of the report at once.
+"""
+
+import hashlib
+
+import frappe
+from frappe.utils import cint, cstr
+
+RESULT_CACHE_PREFIX = "report_result::"
+GENERATION_KEY_PREFIX = "report_result_generation::"
+SOURCES_CACHE_KEY = "report_result_cache_sources"
+DEFAULT_TTL = 300
+
+
+def get_result_cache_key(report, filters, user: str, **options) -> str:
+	"""Return cache key of a report run.
+
+	Unless the report shares cached results, the key is specific to the user. Output of reports can
+	depend on the user beyond roles and user permissions, e.g. "Only If Creator" permissions, shared
+	documents, permission query conditions or report code which reads the session user."""
+	from frappe.core.doctype.user_permission.user_permission import get_user_permissions
+
+	signature = frappe.as_json(
+		[
+			report.get("custom_report") or report.name,
+			filters,
+			options,
+			frappe.local.lang,
+			None if cint(report.get("share_cached_result")) else user,
+			sorted(frappe.get_roles(user)),
+			get_user_permissions(user),
+		],
+		indent=None,
+	)
+	digest = hashlib.md5(signature.encode(), usedforsecurity=False).hexdigest()
+	generation = cint(frappe.cache.get(frappe.cache.make_key(f"{GENERATION_KEY_PREFIX}{report.name}")))
+	return f"{RESULT_CACHE_PREFIX}{report.name}::{generation}::{digest}"
+
+
+def get_cached_result(key: str) -> dict | None:
+	if cached := frappe.cache.get_value(key, expires=True):
+		return {**cached}
+
+
+def set_cached_result(report, key: str, result: dict) -> None:
+	frappe.cache.set_value(key, {**result}, expires_in_sec=cint(report.cache_ttl) or DEFAULT_TTL)
+
+
+def invalidate_cached_results(report_names) -> None:
+	"""Invalidate all cached results of reports, stale results expire by themselves."""
+	pipeline = frappe.cache.pipeline()
+	for report_name in report_names:
+		pipeline.incr(frappe.cache.make_key(f"{GENERATION_KEY_PREFIX}{report_name}"))
+	pipeline.execute()
+
+
+def clear_report_cache(report_name: str) -> None:
+	"""Clear cached results of report, to be called when the report itself is changed."""
+	frappe.client_cache.delete_value(SOURCES_CACHE_KEY)
+	invalidate_cached_results([report_name])
+
+
+def get_cache_sources() -> dict[str, list[str]]:
+	"""Return map of doctype to names of reports with cached results which read from it."""
+
+	def generate():
+		sources = {}
+		reports = frappe.get_all(
+			"Report",
+			filters={"cache_result": 1, "disabled": 0},
+			fields=["name", "ref_doctype", "cache_source_doctypes"],
+			ignore_ddl=True,
+		)
+		for report in reports:
+			doctypes = {report.ref_doctype, *cstr(report.cache_source_doctypes).splitlines()}
+			for doctype in filter(None, map(str.strip, doctypes)):
+				sources.setdefault(doctype, []).append(report.name)
+		return sources
+
+	return frappe.client_cache.get_value(SOURCES_CACHE_KEY, generator=generate)
+
+
+def invalidate_report_results(doctype: str) -> None:
+	"""Clear cached results of reports which read from doctype after the transaction is committed.
+
+	Called for every document write, keep this cheap for doctypes no cached report depends on."""
+	reports = get_cache_sources().get(doctype)
+	if not reports:
+		return
+
+	if not hasattr(frappe.local, "stale_report_results"):
+		frappe.local.stale_report_results = set()
+
+	if not frappe.local.stale_report_results:
+		frappe.db.after_commit.add(clear_stale_report_results)
+		frappe.db.after_rollback.add(clear_stale_report_results)
+
+	frappe.local.stale_report_results.update(reports)
+
+
+def clear_stale_report_results() -> None:
+	reports = getattr(frappe.local, "stale_report_results", None)
+	if reports:
+		invalidate_cached_results(reports)
+		reports.clear()
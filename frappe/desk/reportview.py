@@ -3,7 +3,9 @@
 
 """build query for doclistview and return results"""
 
+import hashlib
 import json
+import time
 from functools import lru_cache
 
 from sql_metadata import Parser
@@ -16,11 +18,19 @@ from frappe.model import child_table_fields, default_fields, get_permitted_field
 from frappe.model.base_document import get_controller
 from frappe.model.db_query import DatabaseQuery
 from frappe.model.utils import is_virtual_doctype
-from frappe.utils import add_user_info, cint, format_duration
+from frappe.utils import add_user_info, cint, format_duration, get_table_name
 from frappe.utils.data import sbool
 
 DISALLOWED_PARAMS = ("cmd", "data", "ignore_permissions", "view", "user", "csrf_token", "join")
 
+COUNT_CACHE_PREFIX = "list_count::"
+COUNT_CACHE_TTL = 10 * 60
+# cached counts older than this are served while they are refreshed in background
+COUNT_REFRESH_INTERVAL = 60
+STATS_CACHE_PREFIX = "sidebar_stats::"
+STATS_GENERATION_PREFIX = "sidebar_stats_generation::"
+STATS_CACHE_TTL = 60
+
 
 @frappe.whitelist()
 @frappe.read_only()
@@ -67,8 +77,7 @@ def get_count() -> int | None:
 
 	# args.limit is specified to avoid getting accurate count.
 	if not args.limit:
-		args.fields = [f"count({fieldname}) as total_count"]
-		return execute(**args)[0].get("total_count")
+		return count_records(args)
 
 	args.fields = [fieldname]
 	partial_query = execute(**args, run=0)
@@ -93,6 +102,81 @@ def get_count() -> int | None:
 	return count
 
 
+def count_records(args: dict) -> int:
+	"""Exact count of records matching list view arguments."""
+	distinct = "distinct " if args.get("distinct") else ""
+	args = {**args, "order_by": None, "limit": None}
+	args["fields"] = [f"count({distinct}`tab{args['doctype']}`.name) as total_count"]
+	return execute(**args)[0].get("total_count")
+
+
+@frappe.whitelist()
+@frappe.read_only()
+def get_estimated_count() -> dict:
+	"""Return a count for list views without waiting for a `count(*)` on large tables.
+
+	The last exact count for the same filters and user is returned if it was computed less than
+	`COUNT_REFRESH_INTERVAL` seconds ago. Otherwise an older cached count or an estimate from table
+	statistics (only without filters) is returned and an exact count is computed in background. It
+	is cached and sent to the user with the `list_count_update` realtime event.
+
+	Return: `{"count": int | None, "estimated": bool, "key": str}`"""
+	args = get_form_params()
+	args.distinct = sbool(args.distinct)
+	for param in ("limit", "limit_page_length", "limit_start", "start", "page_length", "order_by"):
+		args.pop(param, None)
+
+	key = get_count_cache_key(args)
+	if is_virtual_doctype(args.doctype):
+		return {"count": get_count(), "estimated": False, "key": key}
+
+	estimate = None
+	if cached := frappe.cache.get_value(key):
+		estimate, computed_at = cached
+		if time.time() - computed_at < COUNT_REFRESH_INTERVAL:
+			return {"count": estimate, "estimated": False, "key": key}
+
+	elif not (args.filters or args.or_filters):
+		# table statistics can only be used if user can see every record
+		query = DatabaseQuery(args.doctype)
+		if frappe.get_meta(args.doctype).istable:
+			# match conditions are not built for child tables, permissions are checked on the parent
+			query.check_read_permission(args.doctype, parent_doctype=args.parent_doctype)
+		if not query.build_match_conditions() and not query.conditions:
+			estimate = frappe.db.estimate_count(args.doctype)
+
+	frappe.enqueue(
+		refresh_count,
+		queue="short",
+		job_id=key,
+		deduplicate=True,
+		args=dict(args),
+		user=frappe.session.user,
+		key=key,
+	)
+	return {"count": estimate, "estimated": True, "key": key}
+
+
+def get_count_cache_key(args: dict) -> str:
+	"""Key for counts of same list view filters, counts differ by user because of permissions."""
+	signature = frappe.as_json(
+		{k: args.get(k) for k in ("filters", "or_filters", "distinct", "fields")}, indent=None
+	)
+	digest = hashlib.md5(f"{frappe.session.user}:{signature}".encode(), usedforsecurity=False).hexdigest()
+	return f"{COUNT_CACHE_PREFIX}{args['doctype']}::{digest}"
+
+
+def refresh_count(args: dict, user: str, key: str) -> None:
+	"""Compute exact count as `user`, cache it and send it to the user."""
+	frappe.set_user(user)
+	count = count_records(frappe._dict(args))
+
+	frappe.cache.set_value(key, (count, time.time()), expires_in_sec=COUNT_CACHE_TTL)
+	frappe.publish_realtime(
+		"list_count_update", {"doctype": args["doctype"], "key": key, "count": count}, user=user
+	)
+
+
 def execute(doctype, *args, **kwargs):
 	return DatabaseQuery(doctype).execute(*args, **kwargs)
 
@@ -643,41 +727,22 @@ def get_stats(stats, doctype, filters=None):
 		# raised if its a virtual doctype
 		db_columns = []
 
-	for column in columns:
-		if column not in db_columns:
-			continue
-		try:
-			tag_count = frappe.get_list(
-				doctype,
-				fields=[column, "count(*)"],
-				filters=[*filters, [column, "!=", ""]],
-				group_by=column,
-				as_list=True,
-				distinct=1,
-			)
-
-			if column == "_user_tags":
-				results[column] = scrub_user_tags(tag_count)
-				no_tag_count = frappe.get_list(
-					doctype,
-					fields=[column, "count(*)"],
-					filters=[*filters, [column, "in", ("", ",")]],
-					as_list=True,
-					group_by=column,
-					order_by=column,
-				)
-
-				no_tag_count = no_tag_count[0][1] if no_tag_count else 0
+	columns = [column for column in columns if column in db_columns]
+	try:
+		counts = get_group_counts(doctype, columns, filters)
+	except (frappe.db.SQLError, frappe.db.InternalError):
+		# InternalError is raised when _user_tags column is added on the fly
+		return results
 
-				results[column].append([_("No Tags"), no_tag_count])
-			else:
-				results[column] = tag_count
+	for column in columns:
+		tag_count = [[value, count] for value, count in counts[column].items() if value not in (None, "")]
 
-		except frappe.db.SQLError:
-			pass
-		except frappe.db.InternalError:
-			# raised when _user_tags column is added on the fly
-			pass
+		if column == "_user_tags":
+			results[column] = scrub_user_tags(tag_count)
+			no_tag_count = sum(count for value, count in counts[column].items() if value in (None, "", ","))
+			results[column].append([_("No Tags"), no_tag_count])
+		else:
+			results[column] = tag_count
 
 	return results
 
@@ -692,18 +757,17 @@ def get_filter_dashboard_data(stats, doctype, filters=None):
 	stats = {}
 
 	columns = frappe.db.get_table_columns(doctype)
+	tags = [tag for tag in tags if tag["name"] in columns]
+	counts = get_group_counts(
+		doctype, [tag["name"] for tag in tags if tag["type"] not in ["Date", "Datetime"]], filters
+	)
+
 	for tag in tags:
-		if tag["name"] not in columns:
-			continue
 		tagcount = []
 		if tag["type"] not in ["Date", "Datetime"]:
-			tagcount = frappe.get_list(
-				doctype,
-				fields=[tag["name"], "count(*)"],
-				filters=[*filters, "ifnull(`{}`,'')!=''".format(tag["name"])],
-				group_by=tag["name"],
-				as_list=True,
-			)
+			tagcount = [
+				[value, count] for value, count in counts[tag["name"]].items() if value not in (None, "")
+			]
 
 		if tag["type"] not in [
 			"Check",
@@ -719,12 +783,7 @@ def get_filter_dashboard_data(stats, doctype, filters=None):
 			if stats[tag["name"]]:
 				data = [
 					"No Data",
-					frappe.get_list(
-						doctype,
-						fields=[tag["name"], "count(*)"],
-						filters=[*filters, "({0} = '' or {0} is null)".format(tag["name"])],
-						as_list=True,
-					)[0][1],
+					sum(count for value, count in counts[tag["name"]].items() if value in (None, "")),
 				]
 				if data and data[1] != 0:
 					stats[tag["name"]].append(data)
@@ -734,6 +793,82 @@ def get_filter_dashboard_data(stats, doctype, filters=None):
 	return stats
 
 
+def get_group_counts(doctype: str, columns: list[str], filters=None) -> dict[str, dict]:
+	"""Return count of records per value for each of the columns, `{column: {value: count}}`.
+
+	Counts of all columns are fetched in a single round trip, with a `union all` of one `group by`
+	query per column. Results are cached for a short time per filters and permission conditions, see
+	`STATS_CACHE_TTL`."""
+	if not columns:
+		return {}
+
+	query = DatabaseQuery(doctype)
+	signature = frappe.as_json(
+		[sorted(columns), filters, query.build_match_conditions(), query.conditions], indent=None
+	)
+	digest = hashlib.md5(signature.encode(), usedforsecurity=False).hexdigest()
+	generation = cint(frappe.cache.get(frappe.cache.make_key(f"{STATS_GENERATION_PREFIX}{doctype}")))
+	cache_key = f"{STATS_CACHE_PREFIX}{doctype}::{generation}::{digest}"
+
+	if (counts := frappe.cache.get_value(cache_key, expires=True)) is not None:
+		return counts
+
+	# Every part of the union selects its values in its own column and NULL in the others, so that
+	# values of different types don't have to be cast to a common type.
+	value_columns = [f"`_value{i}`" for i in range(len(columns))]
+	nulls = _get_typed_nulls(doctype, columns)
+	parts = []
+	for i, column in enumerate(columns):
+		grouped = frappe.get_list(
+			doctype,
+			fields=[column, "count(*) as count"],
+			filters=filters,
+			group_by=column,
+			order_by=None,
+			run=False,
+		)
+		values = ", ".join(
+			f"`t{i}`.`{column}` as {alias}" if j == i else f"{nulls[j]} as {alias}"
+			for j, alias in enumerate(value_columns)
+		)
+		parts.append(f"select {i} as `_column`, {values}, `t{i}`.`count` from ({grouped}) `t{i}`")
+
+	counts = {column: {} for column in columns}
+	for index, *values, count in frappe.db.sql(" union all ".join(parts)):
+		column = columns[index]
+		value = values[index]
+		counts[column][value] = counts[column].get(value, 0) + count
+
+	for column in columns:
+		counts[column] = dict(sorted(counts[column].items(), key=lambda item: item[1], reverse=True))
+
+	frappe.cache.set_value(cache_key, counts, expires_in_sec=STATS_CACHE_TTL)
+	return counts
+
+
+def _get_typed_nulls(doctype: str, columns: list[str]) -> list[str]:
+	"""Return NULL of the type of each column.
+
+	Postgres resolves the type of `union` columns pair by pair, a column which is NULL in the
+	first parts becomes `text` and doesn't match integer values of later parts."""
+	if frappe.db.db_type != "postgres":
+		return ["null"] * len(columns)
+
+	column_types = dict(
+		frappe.db.sql(
+			"""select column_name, data_type from information_schema.columns
+			where table_name = %s and table_schema = %s""",
+			(get_table_name(doctype), frappe.db.db_schema),
+		)
+	)
+	return [f"cast(null as {column_types[column]})" for column in columns]
+
+
+def clear_stats_cache(doctype: str) -> None:
+	"""Invalidate cached stats of doctype, stale entries expire by themselves."""
+	frappe.cache.incr(frappe.cache.make_key(f"{STATS_GENERATION_PREFIX}{doctype}"))
+
+
 def scrub_user_tags(tagcount):
 	"""rebuild tag list for tags"""
 	rdict = {}
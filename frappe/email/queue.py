@@ -4,7 +4,7 @@ from datetime import timedelta
 
 import frappe
 from frappe import _, msgprint
-from frappe.utils import cint, cstr, get_url, now_datetime
+from frappe.utils import cint, create_batch, cstr, get_url, now_datetime
 from frappe.utils.data import getdate
 from frappe.utils.verified_command import get_signed_params, verify_request
 
@@ -13,6 +13,10 @@ from frappe.utils.verified_command import get_signed_params, verify_request
 EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT = 0.33
 EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT = 10
 
+# Emails are loaded in chunks of this size before sending, loading the whole batch upfront
+# would leave the documents stale by the time the last ones are sent.
+EMAIL_QUEUE_PREFETCH_SIZE = 50
+
 
 def get_emails_sent_this_month(email_account=None):
 	"""Get count of emails sent from a specific email account.
@@ -145,20 +149,34 @@ def flush():
 		return
 
 	failed_email_queues = []
-	for row in email_queue_batch:
-		try:
-			email_queue: EmailQueue = frappe.get_doc("Email Queue", row.name)
-			email_queue.send()
-		except Exception:
-			frappe.get_doc("Email Queue", row.name).log_error()
-			failed_email_queues.append(row.name)
-
-			if (
-				len(failed_email_queues) / len(email_queue_batch)
-				> EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
-				and len(failed_email_queues) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
-			):
-				frappe.throw(_("Email Queue flushing aborted due to too many failures."))
+	for rows in create_batch(email_queue_batch, EMAIL_QUEUE_PREFETCH_SIZE):
+		prefetched_queues = _prefetch_email_queues([row.name for row in rows])
+		for row in rows:
+			try:
+				email_queue: EmailQueue = prefetched_queues.get(row.name) or frappe.get_doc(
+					"Email Queue", row.name
+				)
+				email_queue.send()
+			except Exception:
+				frappe.get_doc("Email Queue", row.name).log_error()
+				failed_email_queues.append(row.name)
+
+				if (
+					len(failed_email_queues) / len(email_queue_batch)
+					> EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
+					and len(failed_email_queues) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
+				):
+					frappe.throw(_("Email Queue flushing aborted due to too many failures."))
+
+
+def _prefetch_email_queues(names: list[str]) -> dict:
+	"""Load a batch of queued emails with their recipients in a handful of queries."""
+	try:
+		return {doc.name: doc for doc in frappe.get_docs("Email Queue", names)}
+	except frappe.DoesNotExistError:
+		# Some email was deleted in the meantime, fallback to loading them one by one.
+		frappe.clear_last_message()
+		return {}
 
 
 def get_queue():
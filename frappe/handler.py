@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 from werkzeug.wrappers import Response
 
 import frappe
+import frappe.rate_limiter
 import frappe.sessions
 import frappe.utils
 from frappe import _, is_whitelisted, ping
@@ -64,6 +65,7 @@ def handle():
 def execute_cmd(cmd, from_async=False):
 	"""execute a request as python module"""
 	cmd = frappe.override_whitelisted_method(cmd)
+	frappe.rate_limiter.apply_policy(cmd)
 
 	# via server script
 	server_script = get_server_script_map().get("_api", {}).get(cmd)
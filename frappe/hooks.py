@@ -224,6 +224,7 @@ scheduler_events = {
 		"frappe.email.queue.retry_sending_emails",
 		"frappe.monitor.flush",
 		"frappe.integrations.doctype.google_calendar.google_calendar.sync",
+		"frappe.search.sqlite_search.process_index_queue",
 	],
 	"hourly": [],
 	# Maintenance queue happen roughly once an hour but don't align with wall-clock time of *:00
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, TypeVar
 
 import frappe
 from frappe import _, _dict
+from frappe.desk.report_cache import invalidate_report_results
 from frappe.model import (
 	child_table_fields,
 	datetime_fields,
@@ -633,6 +634,14 @@ class BaseDocument:
 			ignore_nulls=self.doctype in DOCTYPES_FOR_DOCTYPE,
 			ignore_virtual=True,
 		)
+		invalidate_report_results(self.doctype)
+
+		if self._batch_write():
+			frappe.db.write_batch.add_insert(self.doctype, d, ignore_if_duplicate)
+			if not self.meta.istable:
+				frappe.db.invalidate_row_cache(self.doctype, self.name)
+			self.set("__islocal", False)
+			return
 
 		columns = list(d)
 		try:
@@ -672,6 +681,9 @@ class BaseDocument:
 			else:
 				raise
 
+		if not self.meta.istable:
+			frappe.db.invalidate_row_cache(self.doctype, self.name)
+
 		self.set("__islocal", False)
 
 	def db_update(self):
@@ -688,6 +700,13 @@ class BaseDocument:
 		# don't update name, as case might've been changed
 		name = cstr(d["name"])
 		del d["name"]
+		invalidate_report_results(self.doctype)
+
+		if self._batch_write():
+			frappe.db.write_batch.add_update(self.doctype, name, d)
+			if not self.meta.istable:
+				frappe.db.invalidate_row_cache(self.doctype, name)
+			return
 
 		columns = list(d)
 
@@ -705,6 +724,13 @@ class BaseDocument:
 			else:
 				raise
 
+		if not self.meta.istable:
+			frappe.db.invalidate_row_cache(self.doctype, name)
+
+	def _batch_write(self) -> bool:
+		"""Return True if writes of this document should be buffered, see `Database.batch_writes`."""
+		return frappe.db.write_batch is not None and self.doctype not in DOCTYPES_FOR_DOCTYPE
+
 	def db_update_all(self):
 		"""Raw update parent + children
 		DOES NOT VALIDATE AND CALL TRIGGERS"""
@@ -898,7 +924,10 @@ class BaseDocument:
 			if check_docstatus:
 				values_to_fetch += ("docstatus",)
 
-			if not meta.get("is_virtual"):
+			if (prefetched := self.flags.prefetched_links) and (doctype, docname) in prefetched:
+				# loaded for many documents at once, see `frappe.bulk_insert_validated`
+				values = _dict(prefetched[(doctype, docname)])
+			elif not meta.get("is_virtual"):
 				values = frappe.db.get_value(
 					doctype, docname, values_to_fetch, as_dict=True, cache=True, order_by=None
 				)
@@ -7,8 +7,9 @@ import datetime
 import json
 import re
 from collections import Counter
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterator, Mapping, Sequence
 from functools import cached_property
+from typing import Literal
 
 import frappe
 import frappe.defaults
@@ -16,6 +17,7 @@ import frappe.permissions
 import frappe.share
 from frappe import _
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database.row import ROWS
 from frappe.database.utils import DefaultOrderBy, FallBackDateTimeStr, NestedSetHierarchy
 from frappe.model import OPTIONAL_FIELDS, get_permitted_fields
 from frappe.model.meta import get_table_columns
@@ -49,6 +51,11 @@ ORDER_GROUP_PATTERN = re.compile(r".*[^a-z0-9-_ ,`'\"\.\(\)].*")
 SPECIAL_FIELD_CHARS = frozenset(("(", "`", ".", "'", '"', "*"))
 # XXX: These are just matching brackets to not confuse code formatters: ))
 
+# Compiled user permission conditions per user, see `DatabaseQuery.add_cached_user_permissions`
+USER_PERMISSION_PREDICATES_KEY = "user_permission_predicates"
+# Above this many permitted documents, conditions read `tabUser Permission` instead of listing them
+USER_PERMISSION_SUBQUERY_THRESHOLD = 500
+
 
 class DatabaseQuery:
 	def __init__(self, doctype, user=None):
@@ -68,6 +75,9 @@ class DatabaseQuery:
 		self.shared = []
 		self._fetch_shared_documents = False
 		self._metas = {}
+		self.as_iterator = False
+		self.batch_size = None
+		self.as_dict = True
 
 	@cached_property
 	def doctype_meta(self):
@@ -115,7 +125,17 @@ class DatabaseQuery:
 		ignore_ddl=False,
 		*,
 		parent_doctype=None,
-	) -> list:
+		as_iterator=False,
+		batch_size=None,
+		as_dict: bool | Literal["rows"] = True,
+	) -> list | Iterator:
+		"""Build and run the list query.
+
+		If `as_iterator` is set, an iterator is returned which streams results using an unbuffered
+		cursor, fetching `batch_size` rows at a time. See `Database.unbuffered_cursor` for caveats.
+
+		Pass `as_dict="rows"` to get compact read-only rows instead of dicts, see `frappe.database.row`.
+		"""
 		self.user = user or frappe.session.user
 
 		if not ignore_permissions:
@@ -144,6 +164,8 @@ class DatabaseQuery:
 			limit_page_length = limit
 		if as_list and not isinstance(self.fields, (Sequence | str)) and len(self.fields) > 1:
 			frappe.throw(_("Fields must be a list or tuple when as_list is enabled"))
+		if as_dict == ROWS and sbool(with_comment_count):
+			frappe.throw(_("{0} can not be used with {1}").format("with_comment_count", 'as_dict="rows"'))
 
 		self.filters: Filters
 		self.or_filters: Filters
@@ -175,6 +197,9 @@ class DatabaseQuery:
 		self.strict = strict
 		self.ignore_ddl = ignore_ddl
 		self.parent_doctype = parent_doctype
+		self.as_iterator = as_iterator
+		self.batch_size = batch_size
+		self.as_dict = as_dict
 
 		# for contextual user permission check
 		# to determine which user permission is applicable on link field of specific doctype
@@ -199,24 +224,30 @@ class DatabaseQuery:
 				"pluck": pluck,
 				"parent_doctype": parent_doctype,
 			} | self.__dict__
-			return frappe.call(controller.get_list, args=kwargs, **kwargs)
+			result = frappe.call(controller.get_list, args=kwargs, **kwargs)
+			return iter(result) if as_iterator else result
 
 		self.columns = self.get_table_columns()
 
 		# no table & ignore_ddl, return
 		if not self.columns:
-			return []
+			return iter(()) if as_iterator else []
 
 		result = self.build_and_run()
 
 		if sbool(with_comment_count) and not as_list and self.doctype:
-			self.add_comment_count(result)
+			if as_iterator and self.run:
+				result = self.add_comment_count_lazily(result)
+			else:
+				self.add_comment_count(result)
 
 		if save_user_settings:
 			self.save_user_settings_fields = save_user_settings_fields
 			self.update_user_settings()
 
 		if pluck:
+			if as_iterator and self.run:
+				return (d[pluck] for d in result)
 			return [d[pluck] for d in result]
 
 		return result
@@ -227,7 +258,7 @@ class DatabaseQuery:
 
 		if not args.fields:
 			# apply_fieldlevel_read_permissions has likely removed ALL the fields that user asked for
-			return []
+			return iter(()) if self.as_iterator else []
 
 		if args.conditions:
 			args.conditions = "where " + args.conditions
@@ -248,9 +279,20 @@ from {tables}
 {order_by}
 {limit}""".format(**args)
 
+		if self.as_iterator and self.run:
+			return frappe.db.sql_iterator(
+				query,
+				as_dict=False if self.as_list else self.as_dict,
+				as_list=self.as_list,
+				debug=self.debug,
+				update=self.update,
+				ignore_ddl=self.ignore_ddl,
+				batch_size=self.batch_size,
+			)
+
 		return frappe.db.sql(
 			query,
-			as_dict=not self.as_list,
+			as_dict=False if self.as_list else self.as_dict,
 			debug=self.debug,
 			update=self.update,
 			ignore_ddl=self.ignore_ddl,
@@ -732,42 +774,13 @@ from {tables}
 			# 	values = values.split(",")
 			field = meta.get_field(f.fieldname)
 			ref_doctype = field.options if field else f.doctype
-			lft, rgt = "", ""
-			if f.value:
-				lft, rgt = frappe.db.get_value(ref_doctype, f.value, ["lft", "rgt"]) or (0, 0)
-
-			# Get descendants elements of a DocType with a tree structure
-			if f.operator.lower() in (
-				"descendants of",
-				"not descendants of",
-				"descendants of (inclusive)",
-			):
-				nodes = frappe.get_all(
-					ref_doctype,
-					filters={"lft": [">", lft], "rgt": ["<", rgt]},
-					order_by="`lft` ASC",
-					pluck="name",
-				)
-				if f.operator.lower() == "descendants of (inclusive)":
-					nodes += [f.value]
-			else:
-				# Get ancestor elements of a DocType with a tree structure
-				nodes = frappe.get_all(
-					ref_doctype,
-					filters={"lft": ["<", lft], "rgt": [">", rgt]},
-					order_by="`lft` DESC",
-					pluck="name",
-				)
-
+			subquery = get_nested_set_hierarchy_subquery(
+				ref_doctype, cstr(f.value).strip(), f.operator.lower()
+			)
+			value = f"({subquery})"
 			fallback = "''"
-			value = [frappe.db.escape((cstr(v)).strip(), percent=False) for v in nodes]
-			if len(value):
-				value = f"({', '.join(value)})"
-			else:
-				value = "('')"
 
-			# changing operator to IN as the above code fetches all the parent / child values and convert into tuple
-			# which can be directly used with IN operator to query.
+			# changing operator to IN as the above subquery selects all the parent / child values
 			f.operator = (
 				"not in" if f.operator.lower() in ("not ancestors of", "not descendants of") else "in"
 			)
@@ -958,9 +971,7 @@ from {tables}
 
 			# add user permission only if role has read perm
 			elif role_permissions.get("read") or role_permissions.get("select"):
-				# get user permissions
-				user_permissions = frappe.permissions.get_user_permissions(self.user)
-				self.add_user_permissions(user_permissions)
+				self.add_cached_user_permissions()
 
 			# Only when full read access is not present fetch shared docuemnts.
 			# This is done to avoid extra query.
@@ -995,7 +1006,35 @@ from {tables}
 			+ f" in ({', '.join(frappe.db.escape(s, percent=False) for s in self.shared)})"
 		)
 
+	def add_cached_user_permissions(self):
+		"""Add user permission conditions, compiled once per user, doctype and reference doctype.
+
+		Cache is cleared along with cached user permissions of the user and on any doctype change."""
+		strict = cint(frappe.get_system_settings("apply_strict_user_permissions"))
+		key = (self.doctype, self.reference_doctype, strict)
+
+		predicates = frappe.cache.hget(USER_PERMISSION_PREDICATES_KEY, self.user) or {}
+		if key not in predicates:
+			user_permissions = frappe.permissions.get_user_permissions(self.user)
+			predicates = {**predicates, key: self.compile_user_permissions(user_permissions)}
+			frappe.cache.hset(USER_PERMISSION_PREDICATES_KEY, self.user, predicates)
+
+		self._apply_user_permission_predicate(*predicates[key])
+
 	def add_user_permissions(self, user_permissions):
+		self._apply_user_permission_predicate(*self.compile_user_permissions(user_permissions))
+
+	def _apply_user_permission_predicate(self, match_condition: str, match_filters: dict):
+		if match_condition:
+			self._fetch_shared_documents = True
+			self.match_conditions.append(match_condition)
+
+		if match_filters:
+			self._fetch_shared_documents = True
+			self.match_filters.append(match_filters)
+
+	def compile_user_permissions(self, user_permissions) -> tuple[str, dict]:
+		"""Return match condition and match filters for user permissions."""
 		doctype_link_fields = self.doctype_meta.get_link_fields()
 
 		# append current doctype with fieldname as 'name' as first link field
@@ -1041,18 +1080,50 @@ from {tables}
 						docs.append(permission.get("doc"))
 
 				if docs:
-					values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
-					condition += cast_name(f"`tab{self.doctype}`.`{df.get('fieldname')}`") + f" in ({values})"
+					column = cast_name(f"`tab{self.doctype}`.`{df.get('fieldname')}`")
+					if len(docs) > USER_PERMISSION_SUBQUERY_THRESHOLD:
+						applicable_for = (
+							self.reference_doctype
+							if df.get("fieldname") == "name" and self.reference_doctype
+							else self.doctype
+						)
+						condition += self.get_user_permission_subquery_condition(
+							column, df.get("options"), applicable_for
+						)
+					else:
+						values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
+						condition += f"{column} in ({values})"
 					match_conditions.append(f"({condition})")
 					match_filters[df.get("options")] = docs
 
-		if match_conditions:
-			self._fetch_shared_documents = True
-			self.match_conditions.append(" and ".join(match_conditions))
+		return " and ".join(match_conditions), match_filters
 
-		if match_filters:
-			self._fetch_shared_documents = True
-			self.match_filters.append(match_filters)
+	def get_user_permission_subquery_condition(self, column: str, allow: str, applicable_for: str) -> str:
+		"""Same documents as `get_user_permissions` lists, read from `tabUser Permission` in the query.
+
+		Avoids sending thousands of escaped names with every query of users with many permissions."""
+		permission_filters = " and ".join(
+			(
+				f"up.user = {frappe.db.escape(self.user, percent=False)}",
+				f"up.allow = {frappe.db.escape(allow, percent=False)}",
+				f"(ifnull(up.applicable_for, '') = '' or up.applicable_for = "
+				f"{frappe.db.escape(applicable_for, percent=False)})",
+			)
+		)
+		condition = (
+			f"{column} in (select up.for_value from `tabUser Permission` up where {permission_filters})"
+		)
+
+		if frappe.get_meta(allow).is_nested_set():
+			descendants = (
+				f"select d.name from `tab{allow}` d "
+				f"join `tab{allow}` ancestor on d.lft > ancestor.lft and d.rgt < ancestor.rgt "
+				f"join `tabUser Permission` up on up.for_value = ancestor.name "
+				f"where {permission_filters} and up.hide_descendants = 0"
+			)
+			condition = f"({condition} or {column} in ({descendants}))"
+
+		return condition
 
 	def get_permission_query_conditions(self) -> str:
 		conditions = []
@@ -1162,6 +1233,11 @@ from {tables}
 		else:
 			return ""
 
+	def add_comment_count_lazily(self, result: Iterator) -> Iterator:
+		for row in result:
+			self.add_comment_count((row,))
+			yield row
+
 	def add_comment_count(self, result):
 		for r in result:
 			if not r.name:
@@ -1401,3 +1477,20 @@ def strip_alias(field: str) -> str:
 	if " as " in field.lower():
 		return field.split(" as ", 1)[0]
 	return field
+
+
+def get_nested_set_hierarchy_subquery(doctype: str, name: str, hierarchy: str) -> str:
+	"""Return SQL selecting ancestors or descendants of `name`, compared on `lft` and `rgt` in the query.
+
+	Size of the query doesn't depend on the number of matching nodes."""
+	if hierarchy in ("descendants of", "not descendants of"):
+		condition = "tree.lft > node.lft and tree.rgt < node.rgt"
+	elif hierarchy == "descendants of (inclusive)":
+		condition = "tree.lft >= node.lft and tree.rgt <= node.rgt"
+	else:
+		condition = "tree.lft < node.lft and tree.rgt > node.rgt"
+
+	return (
+		f"select tree.name from `tab{doctype}` tree, `tab{doctype}` node "
+		f"where node.name = {frappe.db.escape(name, percent=False)} and {condition}"
+	)
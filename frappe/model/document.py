@@ -24,7 +24,7 @@ from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
 from frappe.model.base_document import BaseDocument, D, get_controller
 from frappe.model.docstatus import DocStatus
-from frappe.model.naming import set_new_name, validate_name
+from frappe.model.naming import preallocate_series, set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype, simple_singledispatch
 from frappe.model.workflow import set_workflow_state_on_action, validate_workflow
 from frappe.types import DF
@@ -153,6 +153,99 @@ def get_lazy_doc(doctype: str, name: str, *, for_update=None) -> "Document":
 	raise ImportError(doctype)
 
 
+def get_docs(
+	doctype: str, names: Iterable[str], *, for_update: bool | None = None, chunk_size: int = 1000
+) -> list["Document"]:
+	"""Load multiple documents of the same DocType (including child tables) in bulk.
+
+	Parents are fetched with one `name IN (...)` query and every child DocType with one
+	`parent IN (...)` query per chunk, instead of one query per document and table. Documents
+	are then constructed by their controllers as usual, `load_from_db` uses the fetched rows.
+
+	Documents are returned in the order of `names`. Raises `frappe.DoesNotExistError` if
+	any of the documents is missing, same as `frappe.get_doc`.
+
+	Usage:
+	        invoices = frappe.get_docs("Sales Invoice", ["SINV-0001", "SINV-0002"])
+	"""
+	names = list(dict.fromkeys(names))
+	if not names:
+		return []
+
+	meta = frappe.get_meta(doctype)
+	if doctype == "DocType" or meta.issingle or meta.is_virtual:
+		return [get_doc(doctype, name, for_update=for_update) for name in names]
+
+	controller = get_controller(doctype)
+	table_fieldnames = {df.fieldname: df.options for df in meta.get_table_fields()}
+	child_doctypes = {
+		child_doctype for child_doctype in table_fieldnames.values() if not is_virtual_doctype(child_doctype)
+	}
+
+	docs = []
+	for offset in range(0, len(names), chunk_size):
+		chunk = names[offset : offset + chunk_size]
+		parents = _get_rows_for_bulk_load(doctype, "name", chunk, for_update=for_update)
+		parents_by_name = {str(row.name): row for row in parents}
+
+		children = {str(name): {} for name in parents_by_name}
+		for child_doctype in child_doctypes:
+			rows = _get_rows_for_bulk_load(
+				child_doctype,
+				"parent",
+				list(parents_by_name),
+				for_update=for_update,
+				parenttype=doctype,
+			)
+			for row in rows:
+				if table_fieldnames.get(row.parentfield) != child_doctype:
+					continue
+				children[row.parent].setdefault(row.parentfield, []).append(row)
+
+		bulk_loaded_rows = {}
+		for name in chunk:
+			if (row := parents_by_name.get(str(name))) is None:
+				frappe.throw(
+					_("{0} {1} not found").format(_(doctype), name),
+					frappe.DoesNotExistError(doctype=doctype),
+				)
+			bulk_loaded_rows[(doctype, str(row.name))] = (row, children[str(row.name)])
+
+		previous_rows = getattr(frappe.local, "bulk_loaded_rows", None)
+		frappe.local.bulk_loaded_rows = bulk_loaded_rows
+		try:
+			docs.extend(
+				controller(doctype, row.name, for_update=for_update)
+				for row, _children in bulk_loaded_rows.values()
+			)
+		finally:
+			frappe.local.bulk_loaded_rows = previous_rows
+
+	return docs
+
+
+def _pop_bulk_loaded_rows(doctype: str, name) -> tuple[dict, dict[str, list]] | None:
+	"""Return parent and child rows of a document fetched by `get_docs`."""
+	if rows := getattr(frappe.local, "bulk_loaded_rows", None):
+		return rows.pop((doctype, cstr(name)), None)
+
+
+def _get_rows_for_bulk_load(
+	doctype: str, column: str, values: list, *, for_update: bool | None = None, parenttype: str | None = None
+) -> list[frappe._dict]:
+	if not values:
+		return []
+
+	table = frappe.qb.DocType(doctype)
+	query = frappe.qb.from_(table).select("*").where(table[column].isin(values))
+	if parenttype:
+		query = query.where(table.parenttype == parenttype).orderby(table.idx)
+	if for_update and frappe.db.db_type != "sqlite":
+		query = query.for_update()
+
+	return query.run(as_dict=True)
+
+
 class Document(BaseDocument):
 	"""All controllers inherit from `Document`."""
 
@@ -216,6 +309,7 @@ class Document(BaseDocument):
 		from fields"""
 
 		is_doctype = self.doctype == "DocType"
+		children = None
 
 		self.flags.ignore_children = True
 		if not is_doctype and self.meta.issingle:
@@ -230,7 +324,9 @@ class Document(BaseDocument):
 			self._fix_numeric_types()
 
 		else:
-			if not is_doctype and isinstance(self.name, str | int):
+			if bulk_loaded := _pop_bulk_loaded_rows(self.doctype, self.name):
+				d, children = bulk_loaded
+			elif not is_doctype and isinstance(self.name, str | int):
 				for_update = ""
 				if self.flags.for_update and frappe.db.db_type != "sqlite":
 					for_update = "FOR UPDATE"
@@ -262,7 +358,11 @@ class Document(BaseDocument):
 			super().__init__(d)
 		self.flags.pop("ignore_children", None)
 
-		self.load_children_from_db()
+		if children is None:
+			self.load_children_from_db()
+		else:
+			for fieldname in self._table_fieldnames:
+				self.set(fieldname, children.get(fieldname) or [])
 
 		# sometimes __setup__ can depend on child values, hence calling again at the end
 		if hasattr(self, "__setup__"):
@@ -606,6 +706,12 @@ class Document(BaseDocument):
 
 			qry.run()
 
+			if frappe.db.write_batch:
+				# rows removed from the table might not have been written yet
+				frappe.db.write_batch.discard_children(
+					df.options, str(self.name), self.doctype, fieldname, existing_row_names
+				)
+
 		# update / insert
 		for d in all_rows:
 			d: Document
@@ -1297,6 +1403,10 @@ class Document(BaseDocument):
 		if self.is_new():
 			return
 
+		if frappe.db.write_batch and frappe.db.write_batch.has_row(self.doctype, self.name):
+			# document was saved earlier in the same batch, read it back as written
+			frappe.db.flush_write_batch()
+
 		try:
 			self._doc_before_save = frappe.get_doc(self.doctype, self.name, for_update=True)
 		except frappe.DoesNotExistError:
@@ -1946,6 +2056,166 @@ def _document_values_generator(
 		yield tuple(doc_values.get(col) for col in columns)
 
 
+def bulk_insert_validated(
+	doctype: str,
+	documents: Iterable["Document | dict"],
+	*,
+	ignore_permissions: bool | None = None,
+	ignore_links: bool | None = None,
+	ignore_mandatory: bool | None = None,
+	chunk_size: int = 500,
+) -> list["Document"]:
+	"""Validate and insert new documents of the same DocType in bulk.
+
+	Documents go through the same validations and `before_insert`, `validate` and `before_save`
+	controller methods as `Document.insert`, but queries are shared by each chunk of documents:
+
+	- Link fields are resolved with one `name IN (...)` query per linked DocType.
+	- Naming series numbers are reserved with one update per series, see `preallocate_series`.
+	- Rows are written with multi-row inserts, see `Database.batch_writes`.
+
+	Warning/Info:
+	        - `after_insert`, `on_update` and other post-save methods are not run.
+	        - Unique constraint violations are raised when a chunk is written.
+
+	Usage:
+	        frappe.bulk_insert_validated("ToDo", [{"description": "one"}, {"description": "two"}])
+	"""
+	meta = frappe.get_meta(doctype)
+	if meta.issingle or meta.istable or meta.is_virtual:
+		frappe.throw(_("Bulk insert is not supported for {0}").format(_(doctype)))
+
+	flags = {
+		"ignore_permissions": ignore_permissions,
+		"ignore_links": ignore_links,
+		"ignore_mandatory": ignore_mandatory,
+	}
+
+	inserted = []
+	documents = iter(documents)
+	while chunk := list(itertools.islice(documents, chunk_size)):
+		docs = [get_doc({"doctype": doctype, **d}) if isinstance(d, dict) else d for d in chunk]
+		for doc in docs:
+			if doc.doctype != doctype:
+				frappe.throw(_("Expected {0} document, got {1}").format(doctype, doc.doctype))
+
+			doc.flags.update({flag: value for flag, value in flags.items() if value is not None})
+
+		_bulk_validate_and_insert(docs)
+		inserted.extend(docs)
+
+	return inserted
+
+
+def _bulk_validate_and_insert(docs: list["Document"]):
+	"""Same steps as `Document.insert`, in bulk where it saves queries."""
+	for doc in docs:
+		doc.flags.notifications_executed = []
+		doc.set("__islocal", True)
+		doc._set_defaults()
+		doc.set_user_and_timestamp()
+		doc.set_docstatus()
+		doc.check_if_latest()
+
+	_prefetch_link_values([doc for doc in docs if not doc.flags.ignore_links])
+
+	for doc in docs:
+		doc._validate_links()
+		doc.check_permission("create")
+		doc.run_method("before_insert")
+
+	with preallocate_series(len(docs)):
+		for doc in docs:
+			doc.set_new_name()
+
+	_validate_unique_names(docs)
+
+	for doc in docs:
+		doc.set_parent_in_children()
+		doc.validate_higher_perm_levels()
+
+		doc.flags.in_insert = True
+		doc.run_before_save_methods()
+		doc._validate()
+		doc.set_docstatus()
+		doc.flags.in_insert = False
+
+	with frappe.db.batch_writes():
+		for doc in docs:
+			doc.db_insert()
+			for d in doc.get_all_children():
+				d.db_insert()
+
+	for doc in docs:
+		for d in (doc, *doc.get_all_children()):
+			d.flags.prefetched_links = None
+
+		for attr in ("__islocal", "__unsaved"):
+			if hasattr(doc, attr):
+				delattr(doc, attr)
+
+
+def _prefetch_link_values(docs: list["Document"]):
+	"""Load linked documents of `docs` with one query per linked DocType, see `get_invalid_links`."""
+	all_docs = [d for doc in docs for d in (doc, *doc.get_all_children())]
+	links: dict[str, set[str | int]] = {}
+	fields: dict[str, set[str]] = {}
+
+	for d in all_docs:
+		for df in d.meta.get_link_fields() + d.meta.get("fields", {"fieldtype": ("=", "Dynamic Link")}):
+			docname = d.get(df.fieldname)
+			linked_doctype = df.options if df.fieldtype == "Link" else d.get(df.options)
+			if not (docname and linked_doctype and isinstance(docname, str | int)):
+				continue
+
+			links.setdefault(linked_doctype, set()).add(docname)
+			fields.setdefault(linked_doctype, {"name"}).update(
+				_df.fetch_from.split(".")[-1] for _df in d.meta.get_fields_to_fetch(df.fieldname)
+			)
+
+	prefetched = {}
+	for linked_doctype, names in links.items():
+		try:
+			meta = frappe.get_meta(linked_doctype)
+		except frappe.DoesNotExistError:
+			continue
+
+		columns = fields[linked_doctype]
+		if meta.is_submittable:
+			columns.add("docstatus")
+
+		# singles, virtual doctypes and non-column fetches are resolved per document
+		if meta.issingle or meta.is_virtual or not columns.issubset(meta.get_valid_columns()):
+			continue
+
+		for row in frappe.db.get_values(
+			linked_doctype, {"name": ("in", list(names))}, list(columns), as_dict=True, order_by=None
+		):
+			prefetched[(linked_doctype, row.name)] = row
+
+	for d in all_docs:
+		d.flags.prefetched_links = prefetched
+
+
+def _validate_unique_names(docs: list["Document"]):
+	"""Check that names are not repeated in `docs` or already taken, with a single query."""
+	doctype = docs[0].doctype
+	seen = set()
+	for doc in docs:
+		if doc.name in seen:
+			raise frappe.DuplicateEntryError(doctype, doc.name)
+		seen.add(doc.name)
+
+	existing = frappe.db.get_values(doctype, {"name": ("in", list(seen))}, "name", pluck=True, order_by=None)
+	if existing:
+		frappe.msgprint(
+			_("{0} {1} already exists").format(_(doctype), frappe.bold(existing[0])),
+			title=_("Duplicate Name"),
+			indicator="red",
+		)
+		raise frappe.DuplicateEntryError(doctype, existing[0])
+
+
 @frappe.whitelist()
 def unlock_document(doctype: str, name: str):
 	frappe.get_lazy_doc(doctype, name).unlock()
@@ -2145,6 +2415,7 @@ def get_document_cache_key(doctype: str, name: str):
 
 def clear_document_cache(doctype: str, name: str | None = None) -> None:
 	frappe.db.value_cache.pop(doctype, None)
+	frappe.db.invalidate_row_cache(doctype, name)
 
 	def clear_in_redis():
 		if name is not None:
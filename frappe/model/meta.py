@@ -79,13 +79,22 @@ def get_meta(doctype: "str | DocType", cached: bool = True) -> "_Meta":
 	Returns:
 	    Meta object for the given doctype.
 	"""
-	if (
-		cached
-		and isinstance(doctype, str)
-		and (meta := frappe.client_cache.get_value(f"doctype_meta::{doctype}"))
-	):
+	if not (cached and isinstance(doctype, str)):
+		return _build_meta(doctype)
+
+	key = f"doctype_meta::{doctype}"
+	if meta := frappe.client_cache.get_value(key):
 		return meta
 
+	# After cache is cleared, build meta in only one process and let others wait for it.
+	return frappe.cache.single_flight(
+		frappe.cache.make_key(key),
+		lambda: frappe.client_cache.get_value(key),
+		lambda: _build_meta(doctype),
+	)
+
+
+def _build_meta(doctype: "str | DocType") -> "_Meta":
 	meta = Meta(doctype)
 	key = f"doctype_meta::{meta.name}"
 	frappe.client_cache.set_value(key, meta)
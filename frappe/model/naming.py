@@ -6,6 +6,7 @@ import datetime
 import re
 import time
 from collections.abc import Callable
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
@@ -126,6 +127,11 @@ class NamingSeries:
 			frappe.qb.into(Series).insert(prefix, 0).columns("name", "current").run()
 
 		(frappe.qb.update(Series).set(Series.current, cint(new_count)).where(Series.name == prefix)).run()
+		_mark_series_locked(prefix)
+
+		# numbers buffered for block allocation are from the old counter
+		if get_series_block_size(prefix):
+			frappe.cache.delete_value(_get_series_block_key(prefix))
 
 	def get_current_value(self) -> int:
 		prefix = self.get_prefix()
@@ -400,21 +406,221 @@ def determine_consecutive_week_number(datetime):
 
 
 def getseries(key, digits):
+	# A separate transaction would wait on the row lock held by this one, see `_mark_series_locked`.
+	if (block_size := get_series_block_size(key)) and not _is_series_locked(key):
+		current = _next_from_series_block(key, block_size)
+	elif (preallocated := frappe.flags.preallocated_series) is not None:
+		current = preallocated.next(key)
+	else:
+		current = _reserve_series(key, 1)
+
+	return ("%0" + str(digits) + "d") % current
+
+
+def _reserve_series(key: str, count: int) -> int:
+	"""Increment counter of series `key` by `count` and return the first reserved number."""
 	# series created ?
 	# Using frappe.qb as frappe.get_values does not allow order_by=None
 	series = DocType("Series")
 	current = (frappe.qb.from_(series).where(series.name == key).for_update().select("current")).run()
+	_mark_series_locked(key)
 
 	if current and current[0][0] is not None:
 		current = current[0][0]
 		# yes, update it
-		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + 1 WHERE `name`=%s", (key,))
-		current = cint(current) + 1
-	else:
-		# no, create it
-		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, 1)", (key,))
-		current = 1
-	return ("%0" + str(digits) + "d") % current
+		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (count, key))
+		return cint(current) + 1
+
+	# no, create it
+	frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, count))
+	return 1
+
+
+def get_series_block_size(key: str) -> int:
+	"""Return size of blocks in which numbers of series `key` are reserved, 0 if disabled.
+
+	Block allocation is enabled per series prefix from site config, the longest matching prefix
+	wins:
+
+	        "naming_series_block_size": {"SINV-": 50, "POS-INV-": 200}
+
+	Numbers are reserved in a separate, immediately committed transaction and buffered in Redis,
+	so inserts don't wait on the `tabSeries` row lock held by other transactions until they
+	commit. This changes the numbering guarantees of the series:
+
+	- Numbers of documents which are rolled back are not reused, this leaves gaps.
+	- Buffered numbers are lost if Redis is flushed, this leaves gaps.
+	- Names are unique but not necessarily in order of creation across concurrent transactions.
+
+	Use `release_series_block` to give back buffered numbers, e.g. before changing the
+	configuration.
+	"""
+	block_sizes = frappe.conf.get("naming_series_block_size")
+	if not block_sizes or frappe.db.db_type == "sqlite":
+		return 0
+
+	prefixes = [prefix for prefix in block_sizes if key.startswith(prefix)]
+	if not prefixes:
+		return 0
+
+	return max(cint(block_sizes[max(prefixes, key=len)]), 0)
+
+
+def _get_series_block_key(key: str) -> str:
+	return f"naming_series_block|{key}"
+
+
+def _mark_series_locked(key: str) -> None:
+	"""Remember that the `tabSeries` row of `key` is locked by current transaction until it ends.
+
+	Numbers of such series are reserved in current transaction, even with block allocation."""
+	locked = getattr(frappe.local, "locked_series", None)
+	if locked is None:
+		locked = frappe.local.locked_series = set()
+
+	if not locked:
+		frappe.db.after_commit.add(locked.clear)
+		frappe.db.after_rollback.add(locked.clear)
+
+	locked.add(key)
+
+
+def _is_series_locked(key: str) -> bool:
+	return key in (getattr(frappe.local, "locked_series", None) or ())
+
+
+def _next_from_series_block(key: str, block_size: int) -> int:
+	block_key = _get_series_block_key(key)
+	while (current := frappe.cache.lpop(block_key)) is None:
+		first = _reserve_series_autonomously(key, block_size)
+		frappe.cache.rpush(block_key, *range(first, first + block_size))
+
+	return int(current)
+
+
+def release_series_block(key: str) -> int:
+	"""Give back numbers buffered for series `key`. Return the count of numbers given back.
+
+	Only numbers at the end of the series can be given back to the counter, other unused
+	numbers in the buffer are dropped and remain as gaps.
+	"""
+	block_key = _get_series_block_key(key)
+	unused = set()
+	while (number := frappe.cache.lpop(block_key)) is not None:
+		unused.add(int(number))
+
+	if not unused:
+		return 0
+
+	if _is_series_locked(key):
+		return _release_series_numbers(frappe.db, key, unused)
+
+	with _autonomous_transaction() as db:
+		return _release_series_numbers(db, key, unused)
+
+
+def _release_series_numbers(db, key: str, unused: set[int]) -> int:
+	current = db.sql("SELECT `current` FROM `tabSeries` WHERE `name`=%s FOR UPDATE", (key,))
+	current = cint(current[0][0]) if current else 0
+	released = 0
+	while current - released in unused:
+		released += 1
+
+	if released:
+		db.sql("UPDATE `tabSeries` SET `current` = `current` - %s WHERE `name`=%s", (released, key))
+
+	return released
+
+
+def _reserve_series_autonomously(key: str, count: int) -> int:
+	"""Same as `_reserve_series`, but committed right away in a separate transaction."""
+	with _autonomous_transaction() as db:
+		current = db.sql("SELECT `current` FROM `tabSeries` WHERE `name`=%s FOR UPDATE", (key,))
+		if current and current[0][0] is not None:
+			db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (count, key))
+			return cint(current[0][0]) + 1
+
+		db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, count))
+		return 1
+
+
+@contextmanager
+def _autonomous_transaction():
+	"""Run queries on a separate connection and commit them independently of `frappe.db`."""
+	from frappe.database import get_db
+
+	db = get_db(
+		socket=frappe.db.socket,
+		host=frappe.db.host,
+		user=frappe.db.user,
+		password=frappe.db.password,
+		port=frappe.db.port,
+		cur_db_name=frappe.db.cur_db_name,
+	)
+	db.connect()
+	try:
+		yield db
+		db.commit()
+	finally:
+		# uncommitted changes are rolled back when the connection is closed or returned to the pool
+		db.close()
+
+
+class PreallocatedSeries:
+	"""Numbers reserved in blocks for each series, see `preallocate_series`."""
+
+	__slots__ = ("block_size", "blocks")
+
+	def __init__(self, block_size: int):
+		self.block_size = block_size
+		# key -> [next number, last reserved number]
+		self.blocks: dict[str, list[int]] = {}
+
+	def next(self, key: str) -> int:
+		block = self.blocks.get(key)
+		if not block or block[0] > block[1]:
+			first = _reserve_series(key, self.block_size)
+			block = self.blocks[key] = [first, first + self.block_size - 1]
+
+		current = block[0]
+		block[0] += 1
+		return current
+
+	def release_unused(self) -> None:
+		"""Give back reserved numbers which were not used, if nothing else was reserved after them."""
+		series = DocType("Series")
+		for key, (next_number, last) in self.blocks.items():
+			if unused := last - next_number + 1:
+				(
+					frappe.qb.update(series)
+					.set(series.current, series.current - unused)
+					.where((series.name == key) & (series.current == last))
+				).run()
+		self.blocks.clear()
+
+
+@contextmanager
+def preallocate_series(block_size: int):
+	"""Reserve naming series numbers in blocks of `block_size` inside this context.
+
+	`getseries` normally locks and updates the `tabSeries` row for every new name. Inside this
+	context, the first name of a series reserves `block_size` numbers with a single update and
+	the following names are handed out from memory. Numbers left unused when the context exits
+	are given back, so names stay gapless as long as the transaction commits.
+
+	The `tabSeries` rows stay locked until the transaction ends, same as with `getseries`.
+	"""
+	if frappe.flags.preallocated_series is not None:
+		yield frappe.flags.preallocated_series
+		return
+
+	frappe.flags.preallocated_series = preallocated = PreallocatedSeries(max(cint(block_size), 1))
+	try:
+		yield preallocated
+		frappe.flags.preallocated_series = None
+		preallocated.release_unused()
+	finally:
+		frappe.flags.preallocated_series = None
 
 
 def revert_series_if_last(key, name, doc=None):
@@ -457,6 +663,11 @@ def revert_series_if_last(key, name, doc=None):
 	if "." in prefix:
 		prefix = parse_naming_series(prefix.split("."), doc=doc)
 
+	if get_series_block_size(prefix):
+		# Counter is ahead of the buffered numbers, it can't be reverted. Locking the row here would
+		# also block reserving the next block in the same transaction, see `_next_from_series_block`.
+		return
+
 	count = cint(name.replace(prefix, ""))
 	series = DocType("Series")
 	current = (frappe.qb.from_(series).where(series.name == prefix).for_update().select("current")).run()
@@ -220,6 +220,7 @@ def rename_doc(
 		frappe.delete_doc(doctype, old)
 
 	new_doc.clear_cache()
+	frappe.clear_document_cache(doctype, old)
 	frappe.clear_cache()
 	if rebuild_search:
 		frappe.enqueue("frappe.utils.global_search.rebuild_for_doctype", doctype=doctype)
@@ -1,12 +1,31 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+"""Log of requests and background jobs, enabled with `monitor` in site config.
+
+Every transaction is logged as one JSON line, entries are pushed to a Redis list and appended to
+`logs/monitor.json.log` by `flush`, which runs with the scheduler.
+
+Optional site config:
+
+- `monitor_buffer_size`: number of entries buffered in process before they are pushed to Redis
+        with a single pipelined command (default: 1, no buffering). Buffered entries are also pushed
+        by a timer `MONITOR_BUFFER_TIME` seconds after the first of them, at the end of background
+        jobs and at process exit.
+- `monitor_percentiles`: keep fixed-size histograms of durations per endpoint, see `get_percentiles`.
+- `monitor_log_max_size`: size in bytes after which the log file is rotated (default: 100 MB).
+"""
+
+import atexit
 import datetime
-import json
+import math
 import os
+import threading
 import traceback
 import uuid
+from collections import Counter
 
+import orjson
 import rq
 
 import frappe
@@ -14,8 +33,25 @@ from frappe.utils.data import cint
 from frappe.utils.synchronization import filelock
 
 MONITOR_REDIS_KEY = "monitor-transactions"
+MONITOR_HISTOGRAM_KEY = "monitor-histogram"
 MONITOR_MAX_ENTRIES = 1000000
 
+MONITOR_BUFFER_TIME = 5
+FLUSH_BATCH_SIZE = 10000
+LOG_MAX_SIZE = 100 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Durations are counted in buckets growing by 10%, percentiles are accurate to 10%
+HISTOGRAM_BASE = 1.1
+HISTOGRAM_BUCKETS = 256
+PERCENTILES = (50, 95, 99)
+
+# Entries not yet pushed to Redis, per monitor key of the site, along with the site's
+# `monitor_percentiles` setting as the site isn't known when they are flushed
+_buffer: dict[bytes, tuple[bool, list[bytes]]] = {}
+_buffer_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+
 
 def start(transaction_type="request", method=None, kwargs=None):
 	if frappe.conf.monitor:
@@ -116,22 +152,172 @@ class Monitor:
 			traceback.print_exc()
 
 	def store(self):
-		serialized = json.dumps(self.data, sort_keys=True, default=str, separators=(",", ":"))
-		length = frappe.cache.rpush(MONITOR_REDIS_KEY, serialized)
-		if cint(length) > MONITOR_MAX_ENTRIES:
-			frappe.cache.ltrim(MONITOR_REDIS_KEY, 1, -1)
+		serialized = orjson.dumps(
+			{**self.data, "timestamp": str(self.data.timestamp)}, default=str, option=orjson.OPT_SORT_KEYS
+		)
 
+		key = frappe.cache.make_key(MONITOR_REDIS_KEY)
+		with _buffer_lock:
+			_percentiles, entries = _buffer.setdefault(key, (bool(frappe.conf.monitor_percentiles), []))
+			entries.append(serialized)
+			buffered = sum(len(entries) for _percentiles, entries in _buffer.values())
+			flush = self.data.transaction_type != "request" or buffered >= cint(
+				frappe.conf.monitor_buffer_size
+			)
+			if not flush:
+				# idle workers don't store more entries, push these after a while regardless
+				_schedule_flush()
 
-def flush():
-	logs = frappe.cache.lrange(MONITOR_REDIS_KEY, 0, -1)
-	if not logs:
+		if flush:
+			flush_buffer()
+
+
+def _schedule_flush():
+	"""Start a timer to flush the buffer, unless one is pending. Called with `_buffer_lock` held."""
+	global _flush_timer
+
+	if _flush_timer:
 		return
 
-	logs = list(map(frappe.safe_decode, logs))
+	_flush_timer = threading.Timer(MONITOR_BUFFER_TIME, flush_buffer)
+	_flush_timer.daemon = True
+	_flush_timer.start()
+
+
+def flush_buffer():
+	"""Push buffered entries of all sites to Redis with a single pipelined command."""
+	global _flush_timer
+
+	with _buffer_lock:
+		buffer = {key: value for key, value in _buffer.items() if value[1]}
+		_buffer.clear()
+		if _flush_timer:
+			_flush_timer.cancel()
+			_flush_timer = None
+
+	if not buffer or not frappe.cache:
+		return
+
+	# also called at exit, when no site is bound and config is not available
+	try:
+		pipeline = frappe.cache.pipeline(transaction=False)
+		for key, (percentiles, entries) in buffer.items():
+			pipeline.rpush(key, *entries)
+			pipeline.ltrim(key, -MONITOR_MAX_ENTRIES, -1)
+
+			if percentiles:
+				histogram_key = key.replace(MONITOR_REDIS_KEY.encode(), MONITOR_HISTOGRAM_KEY.encode())
+				for field, count in _get_histogram_counts(entries).items():
+					pipeline.hincrby(histogram_key, field, count)
+
+		pipeline.execute()
+	except Exception:
+		traceback.print_exc()
+
+
+def _forget_buffer():
+	# Entries buffered before fork belong to the parent process, its timer thread isn't copied
+	global _buffer_lock, _flush_timer
+	_buffer.clear()
+	_buffer_lock = threading.Lock()
+	_flush_timer = None
+
+
+atexit.register(flush_buffer)
+os.register_at_fork(after_in_child=_forget_buffer)
+
+
+def flush():
+	"""Append entries from Redis to the log file, in batches of `FLUSH_BATCH_SIZE`."""
+	flush_buffer()
+
 	with filelock("monitor_flush", is_global=True, timeout=5):
-		with open(log_file(), "a") as f:
-			f.write("\n".join(logs))
-			f.write("\n")
+		path = log_file()
+		while logs := frappe.cache.lrange(MONITOR_REDIS_KEY, 0, FLUSH_BATCH_SIZE - 1):
+			with open(path, "ab") as f:
+				f.write(b"\n".join(logs))
+				f.write(b"\n")
+
+			# Remove written entries, new ones are only ever appended at the end
+			frappe.cache.ltrim(MONITOR_REDIS_KEY, len(logs), -1)
+			rotate_log_file(path)
+
+			if len(logs) < FLUSH_BATCH_SIZE:
+				break
+
+
+def rotate_log_file(path: str) -> None:
+	"""Move log file to `monitor.json.log.1` once it is larger than `monitor_log_max_size`."""
+	max_size = cint(frappe.conf.monitor_log_max_size) or LOG_MAX_SIZE
+	if not os.path.exists(path) or os.path.getsize(path) < max_size:
+		return
+
+	for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+		if os.path.exists(f"{path}.{i}"):
+			os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+	os.replace(path, f"{path}.1")
+
+
+def _get_histogram_counts(entries: list[bytes]) -> Counter:
+	counts = Counter()
+	for entry in entries:
+		data = orjson.loads(entry)
+		if endpoint := _get_endpoint(data):
+			counts[f"{endpoint}|{_get_bucket(data.get('duration') or 0)}"] += 1
+
+	return counts
+
+
+def _get_endpoint(data: dict) -> str | None:
+	"""Group requests by path and jobs by method, without document names to keep histograms few."""
+	if data.get("transaction_type") == "job":
+		return (data.get("job") or {}).get("method")
+
+	path = (data.get("request") or {}).get("path")
+	if not path:
+		return None
+
+	parts = path.strip("/").split("/")
+	# /api/method/<method>, /api/v2/method/<method>
+	depth = parts.index("method") + 2 if "method" in parts[:3] else 3
+	return "/" + "/".join(parts[:depth])
+
+
+def _get_bucket(duration: int) -> int:
+	if duration <= 1:
+		return 0
+	return min(int(math.log(duration, HISTOGRAM_BASE)), HISTOGRAM_BUCKETS - 1)
+
+
+def get_percentiles(endpoint: str | None = None) -> dict[str, dict]:
+	"""Return count and p50, p95 and p99 durations (in microseconds) per endpoint.
+
+	Requires `monitor_percentiles` in site config. Durations are the upper bound of their bucket."""
+	flush_buffer()
+
+	histograms: dict[str, dict[int, int]] = {}
+	key = frappe.cache.make_key(MONITOR_HISTOGRAM_KEY)
+	for field, count in frappe.cache.execute_command("HGETALL", key).items():
+		name, bucket = frappe.safe_decode(field).rsplit("|", 1)
+		if endpoint is None or name == endpoint:
+			histograms.setdefault(name, {})[int(bucket)] = int(count)
+
+	result = {}
+	for name, buckets in histograms.items():
+		total = sum(buckets.values())
+		stats = {"count": total}
+		for percentile in PERCENTILES:
+			rank = math.ceil(total * percentile / 100)
+			seen = 0
+			for bucket in sorted(buckets):
+				seen += buckets[bucket]
+				if seen >= rank:
+					stats[f"p{percentile}"] = int(HISTOGRAM_BASE ** (bucket + 1))
+					break
+		result[name] = stats
+
+	return result
+
 
-	# Remove fetched entries from cache
-	frappe.cache.ltrim(MONITOR_REDIS_KEY, len(logs) - 1, -1)
+def reset_percentiles() -> None:
+	frappe.cache.delete_value(MONITOR_HISTOGRAM_KEY)
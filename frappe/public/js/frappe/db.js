@@ -103,6 +103,21 @@ frappe.db = {
 		});
 	},
 	count: function (doctype, args = {}, cache = false) {
+		return frappe.xcall(
+			"frappe.desk.reportview.get_count",
+			frappe.db.get_count_args(doctype, args),
+			cache ? "GET" : "POST",
+			{ cache }
+		);
+	},
+	estimated_count: function (doctype, args = {}) {
+		// cached or estimated count, see `frappe.desk.reportview.get_estimated_count`
+		return frappe.xcall(
+			"frappe.desk.reportview.get_estimated_count",
+			frappe.db.get_count_args(doctype, args)
+		);
+	},
+	get_count_args: function (doctype, args = {}) {
 		let filters = args.filters || {};
 		let limit = args.limit;
 
@@ -115,18 +130,13 @@ frappe.db = {
 
 		const fields = [];
 
-		return frappe.xcall(
-			"frappe.desk.reportview.get_count",
-			{
-				doctype,
-				filters,
-				fields,
-				distinct,
-				limit,
-			},
-			cache ? "GET" : "POST",
-			{ cache }
-		);
+		return {
+			doctype,
+			filters,
+			fields,
+			distinct,
+			limit,
+		};
 	},
 	get_link_options(doctype, txt = "", filters = {}) {
 		return new Promise((resolve) => {
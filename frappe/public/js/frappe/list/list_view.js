@@ -662,33 +662,40 @@ frappe.views.ListView = class ListView extends frappe.views.BaseList {
 			return;
 		}
 
+		this.get_count_str().then((count) => this.show_count(count));
+	}
+
+	show_count(count) {
 		let me = this;
 		let $count = this.get_count_element();
-		this.get_count_str().then((count) => {
-			$count.html(`<span>${count}</span>`);
-			if (
-				this.count_upper_bound &&
-				(this.total_count == this.count_upper_bound || this.total_count == null)
-			) {
-				$count.attr(
-					"title",
-					__(
-						"The count shown is an estimated count. Click here to see the accurate count."
-					)
-				);
-				$count.tooltip({ delay: { show: 600, hide: 100 }, trigger: "hover" });
-				$count.css("cursor", "pointer");
-				$count.css("white-space", "nowrap");
-				$count.on("click", () => {
-					me.count_upper_bound = 0;
-					$count.off("click");
-					$count.tooltip("disable");
-					me.freeze();
-					me.render_count();
-					$count.css("cursor", "");
-				});
-			}
-		});
+		$count.html(`<span>${count}</span>`);
+		if (
+			this.count_upper_bound &&
+			(this.total_count == this.count_upper_bound ||
+				this.total_count == null ||
+				this.count_estimated)
+		) {
+			$count.attr(
+				"title",
+				__("The count shown is an estimated count. Click here to see the accurate count.")
+			);
+			$count.tooltip({ delay: { show: 600, hide: 100 }, trigger: "hover" });
+			$count.css("cursor", "pointer");
+			$count.css("white-space", "nowrap");
+			$count.off("click").on("click", () => {
+				me.count_upper_bound = 0;
+				$count.off("click");
+				$count.tooltip("disable");
+				me.freeze();
+				me.render_count();
+				$count.css("cursor", "");
+			});
+		} else {
+			$count.off("click");
+			$count.tooltip("dispose");
+			$count.removeAttr("title");
+			$count.css("cursor", "");
+		}
 	}
 
 	get_count_element() {
@@ -1141,32 +1148,71 @@ frappe.views.ListView = class ListView extends frappe.views.BaseList {
 				},
 				Boolean(this.count_upper_bound)
 			)
+			.then((total_count) => {
+				this.count_estimated = false;
+				if (total_count == null && this.count_upper_bound) {
+					// count timed out, use cached or estimated count until exact count is computed
+					return this.get_estimated_count();
+				}
+				return total_count;
+			})
 			.then((total_count) => {
 				this.total_count = total_count;
 				this.count_without_children =
 					count_without_children !== current_count ? count_without_children : undefined;
+				return this.format_count_str();
+			});
+	}
 
-				let count_str;
-				if (this.total_count === this.count_upper_bound) {
-					count_str = `${format_number(this.total_count - 1, null, 0)}+`;
-				} else if (this.total_count == null) {
-					count_str = "??";
-				} else {
-					count_str = format_number(this.total_count, null, 0);
-				}
+	format_count_str() {
+		let current_count = this.data.length;
+		let count_str;
+		if (this.total_count === this.count_upper_bound) {
+			count_str = `${format_number(this.total_count - 1, null, 0)}+`;
+		} else if (this.total_count == null) {
+			count_str = "??";
+		} else if (this.count_estimated) {
+			count_str = `~${format_number(this.total_count, null, 0)}`;
+		} else {
+			count_str = format_number(this.total_count, null, 0);
+		}
 
-				let str = __("{0} of {1}", [format_number(current_count, null, 0), count_str]);
-				if (this.count_without_children) {
-					str = __("{0} of {1} ({2} rows with children)", [
-						count_without_children,
-						count_str,
-						current_count,
-					]);
+		let str = __("{0} of {1}", [format_number(current_count, null, 0), count_str]);
+		if (this.count_without_children) {
+			str = __("{0} of {1} ({2} rows with children)", [
+				this.count_without_children,
+				count_str,
+				current_count,
+			]);
+		}
+		return str;
+	}
+
+	get_estimated_count() {
+		return frappe.db
+			.estimated_count(this.doctype, { filters: this.get_filters_for_args() })
+			.then((r) => {
+				this.count_estimated = r.estimated && r.count != null;
+				if (r.estimated) {
+					this.wait_for_exact_count(r.key);
 				}
-				return str;
+				return r.count;
 			});
 	}
 
+	wait_for_exact_count(key) {
+		frappe.realtime.off("list_count_update", this.exact_count_handler);
+		this.exact_count_handler = (data) => {
+			if (data.key !== key) return;
+			frappe.realtime.off("list_count_update", this.exact_count_handler);
+			if (this.list_view_settings?.disable_count) return;
+			this.total_count = data.count;
+			this.count_estimated = false;
+			this.show_count(this.format_count_str());
+		};
+		frappe.realtime.on("list_count_update", this.exact_count_handler);
+	}
+
 	get_form_link(doc) {
 		if (this.settings.get_form_link) {
 			return this.settings.get_form_link(doc);
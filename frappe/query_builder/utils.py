@@ -8,6 +8,7 @@ from pypika.queries import Column, QueryBuilder, _SetOperation
 from pypika.terms import PseudoColumn
 
 import frappe
+from frappe import _
 from frappe.query_builder.terms import NamedParameterWrapper
 
 from .builder import Base, MariaDB, Postgres, SQLite
@@ -82,6 +83,17 @@ def Table(*args, **kwargs):
 def execute_query(query, *args, **kwargs):
 	child_queries = query._child_queries
 	query, params = prepare_query(query)
+
+	if kwargs.get("as_iterator") and kwargs.get("run", True):
+		if child_queries:
+			frappe.throw(_("Child table fields can not be fetched with {0}").format("as_iterator"))
+		kwargs.pop("as_iterator")
+		# Stream the results through an unbuffered cursor, see `Database.sql_iterator`
+		return frappe.local.db.sql_iterator(query, params, **kwargs)
+
+	if child_queries and kwargs.get("as_dict") == "rows":
+		frappe.throw(_("Child table fields can not be fetched with {0}").format('as_dict="rows"'))
+
 	result = frappe.local.db.sql(query, params, *args, **kwargs)  # nosemgrep
 
 	if child_queries and isinstance(child_queries, list) and result:
@@ -9,7 +9,53 @@ from werkzeug.wrappers import Response
 
 import frappe
 from frappe import _
-from frappe.utils import cint
+from frappe.monitor import add_data_to_monitor
+from frappe.utils import cint, flt
+
+# Add to the counter of current window and start expiry of the window on first request, atomically
+WINDOW_COUNTER_SCRIPT = """
+local counter = redis.call('INCRBY', KEYS[1], ARGV[2])
+if redis.call('TTL', KEYS[1]) == -1 then
+	redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return counter
+"""
+
+# Token bucket holding up to `limit` tokens, refilled at `limit / seconds` tokens per second.
+# Returns whether the request is allowed and the tokens left after it, as a string to keep fractions.
+TOKEN_BUCKET_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local seconds = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or limit
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(limit, tokens + (now - updated_at) * limit / seconds)
+
+local allowed = 0
+if tokens >= cost then
+	tokens = tokens - cost
+	allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(seconds))
+return {allowed, tostring(tokens)}
+"""
+
+_scripts = {}
+
+
+def _get_script(script: str):
+	"""Return script registered with current redis client, it is run with EVALSHA in one round trip."""
+	registered = _scripts.get(script)
+	if not registered or registered.registered_client is not frappe.cache:
+		registered = _scripts[script] = frappe.cache.register_script(script)
+	return registered
 
 
 def apply():
@@ -53,11 +99,7 @@ class RateLimiter:
 
 		self.window_number, self.spent = divmod(int(self.start), self.window)
 		self.key = frappe.cache.make_key(f"rate-limit-counter-{self.window_number}")
-		self.counter = cint(frappe.cache.get(self.key))
-		if not self.counter:
-			# This is the first request in this window
-			frappe.cache.incrby(self.key, 0)
-			frappe.cache.expire(self.key, self.window)
+		self.counter = cint(_get_script(WINDOW_COUNTER_SCRIPT)(keys=[self.key], args=[self.window, 0]))
 
 		self.remaining = max(self.limit - self.counter, 0)
 		self.reset = self.window - self.spent
@@ -107,11 +149,12 @@ def rate_limit(
 	seconds: int = 24 * 60 * 60,
 	methods: str | list = "ALL",
 	ip_based: bool = True,
+	user_based: bool = False,
 ):
 	"""Decorator to rate limit an endpoint.
 
 	This will limit Number of requests per endpoint to `limit` within `seconds`.
-	Uses redis cache to track request counts.
+	Uses a token bucket in redis cache, see `consume_token`.
 
 	:param key: Key is used to identify the requests uniqueness (Optional)
 	:param limit: Maximum number of requests to allow with in window time
@@ -122,6 +165,8 @@ def rate_limit(
 	:type methods: string or list or tuple
 	:param ip_based: flag to allow ip based rate-limiting
 	:type ip_based: Boolean
+	:param user_based: flag to rate limit each user separately
+	:type user_based: Boolean
 
 	Return: a decorator function that limit the number of requests per endpoint
 	"""
@@ -148,20 +193,20 @@ def rate_limit(
 
 			identity = identity or ip or user_key
 
+			if user_based:
+				identity = ":".join([identity, frappe.session.user]) if identity else frappe.session.user
+
 			if not identity:
 				frappe.throw(_("Either key or IP flag is required."))
 
-			cache_key = frappe.cache.make_key(f"rl:{frappe.form_dict.cmd}:{identity}")
+			cache_key = f"rl:bucket:{frappe.form_dict.cmd}:{identity}"
 
 			if not callable(seconds):
-				cache_key += f":{seconds}".encode()
-
-			value = frappe.cache.get(cache_key)
-			if not value:
-				frappe.cache.setex(cache_key, seconds, 0)
+				cache_key += f":{seconds}"
 
-			value = frappe.cache.incrby(cache_key, 1)
-			if value > _limit:
+			_seconds = seconds() if callable(seconds) else seconds
+			allowed, _remaining = consume_token(cache_key, _limit, _seconds)
+			if not allowed:
 				frappe.throw(
 					_("You hit the rate limit because of too many requests. Please try after sometime."),
 					frappe.RateLimitExceededError,
@@ -172,3 +217,51 @@ def rate_limit(
 		return wrapper
 
 	return ratelimit_decorator
+
+
+def consume_token(key: str, limit: int, seconds: int, cost: int = 1) -> tuple[bool, float]:
+	"""Take `cost` tokens from the token bucket at `key`, in a single atomic round trip.
+
+	A bucket holds up to `limit` tokens and is refilled continuously, so `limit` requests are
+	allowed in a burst and then one every `seconds / limit` seconds. Unlike fixed windows, this
+	doesn't allow twice the limit around the end of a window.
+
+	Return: whether the tokens could be taken and the number of tokens left."""
+	allowed, remaining = _get_script(TOKEN_BUCKET_SCRIPT)(
+		keys=[frappe.cache.make_key(key)], args=[limit, seconds, cost]
+	)
+	return bool(allowed), flt(frappe.safe_decode(remaining))
+
+
+def apply_policy(cmd: str):
+	"""Apply rate limit configured for a whitelisted method in site config.
+
+	Example:
+	        "rate_limit_policies": {
+	                "frappe.client.get_list": {"limit": 100, "seconds": 60, "per": "user"},
+	                "frappe.www.login.send_login_link": {"limit": 5, "seconds": 3600, "per": "ip"}
+	        }
+
+	`per` is one of `user` (default), `ip` or `method` (shared by all callers)."""
+	policies = frappe.conf.rate_limit_policies
+	if not policies or not frappe.request or not (policy := policies.get(cmd)):
+		return
+
+	per = policy.get("per") or "user"
+	if per == "ip":
+		identity = frappe.local.request_ip
+	elif per == "method":
+		identity = "*"
+	else:
+		identity = frappe.session.user
+
+	limit = cint(policy.get("limit"))
+	seconds = cint(policy.get("seconds")) or 60
+	allowed, remaining = consume_token(f"rl:policy:{cmd}:{identity}:{seconds}", limit, seconds)
+
+	add_data_to_monitor(rate_limit={"method": cmd, "limit": limit, "remaining": remaining})
+	if not allowed:
+		frappe.throw(
+			_("You hit the rate limit because of too many requests. Please try after sometime."),
+			frappe.RateLimitExceededError,
+		)
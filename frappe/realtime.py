@@ -1,23 +1,86 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and contributors
 # License: MIT. See LICENSE
 
+import time
 from contextlib import suppress
 
 import redis
 
 import frappe
-from frappe.utils.data import cstr
+from frappe.utils.data import cstr, flt
+
+# Messages flushed after commit are published in envelopes of this many messages
+PUBLISH_BATCH_SIZE = 500
+
+# Minimum seconds between two progress updates of the same task, intermediate updates are dropped
+PROGRESS_INTERVAL = 0.5
+
+# Only the latest of these events is published per document after commit
+COALESCED_EVENTS = frozenset(("doc_update", "list_update"))
 
 
 def publish_progress(percent, title=None, doctype=None, docname=None, description=None, task_id=None):
-	publish_realtime(
-		"progress",
-		{"percent": percent, "title": title, "description": description},
-		user=None if doctype and docname else frappe.session.user,
-		doctype=doctype,
-		docname=docname,
-		task_id=task_id,
-	)
+	key = (title, doctype, docname, task_id)
+	kwargs = {
+		"event": "progress",
+		"message": {"percent": percent, "title": title, "description": description},
+		"user": None if doctype and docname else frappe.session.user,
+		"doctype": doctype,
+		"docname": docname,
+		"task_id": task_id,
+	}
+
+	if _should_publish_progress(percent, key):
+		_get_pending_progress().pop(key, None)
+		publish_realtime(**kwargs)
+	else:
+		_defer_progress(key, kwargs)
+
+
+def _should_publish_progress(percent, key) -> bool:
+	"""Throttle progress updates, first and final updates are always published."""
+	if not hasattr(frappe.local, "_realtime_progress_published_at"):
+		frappe.local._realtime_progress_published_at = {}
+
+	last_published = frappe.local._realtime_progress_published_at
+	now = time.monotonic()
+
+	if flt(percent) >= 100:
+		last_published.pop(key, None)
+		return True
+
+	if key in last_published and now - last_published[key] < PROGRESS_INTERVAL:
+		return False
+
+	last_published[key] = now
+	return True
+
+
+def _get_pending_progress() -> dict:
+	if not hasattr(frappe.local, "_realtime_pending_progress"):
+		frappe.local._realtime_pending_progress = {}
+
+	return frappe.local._realtime_pending_progress
+
+
+def _defer_progress(key, kwargs) -> None:
+	"""Keep the last throttled update of a task, it is published when the transaction ends.
+
+	Progress loops often end below 100% (e.g. `i * 100 / n` for `i in range(n)`), the final state
+	would be lost otherwise."""
+	pending = _get_pending_progress()
+	if not pending:
+		frappe.db.after_commit.add(flush_pending_progress)
+		frappe.db.after_rollback.add(flush_pending_progress)
+
+	pending[key] = kwargs
+
+
+def flush_pending_progress():
+	pending = _get_pending_progress()
+	for kwargs in pending.values():
+		publish_realtime(**kwargs)
+	pending.clear()
 
 
 def publish_realtime(
@@ -72,23 +135,31 @@ def publish_realtime(
 
 	if after_commit:
 		if not hasattr(frappe.local, "_realtime_log"):
-			frappe.local._realtime_log = []
+			frappe.local._realtime_log = {}
 			frappe.db.after_commit.add(flush_realtime_log)
 			frappe.db.after_rollback.add(clear_realtime_log)
 
-		params = [event, message, room]
-		if params not in frappe.local._realtime_log:
-			frappe.local._realtime_log.append(params)
+		frappe.local._realtime_log[_get_log_key(event, message, room)] = [event, message, room]
 	else:
 		emit_via_redis(event, message, room)
 
 
+def _get_log_key(event, message, room):
+	"""Key to deduplicate messages published after commit.
+
+	Updates of the same document replace each other so that only the latest one is published,
+	other messages are only deduplicated if they are identical."""
+	if event in COALESCED_EVENTS and isinstance(message, dict):
+		return (event, room, cstr(message.get("name")))
+
+	return (event, room, frappe.as_json(message, indent=None))
+
+
 def flush_realtime_log():
 	if not hasattr(frappe.local, "_realtime_log"):
 		return
-	for args in frappe.local._realtime_log:
-		frappe.realtime.emit_via_redis(*args)
 
+	frappe.realtime.emit_batch_via_redis(list(frappe.local._realtime_log.values()))
 	clear_realtime_log()
 
 
@@ -115,6 +186,28 @@ def emit_via_redis(event, message, room):
 		)
 
 
+def emit_batch_via_redis(messages: list[list]):
+	"""Publish many real-time updates via redis, in batched envelopes using a single round-trip.
+
+	:param messages: list of `[event, message, room]`"""
+	from frappe.utils.background_jobs import get_redis_connection_without_auth
+
+	if not messages:
+		return
+
+	with suppress(redis.exceptions.ConnectionError):
+		pipeline = get_redis_connection_without_auth().pipeline(transaction=False)
+		for i in range(0, len(messages), PUBLISH_BATCH_SIZE):
+			batch = [
+				{"event": event, "message": message, "room": room}
+				for event, message, room in messages[i : i + PUBLISH_BATCH_SIZE]
+			]
+			pipeline.publish(
+				"events", frappe.as_json({"batch": batch, "namespace": frappe.local.site}, indent=None)
+			)
+		pipeline.execute()
+
+
 @frappe.whitelist(allow_guest=True)
 def has_permission(doctype: str, name: str) -> bool:
 	frappe.has_permission(doctype, doc=name, throw=True)
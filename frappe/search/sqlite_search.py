@@ -3,21 +3,24 @@
 
 import datetime
 import inspect
+import json
+import multiprocessing
 import os
 import re
 import sqlite3
 import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
+import redis
 from bs4 import BeautifulSoup
 
 import frappe
 from frappe.model.document import Document
-from frappe.utils import update_progress_bar
+from frappe.utils import cint, update_progress_bar
 
 
 class WarningType(Enum):
@@ -58,6 +61,12 @@ MIN_WORD_LENGTH = 4
 MAX_EDIT_DISTANCE = 3
 MIN_SIMILARITY_THRESHOLD = 0.6
 MAX_SPELLING_SUGGESTIONS = 3
+# Spelling correction backends, see `SQLiteSearch.SPELLING_CORRECTION_BACKEND`
+TRIGRAM = "trigram"
+SYMSPELL = "symspell"
+# Edit distance and prefix length of the SymSpell delete index
+SYMSPELL_MAX_DISTANCE = 2
+SYMSPELL_PREFIX_LENGTH = 7
 SIMILARITY_TRIGRAM_WEIGHT = 0.7
 SIMILARITY_SEQUENCE_WEIGHT = 0.3
 FREQUENCY_BOOST_FACTOR = 1000
@@ -69,6 +78,24 @@ TITLE_PARTIAL_MATCH_BOOST = 2.0
 DISCUSSION_BOOST = 1.2
 COMMENT_BOOST = 1.0
 
+# Document changes waiting to be applied to search indexes, see `queue_index_update`
+INDEX_QUEUE_KEY = "sqlite_search_index_queue"
+INDEX_QUEUE_BATCH_SIZE = 500
+INDEX = "index"
+REMOVE = "remove"
+
+WORD_REGEX = re.compile(r"\w+")
+
+# Full rebuilds read documents in pages of `BUILD_PAGE_SIZE` rows. Pages are prepared in a pool of
+# processes if there are more than `PARALLEL_BUILD_THRESHOLD` documents.
+BUILD_PAGE_SIZE = 1000
+PARALLEL_BUILD_THRESHOLD = 20_000
+MAX_BUILD_WORKERS = 4
+
+# List filters with more values than this are loaded into a temp table and applied through
+# `search_metadata`, instead of being inlined as parameters of an `IN (...)` condition.
+FILTER_TABLE_THRESHOLD = 100
+
 # Time-based recency categories for aggressive boosting
 RECENT_HOURS_BOOST = 1.8  # Documents from last 24 hours
 RECENT_WEEK_BOOST = 1.5  # Documents from last 7 days
@@ -89,6 +116,16 @@ class SQLiteSearch(ABC):
 	- Permission-aware search results via query-level filtering
 	"""
 
+	# Processes used to prepare documents in `build_index`, defaults to site config
+	# `sqlite_search_build_workers` or number of CPUs (max 4). Workers connect to the site database,
+	# set this to 1 if `prepare_document` has to run in the process which builds the index.
+	BUILD_INDEX_WORKERS: int | None = None
+
+	# Candidates for spelling correction are looked up with shared trigrams by default. With
+	# "symspell", a SymSpell delete index is kept in the search database. It finds candidates
+	# within `SYMSPELL_MAX_DISTANCE` edits with a single indexed lookup, but takes more disk space.
+	SPELLING_CORRECTION_BACKEND: str = TRIGRAM
+
 	@staticmethod
 	def scoring_function(func):
 		"""
@@ -292,7 +329,10 @@ class SQLiteSearch(ABC):
 		}
 
 	def build_index(self):
-		"""Build the complete search index from scratch using atomic replacement."""
+		"""Build the complete search index from scratch using atomic replacement.
+
+		Documents are read page by page and written to a temporary database in one transaction per
+		page, so memory use doesn't depend on the number of documents."""
 		if not self.is_search_enabled():
 			return
 
@@ -313,32 +353,36 @@ class SQLiteSearch(ABC):
 			# Setup tables in temp database
 			self._ensure_fts_table()
 
-			self._update_progress("Fetching records", 20, 100, absolute=True)
+			self._update_progress("Counting records", 5, 100, absolute=True)
 
-			records = self.get_documents()
-			documents = []
+			pages, total_records = self._get_record_pages()
+			word_freq = Counter()
+			prepared = 0
 
-			self._update_progress("Preparing documents", 30, 100, absolute=True)
-
-			total_records = len(records)
-			for i, doc in enumerate(records):
-				document = self.prepare_document(doc)
-				if document:
-					documents.append(document)
-
-				# Update progress during document preparation
-				if i % 100 == 0:
-					progress = 30 + int((i / total_records) * 20)  # 30-50% range
-					self._update_progress("Preparing documents", progress, 100, absolute=True)
-
-			self._update_progress("Indexing documents", 50, 100, absolute=True)
-
-			self._index_documents(documents)
+			conn = self._get_connection()
+			try:
+				cursor = conn.cursor()
+				for documents, words, warnings, page_size in self._prepare_document_pages(
+					pages, total_records
+				):
+					self._insert_documents(cursor, documents)
+					conn.commit()
+
+					# Build vocabulary for spelling correction in the same pass
+					word_freq.update(words)
+					self.warnings.extend(warnings)
+
+					prepared += page_size
+					progress = 10 + int((prepared / (total_records or 1)) * 80)  # 10-90% range
+					self._update_progress(
+						f"Indexing documents ({prepared}/{total_records})", progress, 100, absolute=True
+					)
+			finally:
+				conn.close()
 
-			self._update_progress("Building spell correction vocabulary", 80, 100, absolute=True)
+			self._update_progress("Building spell correction vocabulary", 90, 100, absolute=True)
 
-			# Build vocabulary for spelling correction
-			self._build_vocabulary(documents)
+			self._write_vocabulary(word_freq)
 
 			# Atomic replacement: move temp database to final location
 			if os.path.exists(original_db_path):
@@ -359,6 +403,63 @@ class SQLiteSearch(ABC):
 			# Restore original database path
 			self.db_path = original_db_path
 
+	def _get_record_pages(self):
+		"""Return iterator over pages of records to be indexed and total number of records."""
+		if type(self).get_documents is not SQLiteSearch.get_documents:
+			# Records come from the subclass, only preparing and indexing them is done in pages.
+			records = self.get_documents()
+			pages = (records[i : i + BUILD_PAGE_SIZE] for i in range(0, len(records), BUILD_PAGE_SIZE))
+			return pages, len(records)
+
+		pages = (page for doctype in self.doc_configs for page in self._iter_document_pages(doctype))
+		return pages, sum(self._count_documents(doctype) for doctype in self.doc_configs)
+
+	def _prepare_document_pages(self, pages, total_records):
+		"""Yield (documents, vocabulary words, warnings, page size) for every page of records.
+
+		Pages are prepared in a process pool for large indexes. Only a few pages are in flight at a
+		time, so records are not read faster than they are indexed."""
+		workers = self._get_build_workers()
+		if workers <= 1 or total_records < PARALLEL_BUILD_THRESHOLD:
+			for page in pages:
+				yield (*_prepare_page(self, page), len(page))
+			return
+
+		search_class = type(self)
+		pool = multiprocessing.get_context("spawn").Pool(
+			workers,
+			initializer=_init_build_worker,
+			initargs=(
+				frappe.local.site,
+				frappe.local.sites_path,
+				f"{search_class.__module__}.{search_class.__qualname__}",
+				self.db_name,
+			),
+		)
+		try:
+			pending = deque()
+			for page in pages:
+				pending.append((pool.apply_async(_prepare_page_in_worker, (page,)), len(page)))
+				if len(pending) >= workers * 2:
+					result, page_size = pending.popleft()
+					yield (*result.get(), page_size)
+
+			while pending:
+				result, page_size = pending.popleft()
+				yield (*result.get(), page_size)
+		finally:
+			pool.terminate()
+			pool.join()
+
+	def _get_build_workers(self):
+		if self.BUILD_INDEX_WORKERS is not None:
+			return self.BUILD_INDEX_WORKERS
+
+		if workers := cint(frappe.conf.get("sqlite_search_build_workers")):
+			return workers
+
+		return min(MAX_BUILD_WORKERS, os.cpu_count() or 1)
+
 	# Status and Validation Methods
 
 	def index_exists(self):
@@ -395,18 +496,60 @@ class SQLiteSearch(ABC):
 	def get_documents(self):
 		"""Get all records to be indexed."""
 		records = []
-		for doctype, config in self.doc_configs.items():
+		for doctype in self.doc_configs:
+			records.extend(self._get_documents(doctype))
+
+		return records
+
+	def _get_documents(self, doctype, names=None):
+		"""Get records of a doctype to be indexed, optionally only the ones with given names."""
+		config = self.doc_configs[doctype]
+		filters = config.get("filters", {})
+		if names is not None:
+			filters = self._add_name_filter(doctype, filters, "in", names)
+
+		docs = frappe.qb.get_query(doctype, fields=config["fields"], filters=filters).run(as_dict=True)
+		return self._process_records(doctype, docs)
+
+	def _iter_document_pages(self, doctype, page_size=BUILD_PAGE_SIZE):
+		"""Yield records of a doctype to be indexed in pages, using keyset pagination on name."""
+		config = self.doc_configs[doctype]
+		fields = config["fields"] if "name" in config["fields"] else [*config["fields"], "name"]
+
+		last_name = None
+		while True:
+			filters = config.get("filters", {})
+			if last_name is not None:
+				filters = self._add_name_filter(doctype, filters, ">", last_name)
+
 			docs = frappe.qb.get_query(
-				doctype, fields=config["fields"], filters=config.get("filters", {})
+				doctype, fields=fields, filters=filters, order_by="name asc", limit=page_size
 			).run(as_dict=True)
+			if not docs:
+				return
 
-			for doc in docs:
-				doc.doctype = doctype
-				if config["modified_field"] != "modified":
-					doc.modified = getattr(doc, config["modified_field"], None) or doc.modified
-				records.append(doc)
+			last_name = docs[-1].name
+			yield self._process_records(doctype, docs)
 
-		return records
+			if len(docs) < page_size:
+				return
+
+	def _count_documents(self, doctype):
+		return frappe.db.count(doctype, self.doc_configs[doctype].get("filters", {}))
+
+	def _add_name_filter(self, doctype, filters, operator, value):
+		if isinstance(filters, dict):
+			return {**filters, "name": (operator, value)}
+		return [*filters, [doctype, "name", operator, value]]
+
+	def _process_records(self, doctype, docs):
+		config = self.doc_configs[doctype]
+		for doc in docs:
+			doc.doctype = doctype
+			if config["modified_field"] != "modified":
+				doc.modified = getattr(doc, config["modified_field"], None) or doc.modified
+
+		return docs
 
 	# Private Implementation Methods
 
@@ -415,6 +558,15 @@ class SQLiteSearch(ABC):
 		# Build filter conditions
 		filter_conditions = []
 		filter_params = []
+		# Temp table name -> values, for large list filters
+		filter_tables = {}
+		metadata_columns = self._get_metadata_columns()
+		use_filter_tables = any(
+			isinstance(values, list) and len(values) > FILTER_TABLE_THRESHOLD
+			for values in (filters or {}).values()
+		) and self.sql(
+			"SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_metadata'", read_only=True
+		)
 
 		if filters:
 			# Build filter conditions dynamically
@@ -442,6 +594,19 @@ class SQLiteSearch(ABC):
 						# Single LIKE condition
 						filter_conditions.append(f"{field} LIKE ?")
 						filter_params.append(f"%{like_values}%")
+				elif (
+					use_filter_tables
+					and isinstance(values, list)
+					and len(values) > FILTER_TABLE_THRESHOLD
+					and field in metadata_columns
+				):
+					# Match against an indexed table instead of inlining thousands of parameters
+					table = f"filter_{len(filter_tables)}"
+					filter_tables[table] = values
+					filter_conditions.append(
+						f"search_fts.rowid IN (SELECT fts_rowid FROM search_metadata WHERE {field} IN "
+						f"(SELECT value FROM temp.{table}))"
+					)
 				elif isinstance(values, list):
 					if len(values) == 1:
 						filter_conditions.append(f"{field} = ?")
@@ -505,7 +670,9 @@ class SQLiteSearch(ABC):
                 ORDER BY bm25_score
                 LIMIT ?
             """
-			return self.sql(sql, (fts_query, fts_query, *filter_params, MAX_SEARCH_RESULTS), read_only=True)
+			return self._run_search_query(
+				sql, (fts_query, fts_query, *filter_params, MAX_SEARCH_RESULTS), filter_tables
+			)
 		else:
 			params = []
 			if "content" in text_fields:
@@ -522,9 +689,26 @@ class SQLiteSearch(ABC):
                 ORDER BY bm25_score
                 LIMIT ?
             """
-			print(sql)
+			return self._run_search_query(sql, params, filter_tables)
+
+	def _run_search_query(self, sql, params, filter_tables):
+		if not filter_tables:
 			return self.sql(sql, params, read_only=True)
 
+		conn = self._get_connection()
+		try:
+			cursor = conn.cursor()
+			# Temp tables are private to this connection and dropped when it is closed
+			for table, values in filter_tables.items():
+				cursor.execute(f"CREATE TEMP TABLE {table} (value PRIMARY KEY) WITHOUT ROWID")
+				cursor.executemany(
+					f"INSERT OR IGNORE INTO temp.{table} (value) VALUES (?)", [(value,) for value in values]
+				)
+
+			return cursor.execute(sql, params).fetchall()
+		finally:
+			conn.close()
+
 	def _process_search_results(self, raw_results, query):
 		"""Process search results with scoring."""
 		processed_results = []
@@ -717,7 +901,7 @@ class SQLiteSearch(ABC):
 	def _find_similar_words(
 		self, word, max_suggestions=MAX_SPELLING_SUGGESTIONS, min_similarity=MIN_SIMILARITY_THRESHOLD
 	):
-		"""Find similar words using indexed trigram similarity - much faster!"""
+		"""Find similar words, candidates are scored by trigram and sequence similarity."""
 		import difflib
 
 		word = word.lower()
@@ -727,30 +911,18 @@ class SQLiteSearch(ABC):
 		word_trigrams = self._generate_trigrams(word)
 		word_length = len(word)
 
-		try:
-			# Find candidate words that share trigrams (MUCH faster than checking all words)
-			placeholders = ",".join("?" * len(word_trigrams))
-			candidates = self.sql(
-				f"""
-                SELECT t.word, v.frequency, v.length, COUNT(*) as shared_trigrams
-                FROM search_trigrams t
-                JOIN search_vocabulary v ON t.word = v.word
-                WHERE t.trigram IN ({placeholders})
-                    AND ABS(v.length - ?) <= ?  -- Length filter for efficiency
-                GROUP BY t.word, v.frequency, v.length
-                HAVING shared_trigrams >= 1  -- Must share at least 1 trigram
-                ORDER BY shared_trigrams DESC, v.frequency DESC
-            """,
-				(*word_trigrams, word_length, MAX_EDIT_DISTANCE),
-				read_only=True,
-			)
-		except sqlite3.Error:
+		candidates = None
+		if self.SPELLING_CORRECTION_BACKEND == SYMSPELL:
+			candidates = self._get_symspell_candidates(word)
+		if candidates is None:
+			candidates = self._get_trigram_candidates(word_trigrams, word_length)
+		if not candidates:
 			return []
 
 		similarities = []
 		word_trigram_set = set(word_trigrams)
 
-		for candidate_word, freq, candidate_length, _ in candidates:
+		for candidate_word, freq, candidate_length in candidates:
 			# Quick length-based filter
 			if abs(candidate_length - word_length) > MAX_EDIT_DISTANCE:
 				continue
@@ -785,12 +957,23 @@ class SQLiteSearch(ABC):
 		similarities.sort(key=lambda x: x[1], reverse=True)
 		return [word for word, score in similarities[:max_suggestions]]
 
+	def _get_vocabulary_words(self, doc):
+		"""Words of a document which are added to the spelling correction vocabulary."""
+		# Process title and content together for efficiency
+		combined_text = " ".join(
+			[(doc.get("title", "") or "").lower(), (doc.get("content", "") or "").lower()]
+		)
+
+		# Filter out short words and non-alpha
+		return [
+			word
+			for word in WORD_REGEX.findall(combined_text)
+			if len(word) > MIN_WORD_LENGTH - 1 and word.isalpha()
+		]
+
 	def _build_vocabulary(self, documents):
 		"""Build vocabulary and trigram index from documents for spelling correction."""
-		import re
-
 		word_freq = defaultdict(int)
-		word_regex = re.compile(r"\w+")  # Compile regex once for efficiency
 
 		# Extract words from all documents in batches
 		for i, doc in enumerate(documents):
@@ -801,24 +984,77 @@ class SQLiteSearch(ABC):
 					f"Processing vocabulary ({i}/{len(documents)})", progress, 100, absolute=True
 				)
 
-			# Process title and content together for efficiency
-			combined_text = " ".join(
-				[(doc.get("title", "") or "").lower(), (doc.get("content", "") or "").lower()]
+			for word in self._get_vocabulary_words(doc):
+				word_freq[word] += 1
+
+		self._write_vocabulary(word_freq)
+
+	def _get_trigram_candidates(self, word_trigrams, word_length):
+		"""Vocabulary words sharing trigrams with the word, as (word, frequency, length)."""
+		try:
+			# Find candidate words that share trigrams (MUCH faster than checking all words)
+			placeholders = ",".join("?" * len(word_trigrams))
+			candidates = self.sql(
+				f"""
+                SELECT t.word, v.frequency, v.length, COUNT(*) as shared_trigrams
+                FROM search_trigrams t
+                JOIN search_vocabulary v ON t.word = v.word
+                WHERE t.trigram IN ({placeholders})
+                    AND ABS(v.length - ?) <= ?  -- Length filter for efficiency
+                GROUP BY t.word, v.frequency, v.length
+                HAVING shared_trigrams >= 1  -- Must share at least 1 trigram
+                ORDER BY shared_trigrams DESC, v.frequency DESC
+            """,
+				(*word_trigrams, word_length, MAX_EDIT_DISTANCE),
+				read_only=True,
+			)
+		except sqlite3.Error:
+			return []
+
+		return [(candidate, freq, length) for candidate, freq, length, _ in candidates]
+
+	def _get_symspell_candidates(self, word):
+		"""Vocabulary words within `SYMSPELL_MAX_DISTANCE` edits, as (word, frequency, length).
+
+		Return None if the index has no delete index, e.g. it was built with another backend."""
+		deletes = get_symspell_deletes(word)
+		placeholders = ",".join("?" * len(deletes))
+		try:
+			candidates = self.sql(
+				f"""
+                SELECT DISTINCT v.word, v.frequency, v.length
+                FROM search_spelling_deletes d
+                JOIN search_vocabulary v ON d.word = v.word
+                WHERE d.delete_key IN ({placeholders})
+            """,
+				tuple(deletes),
+				read_only=True,
 			)
+		except sqlite3.Error:
+			return None
 
-			# Extract all words at once with compiled regex
-			words = word_regex.findall(combined_text)
+		# Deletes only match prefixes, check distance of complete words
+		return [
+			(candidate, freq, length)
+			for candidate, freq, length in candidates
+			if get_edit_distance(word, candidate, SYMSPELL_MAX_DISTANCE) <= SYMSPELL_MAX_DISTANCE
+		]
 
-			for word in words:
-				if len(word) > MIN_WORD_LENGTH - 1 and word.isalpha():  # Filter out short words and non-alpha
-					word_freq[word] += 1
+	def _get_symspell_rows(self, words):
+		for word in words:
+			for delete in get_symspell_deletes(word):
+				yield delete, word
 
+	def _write_vocabulary(self, word_freq):
+		"""Replace vocabulary and trigram index with given word frequencies."""
 		# Clear existing data in a single transaction
 		conn = self._get_connection()
 		try:
 			cursor = conn.cursor()
 			cursor.execute("DELETE FROM search_vocabulary")
 			cursor.execute("DELETE FROM search_trigrams")
+			if self.SPELLING_CORRECTION_BACKEND == SYMSPELL:
+				cursor.execute("DELETE FROM search_spelling_deletes")
 			conn.commit()
 		finally:
 			conn.close()
@@ -855,10 +1091,66 @@ class SQLiteSearch(ABC):
 			# Batch insert trigrams (duplicates already removed)
 			cursor.executemany("INSERT INTO search_trigrams (trigram, word) VALUES (?, ?)", trigram_data)
 
+			if self.SPELLING_CORRECTION_BACKEND == SYMSPELL:
+				cursor.executemany(
+					"INSERT OR IGNORE INTO search_spelling_deletes (delete_key, word) VALUES (?, ?)",
+					self._get_symspell_rows(word_freq),
+				)
+
 			conn.commit()
 		finally:
 			conn.close()
 
+	def _update_vocabulary(self, cursor, word_delta):
+		"""Apply changes in word frequencies to vocabulary and trigram index.
+
+		Words whose frequency drops to zero are removed along with their trigrams."""
+		word_delta = {word: delta for word, delta in word_delta.items() if delta}
+		if not word_delta:
+			return
+
+		cursor.executemany(
+			"""
+			INSERT INTO search_vocabulary (word, frequency, length) VALUES (?, ?, ?)
+			ON CONFLICT(word) DO UPDATE SET frequency = frequency + excluded.frequency
+			""",
+			[(word, delta, len(word)) for word, delta in word_delta.items()],
+		)
+		cursor.executemany(
+			"INSERT OR IGNORE INTO search_trigrams (trigram, word) VALUES (?, ?)",
+			[
+				(trigram, word)
+				for word, delta in word_delta.items()
+				if delta > 0
+				for trigram in set(self._generate_trigrams(word))
+			],
+		)
+
+		# Indexes built before switching backend have no delete index till they are rebuilt
+		symspell = (
+			self.SPELLING_CORRECTION_BACKEND == SYMSPELL
+			and cursor.execute(
+				"SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_spelling_deletes'"
+			).fetchone()
+		)
+		if symspell:
+			cursor.executemany(
+				"INSERT OR IGNORE INTO search_spelling_deletes (delete_key, word) VALUES (?, ?)",
+				self._get_symspell_rows(word for word, delta in word_delta.items() if delta > 0),
+			)
+
+		if any(delta < 0 for delta in word_delta.values()):
+			if symspell:
+				cursor.execute(
+					"DELETE FROM search_spelling_deletes WHERE word IN "
+					"(SELECT word FROM search_vocabulary WHERE frequency <= 0)"
+				)
+			cursor.execute(
+				"DELETE FROM search_trigrams WHERE word IN "
+				"(SELECT word FROM search_vocabulary WHERE frequency <= 0)"
+			)
+			cursor.execute("DELETE FROM search_vocabulary WHERE frequency <= 0")
+
 	# Database and Infrastructure Methods
 
 	def _get_connection(self, read_only=False):
@@ -931,15 +1223,58 @@ class SQLiteSearch(ABC):
                 CREATE INDEX IF NOT EXISTS idx_trigram_lookup ON search_trigrams(trigram)
             """)
 
+			# Metadata of indexed documents keyed by rowid of `search_fts`, with an index on every field.
+			# Filters are applied with these indexes instead of reading unindexed FTS columns.
+			metadata_columns = self._get_metadata_columns()
+			cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS search_metadata (
+                    fts_rowid INTEGER PRIMARY KEY,
+                    {", ".join(metadata_columns)}
+                )
+            """)
+			for column in metadata_columns:
+				cursor.execute(
+					f"CREATE INDEX IF NOT EXISTS idx_search_metadata_{column} ON search_metadata({column})"
+				)
+
+			if self.SPELLING_CORRECTION_BACKEND == SYMSPELL:
+				cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS search_spelling_deletes (
+                        delete_key TEXT,
+                        word TEXT,
+                        PRIMARY KEY (delete_key, word)
+                    ) WITHOUT ROWID
+                """)
+
 			conn.commit()
 		finally:
 			conn.close()
 
+	def _get_metadata_columns(self):
+		return ["doc_id", *(field for field in self.schema["metadata_fields"] if field != "doc_id")]
+
+	def _has_metadata_table(self, cursor):
+		# Indexes built by older versions don't have it until they are rebuilt
+		return bool(
+			cursor.execute(
+				"SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_metadata'"
+			).fetchone()
+		)
+
 	def _index_documents(self, documents):
 		"""Bulk index documents into SQLite FTS."""
 		if not documents:
 			return
 
+		conn = self._get_connection()
+		try:
+			self._insert_documents(conn.cursor(), documents)
+			conn.commit()
+		finally:
+			conn.close()
+
+	def _insert_documents(self, cursor, documents):
+		"""Insert documents into FTS table without committing, return the inserted documents."""
 		# Get schema configuration to build dynamic insert SQL
 		text_fields = self.schema["text_fields"]
 		metadata_fields = self.schema["metadata_fields"]
@@ -950,71 +1285,146 @@ class SQLiteSearch(ABC):
 		field_names = ",".join(all_fields)
 
 		insert_sql = f"""
-            INSERT INTO search_fts ({field_names})
-            VALUES ({placeholders})
+            INSERT INTO search_fts (rowid, {field_names})
+            VALUES (?, {placeholders})
         """
 
+		metadata_columns = self._get_metadata_columns()
+		metadata_positions = [all_fields.index(column) for column in metadata_columns]
+		metadata_sql = None
+		if self._has_metadata_table(cursor):
+			metadata_sql = f"""
+                INSERT INTO search_metadata (fts_rowid, {", ".join(metadata_columns)})
+                VALUES (?, {", ".join("?" * len(metadata_columns))})
+            """
+
+		# Rowids are assigned here to insert the same ones into `search_metadata`
+		next_rowid = cursor.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM search_fts").fetchone()[0]
+
 		# Process documents in chunks to prevent memory issues with large datasets
 		chunk_size = 1000
-		conn = self._get_connection()
-		try:
-			cursor = conn.cursor()
+		inserted = []
+		for i in range(0, len(documents), chunk_size):
+			chunk = documents[i : i + chunk_size]
+			values_to_insert = []
+
+			for doc in chunk:
+				# Validate document has required fields
+				if not doc.get("doctype") or not doc.get("name"):
+					self._warn_invalid_document(doc, "missing doctype/name")
+					continue
 
-			for i in range(0, len(documents), chunk_size):
-				chunk = documents[i : i + chunk_size]
-				values_to_insert = []
-
-				for doc in chunk:
-					# Validate document has required fields
-					if not doc.get("doctype") or not doc.get("name"):
-						self._warn_invalid_document(doc, "missing doctype/name")
-						continue
-
-					# Validate text fields are present
-					missing_text_fields = []
-					for field in text_fields:
-						if field not in doc or doc[field] is None:
-							missing_text_fields.append(field)
-
-					if missing_text_fields:
-						self._warn_missing_text_fields(
-							doc.get("doctype", ""), doc.get("name", ""), missing_text_fields
-						)
-						continue
-
-					# Build values tuple dynamically based on schema
-					values = []
-					for field in all_fields:
-						# Build doc_id automatically from doctype:name
-						if field == "doc_id":
-							doc_id = doc.get("id") or f"{doc.get('doctype', '')}:{doc.get('name', '')}"
-							values.append(doc_id)
-						else:
-							values.append(doc.get(field, ""))
-
-					values_to_insert.append(tuple(values))
-
-				# Insert the chunk
-				if values_to_insert:
-					cursor.executemany(insert_sql, values_to_insert)
+				# Validate text fields are present
+				missing_text_fields = []
+				for field in text_fields:
+					if field not in doc or doc[field] is None:
+						missing_text_fields.append(field)
 
-			conn.commit()
-		finally:
-			conn.close()
+				if missing_text_fields:
+					self._warn_missing_text_fields(
+						doc.get("doctype", ""), doc.get("name", ""), missing_text_fields
+					)
+					continue
+
+				# Build values tuple dynamically based on schema
+				values = []
+				for field in all_fields:
+					# Build doc_id automatically from doctype:name
+					if field == "doc_id":
+						doc_id = doc.get("id") or f"{doc.get('doctype', '')}:{doc.get('name', '')}"
+						values.append(doc_id)
+					else:
+						values.append(doc.get(field, ""))
+
+				values_to_insert.append((next_rowid, *values))
+				next_rowid += 1
+				inserted.append(doc)
+
+			# Insert the chunk
+			if values_to_insert:
+				cursor.executemany(insert_sql, values_to_insert)
+				if metadata_sql:
+					cursor.executemany(
+						metadata_sql,
+						[(row[0], *(row[i + 1] for i in metadata_positions)) for row in values_to_insert],
+					)
+
+		return inserted
 
 	def index_doc(self, doctype, docname):
 		"""Index a single document."""
-		doc = frappe.get_doc(doctype, docname)
-		self.raise_if_not_indexed()
-		document = self.prepare_document(doc)
-		if document:
-			self._index_documents([document])
+		self.update_index({(doctype, docname): INDEX})
 
 	def remove_doc(self, doctype, docname):
 		"""Remove a single document from the index."""
+		self.update_index({(doctype, docname): REMOVE})
+
+	def update_index(self, changes):
+		"""
+		Apply document changes to the index and vocabulary in a single transaction.
+
+		Args:
+		    changes (dict): {(doctype, name): "index" | "remove"}. Documents to index are read
+		        from the database again, the ones which don't exist anymore or don't match the
+		        configured filters are removed from the index.
+		"""
+		changes = {key: operation for key, operation in changes.items() if key[0] in self.doc_configs}
+		if not changes:
+			return
+
 		self.raise_if_not_indexed()
-		doc_id = f"{doctype}:{docname}"
-		self.sql("DELETE FROM search_fts WHERE doc_id = ?", (doc_id,), commit=True)
+
+		names_to_index = defaultdict(list)
+		for (doctype, name), operation in changes.items():
+			if operation == INDEX:
+				names_to_index[doctype].append(name)
+
+		documents = []
+		for doctype, names in names_to_index.items():
+			for doc in self._get_documents(doctype, names):
+				if document := self.prepare_document(doc):
+					documents.append(document)
+
+		doc_ids = [f"{doctype}:{name}" for doctype, name in changes]
+		vocabulary_fields = [field for field in ("title", "content") if field in self.schema["text_fields"]]
+		select_vocabulary_fields = ", ".join(vocabulary_fields)
+
+		conn = self._get_connection()
+		try:
+			cursor = conn.cursor()
+			word_delta = Counter()
+			has_metadata_table = self._has_metadata_table(cursor)
+
+			for i in range(0, len(doc_ids), INDEX_QUEUE_BATCH_SIZE):
+				chunk = doc_ids[i : i + INDEX_QUEUE_BATCH_SIZE]
+				placeholders = ",".join("?" * len(chunk))
+				if has_metadata_table:
+					# Find rows by rowid instead of scanning unindexed doc_id column of FTS table
+					condition = (
+						f"rowid IN (SELECT fts_rowid FROM search_metadata WHERE doc_id IN ({placeholders}))"
+					)
+				else:
+					condition = f"doc_id IN ({placeholders})"
+
+				if vocabulary_fields:
+					# Words of the indexed version are removed from vocabulary
+					old_rows = cursor.execute(
+						f"SELECT {select_vocabulary_fields} FROM search_fts WHERE {condition}", chunk
+					).fetchall()
+					for row in old_rows:
+						word_delta.subtract(self._get_vocabulary_words(dict(row)))
+
+				cursor.execute(f"DELETE FROM search_fts WHERE {condition}", chunk)
+				if has_metadata_table:
+					cursor.execute(f"DELETE FROM search_metadata WHERE doc_id IN ({placeholders})", chunk)
+
+			for document in self._insert_documents(cursor, documents):
+				word_delta.update(self._get_vocabulary_words(document))
+
+			self._update_vocabulary(cursor, word_delta)
+			conn.commit()
+		finally:
+			conn.close()
 
 	# Utility Methods
 
@@ -1357,6 +1767,43 @@ class SQLiteSearch(ABC):
 		return stats
 
 
+def get_symspell_deletes(word, max_distance=SYMSPELL_MAX_DISTANCE, prefix_length=SYMSPELL_PREFIX_LENGTH):
+	"""Return strings made by deleting up to `max_distance` characters from the prefix of a word.
+
+	Two words are within `max_distance` edits of each other (in their prefix) only if their sets of
+	deletes overlap, which lets SymSpell find candidates with a single lookup."""
+	word = word[:prefix_length]
+	deletes = {word}
+	current = {word}
+	for _ in range(max_distance):
+		current = {w[:i] + w[i + 1 :] for w in current for i in range(len(w)) if len(w) > 1}
+		deletes |= current
+
+	return deletes
+
+
+def get_edit_distance(a, b, max_distance):
+	"""Damerau-Levenshtein (optimal string alignment) distance, stops early above `max_distance`."""
+	if abs(len(a) - len(b)) > max_distance:
+		return max_distance + 1
+
+	previous_previous = None
+	previous = list(range(len(b) + 1))
+	for i in range(1, len(a) + 1):
+		current = [i] + [0] * len(b)
+		for j in range(1, len(b) + 1):
+			cost = 0 if a[i - 1] == b[j - 1] else 1
+			current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+			if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+				current[j] = min(current[j], previous_previous[j - 2] + 1)
+
+		if min(current) > max_distance:
+			return max_distance + 1
+		previous_previous, previous = previous, current
+
+	return previous[-1]
+
+
 # Module-level Functions for background tasks
 
 
@@ -1407,54 +1854,129 @@ def build_index_in_background():
 
 
 def update_doc_index(doc: Document, method=None):
-	search_classes = get_search_classes()
+	for search in _get_searches_for_doctype(doc.doctype):
+		fields = search.doc_configs[doc.doctype].get("fields", [])
+		if fields and any(doc.has_value_changed(field) for field in fields):
+			queue_index_update(doc.doctype, doc.name)
+			return
+
+
+def delete_doc_index(doc: Document, method=None):
+	if _get_searches_for_doctype(doc.doctype):
+		queue_index_update(doc.doctype, doc.name, REMOVE)
+
+
+def _get_searches_for_doctype(doctype: str) -> list[SQLiteSearch]:
+	searches = []
+	for SearchClass in get_search_classes():
+		if doctype not in SearchClass.INDEXABLE_DOCTYPES:
+			continue
 
-	for SearchClass in search_classes:
 		search = SearchClass()
+		# Index is built by `build_index_if_not_exists`, with all changes made till then.
+		if search.is_search_enabled() and os.path.exists(search.db_path):
+			searches.append(search)
 
-		if not (search.is_search_enabled() and search.index_exists()):
-			return
+	return searches
 
-		for doctype, config in search.doc_configs.items():
-			if doc.doctype == doctype:
-				fields = config.get("fields", [])
-				if not fields:
-					continue
 
-				any_field_changed = any(doc.has_value_changed(field) for field in fields)
-				if any_field_changed:
-					try:
-						search.index_doc(doctype, doc.name)
-					except Exception:
-						frappe.log_error(
-							title="SQLite Search Index Update Error",
-							message=f"Failed to update index for {doctype}:{doc.name} in {search.__class__.__name__}",
-						)
+def queue_index_update(doctype: str, name: str, operation: str = INDEX):
+	"""Queue a document to be indexed or removed from search indexes in background.
 
+	Changes are applied in batches by `process_index_queue`, which is enqueued after commit."""
+	try:
+		frappe.cache.rpush(INDEX_QUEUE_KEY, json.dumps([doctype, name, operation]))
+	except redis.exceptions.ConnectionError:
+		_update_indexes({(doctype, name): operation})
+		return
 
-def delete_doc_index(doc: Document, method=None):
-	search_classes = get_search_classes()
+	if not frappe.flags.sqlite_search_queue_pending:
+		frappe.flags.sqlite_search_queue_pending = True
+		frappe.db.after_commit.add(_enqueue_index_queue_processing)
+		frappe.db.after_rollback.add(_reset_queue_pending)
 
-	for SearchClass in search_classes:
+
+def _reset_queue_pending():
+	frappe.flags.sqlite_search_queue_pending = False
+
+
+def _enqueue_index_queue_processing():
+	_reset_queue_pending()
+	frappe.enqueue(
+		"frappe.search.sqlite_search.process_index_queue",
+		queue="short",
+		job_id=INDEX_QUEUE_KEY,
+		deduplicate=True,
+	)
+
+
+def process_index_queue():
+	"""Apply queued document changes to search indexes, in batches of `INDEX_QUEUE_BATCH_SIZE`."""
+	searches = _get_indexed_searches()
+
+	# Queue is drained even without any index, `build_index` reads all documents anyway.
+	while items := frappe.cache.lpop(INDEX_QUEUE_KEY, INDEX_QUEUE_BATCH_SIZE):
+		changes = {}
+		for item in items:
+			doctype, name, operation = json.loads(item)
+			# Only the last change of a document matters
+			changes[(doctype, name)] = operation
+
+		_update_indexes(changes, searches)
+
+
+def _prepare_page(search: SQLiteSearch, records: list) -> tuple[list, Counter, list]:
+	"""Prepare a page of records for indexing, return documents, their words and warnings."""
+	warnings, search.warnings = search.warnings, []
+	documents = []
+	words = Counter()
+	try:
+		for record in records:
+			if document := search.prepare_document(record):
+				documents.append(document)
+				words.update(search._get_vocabulary_words(document))
+		return documents, words, search.warnings
+	finally:
+		search.warnings = warnings
+
+
+_build_worker_search: SQLiteSearch | None = None
+
+
+def _init_build_worker(site: str, sites_path: str, search_class_path: str, db_name: str):
+	global _build_worker_search
+
+	frappe.init(site, sites_path=sites_path)
+	frappe.connect()
+	_build_worker_search = frappe.get_attr(search_class_path)(db_name)
+
+
+def _prepare_page_in_worker(records: list) -> tuple[list, Counter, list]:
+	return _prepare_page(_build_worker_search, records)
+
+
+def _get_indexed_searches() -> list[SQLiteSearch]:
+	searches = []
+	for SearchClass in get_search_classes():
 		search = SearchClass()
+		if search.is_search_enabled() and search.index_exists():
+			searches.append(search)
 
-		if not (search.is_search_enabled() and search.index_exists()):
-			return
+	return searches
 
-		for doctype, config in search.doc_configs.items():
-			if doc.doctype == doctype:
-				fields = config.get("fields", [])
-				if not fields:
-					continue
 
-				try:
-					# Remove the document from the index
-					search.remove_doc(doctype, doc.name)
-				except Exception:
-					frappe.log_error(
-						title="SQLite Search Index Delete Error",
-						message=f"Failed to remove index for {doctype}:{doc.name} in {search.__class__.__name__}",
-					)
+def _update_indexes(changes: dict, searches: list[SQLiteSearch] | None = None):
+	if searches is None:
+		searches = _get_indexed_searches()
+
+	for search in searches:
+		try:
+			search.update_index(changes)
+		except Exception:
+			frappe.log_error(
+				title="SQLite Search Index Update Error",
+				message=f"Failed to update {len(changes)} documents in {search.__class__.__name__}",
+			)
 
 
 def get_search_classes() -> list[type[SQLiteSearch]]:
@@ -1,5 +1,5 @@
 import time
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import frappe
 from frappe.core.doctype.doctype.test_doctype import new_doctype
@@ -104,6 +104,20 @@ class TestSiteCache(FrappeAPITestCase):
 		self.get(f"/api/method/{api_with_ttl}")
 		self.assertEqual(register_with_external_service.call_count, 3)
 
+	def test_site_cache_single_flight(self):
+		calls = MagicMock(return_value=42)
+
+		@site_cache(single_flight=True)
+		def compute(value):
+			return calls(value)
+
+		self.assertEqual(compute(1), 42)
+		self.assertEqual(compute(1), 42)
+		calls.assert_called_once_with(1)
+		self.assertEqual(compute(2), 42)
+		self.assertEqual(calls.call_count, 2)
+		compute.clear_cache()
+
 
 class TestRedisCache(FrappeAPITestCase):
 	def test_redis_cache(self):
@@ -130,6 +144,61 @@ class TestRedisCache(FrappeAPITestCase):
 		self.assertEqual(function_call_count, 3)
 		calculate_area.clear_cache()
 
+	def test_redis_cache_stale_while_revalidate(self):
+		function_call_count = 0
+
+		@redis_cache(ttl=1, stale_ttl=60)
+		def get_count() -> int:
+			nonlocal function_call_count
+			function_call_count += 1
+			return function_call_count
+
+		self.assertEqual(get_count(), 1)
+		time.sleep(1.5)
+		frappe.local.cache.clear()
+
+		# Another process is revalidating, stale value is served
+		with patch.object(frappe.cache, "try_lock", return_value=None):
+			self.assertEqual(get_count(), 1)
+		self.assertEqual(function_call_count, 1)
+
+		self.assertEqual(get_count(), 2)
+		frappe.local.cache.clear()
+		self.assertEqual(get_count(), 2)
+		get_count.clear_cache()
+
+	def test_redis_cache_stale_ttl_with_plain_value(self):
+		function_call_count = 0
+
+		def get_count() -> int:
+			nonlocal function_call_count
+			function_call_count += 1
+			return function_call_count
+
+		# Value cached under the same key before `stale_ttl` was added
+		self.assertEqual(redis_cache(ttl=60)(get_count)(), 1)
+		frappe.local.cache.clear()
+
+		cached_get_count = redis_cache(ttl=60, stale_ttl=60)(get_count)
+		self.assertEqual(cached_get_count(), 2)
+		frappe.local.cache.clear()
+		self.assertEqual(cached_get_count(), 2)
+		cached_get_count.clear_cache()
+
+	def test_redis_cache_single_flight(self):
+		function_call_count = 0
+
+		@redis_cache(single_flight=True)
+		def get_none() -> None:
+			nonlocal function_call_count
+			function_call_count += 1
+
+		self.assertIsNone(get_none())
+		frappe.local.cache.clear()
+		self.assertIsNone(get_none())
+		self.assertEqual(function_call_count, 1)
+		get_none.clear_cache()
+
 	def test_redis_cache_without_params(self):
 		function_call_count = 0
 
@@ -274,6 +343,40 @@ class TestDocumentCache(FrappeAPITestCase):
 
 
 class TestRedisWrapper(FrappeAPITestCase):
+	def test_single_flight(self):
+		key = frappe.cache.make_key("test_single_flight")
+		generator = MagicMock(return_value="generated")
+
+		# Nobody is generating the value
+		self.assertEqual(frappe.cache.single_flight(key, lambda: None, generator), "generated")
+		generator.assert_called_once()
+
+		# Another process is generating the value, wait for it
+		token = frappe.cache.try_lock(key)
+		self.assertIsNotNone(token)
+		self.assertIsNone(frappe.cache.try_lock(key))
+		lookup = MagicMock(side_effect=[None, None, "from other process"])
+		self.assertEqual(frappe.cache.single_flight(key, lookup, generator), "from other process")
+		generator.assert_called_once()
+
+		# Value never shows up, generate it ourselves
+		self.assertEqual(frappe.cache.single_flight(key, lambda: None, generator, wait=0.2), "generated")
+		self.assertEqual(generator.call_count, 2)
+
+		frappe.cache.release_lock(key, token)
+		self.assertIsNotNone(token := frappe.cache.try_lock(key))
+		frappe.cache.release_lock(key, token)
+
+	def test_hget_single_flight(self):
+		key = "test_hget_single_flight"
+		generator = MagicMock(return_value={"a": 1})
+
+		self.assertEqual(frappe.cache.hget(key, "x", generator=generator, single_flight=True), {"a": 1})
+		frappe.local.cache.clear()
+		self.assertEqual(frappe.cache.hget(key, "x", generator=generator, single_flight=True), {"a": 1})
+		generator.assert_called_once()
+		frappe.cache.delete_value(key)
+
 	def test_delete_keys(self):
 		prefix = "test_del_"
 
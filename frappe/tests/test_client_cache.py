@@ -1,8 +1,14 @@
 import time
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase
-from frappe.utils.redis_wrapper import ClientCache
+from frappe.utils.redis_wrapper import (
+	ROW_CACHE_CLOCK_SKEW,
+	ClientCache,
+	get_row_cache_key,
+	get_row_invalidation_key,
+)
 
 TEST_KEY = "42"
 
@@ -92,6 +98,38 @@ class TestClientCache(IntegrationTestCase):
 
 		self.assertEqual(len(c.cache), 2)
 
+	def test_client_cache_lru(self):
+		c = ClientCache(maxsize=2)
+		keys = [frappe.generate_hash() for _ in range(3)]
+		c.set_value(keys[0], 1)
+		c.set_value(keys[1], 2)
+		c.get_value(keys[0])
+		c.set_value(keys[2], 3)
+
+		# keys[1] was least recently used
+		self.assertIn(c.redis.make_key(keys[0]), c.cache)
+		self.assertNotIn(c.redis.make_key(keys[1]), c.cache)
+		self.assertEqual(c.statistics.evictions, 1)
+
+	def test_client_cache_memory_limits(self):
+		value = "x" * 1000
+		c = ClientCache(max_bytes=10_000, quotas={"test_quota": 0.3})
+		for i in range(5):
+			c.set_value(f"test_quota::{i}", value)
+			c.set_value(f"test_other::{i}", value)
+
+		stats = c.statistics
+		self.assertLessEqual(stats.used_bytes, 10_000)
+		self.assertLessEqual(stats.namespaces["test_quota"]["bytes"], 3000)
+		self.assertEqual(stats.namespaces["test_quota"]["keys"], 2)
+		self.assertEqual(stats.namespaces["test_other"]["keys"], 5)
+		self.assertEqual(stats.namespaces["test_quota"]["evictions"], 3)
+
+		# values larger than the limit are only cached in Redis
+		c.set_value(TEST_KEY, "x" * 20_000)
+		self.assertEqual(c.statistics.rejections, 1)
+		self.assertEqual(c.get_value(TEST_KEY), "x" * 20_000)
+
 	def test_shared_keyspace(self):
 		val = frappe.generate_hash()
 		frappe.client_cache.set_value(TEST_KEY, val)
@@ -116,3 +154,92 @@ class TestClientCache(IntegrationTestCase):
 		frappe.client_cache.get_doc("User", "Guest")
 		with self.assertRedisCallCounts(0):
 			frappe.client_cache.get_doc("User", "Guest")
+
+	def test_get_row_lru(self):
+		c = ClientCache()
+		rows = {"a": {"name": "a"}, "b": {"name": "b"}, "c": None}
+		clear_rows("Note", rows)
+
+		for name, row in rows.items():
+			self.assertEqual(
+				c.get_row("Note", name, lambda row=row: row, maxsize=2, snapshot_time=time.time()), row
+			)
+
+		self.assertEqual(len(c.rows), 2)
+		# "a" was least recently used
+		self.assertNotIn(c.redis.make_key("row_cache::Note::a"), c.rows)
+		# negative results are cached too
+		with self.assertRedisCallCounts(0):
+			self.assertIsNone(
+				c.get_row("Note", "c", lambda: {"name": "c"}, maxsize=2, snapshot_time=time.time())
+			)
+
+		c.delete_rows([("Note", "c")])
+		self.assertEqual(
+			c.get_row("Note", "c", lambda: {"name": "c"}, maxsize=2, snapshot_time=time.time()), {"name": "c"}
+		)
+
+	def test_get_row_read_before_invalidation(self):
+		c = ClientCache()
+		clear_rows("Note", ["stale"])
+		snapshot_time = time.time() - 2 * ROW_CACHE_CLOCK_SKEW
+		c.delete_rows([("Note", "stale")])
+
+		# row read in a transaction which started before invalidation is returned but not cached
+		row = c.get_row("Note", "stale", lambda: {"name": "stale"}, maxsize=2, snapshot_time=snapshot_time)
+		self.assertEqual(row, {"name": "stale"})
+		self.assertNotIn(c.redis.make_key(get_row_cache_key("Note", "stale")), c.rows)
+		self.assertIsNone(c.redis.get(c.redis.make_key(get_row_cache_key("Note", "stale"))))
+
+	def test_shared_value_cache(self):
+		clear_rows("User", ["Administrator"])
+		conf = {"shared_value_cache_size": 10, "shared_value_cache_doctypes": ["User"]}
+
+		with patch.dict(frappe.local.conf, conf):
+			first_name = frappe.db.get_value("User", "Administrator", "first_name", cache=True)
+			frappe.db.value_cache.clear()  # simulate next request
+
+			with self.assertQueryCount(0):
+				value = frappe.db.get_value("User", "Administrator", "first_name", cache=True)
+				self.assertEqual(value, first_name)
+				values = frappe.db.get_value(
+					"User", "Administrator", ["name", "first_name"], as_dict=True, cache=True
+				)
+				self.assertEqual(values, {"name": "Administrator", "first_name": first_name})
+
+			# uncommitted writes aren't served from or stored in shared cache
+			val = frappe.generate_hash()
+			frappe.db.set_value("User", "Administrator", "middle_name", val)
+			frappe.db.value_cache.clear()
+			self.assertEqual(frappe.db.get_value("User", "Administrator", "middle_name", cache=True), val)
+			frappe.db.rollback()
+			self.assertNotEqual(frappe.db.get_value("User", "Administrator", "middle_name", cache=True), val)
+
+			# DocTypes which aren't listed aren't cached
+			frappe.db.value_cache.clear()
+			with self.assertQueryCount(1):
+				frappe.db.get_value("Role", "System Manager", "name", cache=True)
+				frappe.db.value_cache.clear()
+				frappe.db.get_value("Role", "System Manager", "name", cache=True)
+
+	def test_shared_value_cache_bulk_writes(self):
+		conf = {"shared_value_cache_size": 10, "shared_value_cache_doctypes": ["User"]}
+		self.addCleanup(frappe.db.rollback)
+
+		with patch.dict(frappe.local.conf, conf):
+			frappe.db.bulk_update("User", {"Administrator": {"middle_name": "x"}}, update_modified=False)
+			self.assertIn(("User", "Administrator"), frappe.db._row_cache_invalidations)
+
+			frappe.db.bulk_insert("User", ["name"], [["bulk-insert@example.com"]])
+			self.assertIn(("User", "bulk-insert@example.com"), frappe.db._row_cache_invalidations)
+
+			frappe.db.delete("User", {"name": "bulk-insert@example.com"})
+			self.assertIn(("User", None), frappe.db._row_cache_invalidations)
+
+
+def clear_rows(doctype: str, names) -> None:
+	"""Remove cached rows and their invalidation times."""
+	keys = [get_row_invalidation_key(doctype)]
+	for name in names:
+		keys += [get_row_cache_key(doctype, name), get_row_invalidation_key(doctype, name)]
+	frappe.cache.delete_value(keys)
@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 
 import datetime
+import pickle
 from math import ceil
 from random import choice
 from unittest.mock import patch
@@ -636,6 +637,58 @@ class TestDB(IntegrationTestCase):
 		# cleanup
 		frappe.db.delete("ToDo", {"name": ("in", record_names)})
 
+	def test_batch_writes(self):
+		test_body = f"test_batch_writes - {random_string(10)}"
+		current_count = frappe.db.count("ToDo")
+
+		with frappe.db.batch_writes():
+			current_transaction_writes = frappe.db.transaction_writes
+			todos = [frappe.get_doc(doctype="ToDo", description=test_body).insert() for _ in range(10)]
+
+			# nothing is written until the batch is flushed
+			self.assertEqual(len(frappe.db.write_batch), 10)
+			self.assertEqual(frappe.db.transaction_writes, current_transaction_writes)
+
+			# queries on the table write its pending rows first
+			self.assertEqual(frappe.db.count("ToDo"), current_count + 10)
+			self.assertEqual(len(frappe.db.write_batch), 0)
+
+		self.assertEqual(frappe.db.count("ToDo", {"description": test_body}), 10)
+		self.assertEqual(frappe.db.transaction_writes - current_transaction_writes, 1)
+
+		with frappe.db.batch_writes():
+			for todo in todos:
+				todo.status = "Closed"
+				todo.save()
+
+			# saving a pending document writes the batch first
+			todos[0].priority = "High"
+			todos[0].save()
+
+		self.assertEqual(frappe.db.count("ToDo", {"description": test_body, "status": "Closed"}), 10)
+		self.assertEqual(frappe.db.get_value("ToDo", todos[0].name, "priority"), "High")
+
+		# pending rows are discarded on rollback
+		frappe.db.savepoint("batch_writes")
+		with frappe.db.batch_writes():
+			frappe.get_doc(doctype="ToDo", description=test_body).insert()
+			frappe.db.rollback(save_point="batch_writes")
+		self.assertEqual(frappe.db.count("ToDo", {"description": test_body}), 10)
+
+		frappe.db.delete("ToDo", {"description": test_body})
+
+	def test_batch_writes_link_to_pending_document(self):
+		with frappe.db.batch_writes():
+			note = frappe.get_doc(doctype="Note", title=f"test-batch-link-{random_string(10)}").insert()
+			todo = frappe.get_doc(
+				doctype="ToDo", description="test batch link", reference_type="Note", reference_name=note.name
+			).insert()
+			# link validation of the ToDo wrote the pending Note
+			self.assertFalse(frappe.db.write_batch.has_row("Note", note.name))
+
+		self.assertTrue(frappe.db.exists("ToDo", todo.name))
+		frappe.db.rollback()
+
 	def test_count(self):
 		frappe.db.delete("Note")
 
@@ -1106,6 +1159,70 @@ class TestReplicaConnections(IntegrationTestCase):
 			self.assertEqual(write_connection, db_id())
 
 
+class TestConnectionPool(IntegrationTestCase):
+	def setUp(self):
+		from frappe.database.pool import clear_pools
+
+		if frappe.db.db_type == "sqlite":
+			self.skipTest("Connection pooling is not used for SQLite")
+		self.addCleanup(clear_pools)
+
+	def new_db(self):
+		from frappe.database import get_db
+
+		conf = frappe.local.conf
+		return get_db(
+			socket=conf.db_socket,
+			host=conf.db_host,
+			port=conf.db_port,
+			user=conf.db_user,
+			password=conf.db_password,
+			cur_db_name=conf.db_name,
+		)
+
+	def test_connection_reuse(self):
+		with patch.dict(frappe.local.conf, {"db_connection_pool_size": 1}):
+			db = self.new_db()
+			db.connect()
+			conn = db._conn
+			db.set_execution_timeout(1)
+			db.close()
+
+			db = self.new_db()
+			db.connect()
+			self.assertIs(db._conn, conn)
+			# session state is reset
+			if db.db_type == "mariadb":
+				self.assertEqual(
+					db.sql("select @@session.max_statement_time = @@global.max_statement_time")[0][0], 1
+				)
+			db.close()
+
+	def test_pooling_disabled(self):
+		db = self.new_db()
+		db.connect()
+		conn = db._conn
+		db.close()
+
+		db = self.new_db()
+		db.connect()
+		self.assertIsNot(db._conn, conn)
+		db.close()
+
+	def test_idle_timeout(self):
+		pool_conf = {"db_connection_pool_size": 1, "db_connection_pool_idle_timeout": 0}
+		with patch.dict(frappe.local.conf, pool_conf):
+			db = self.new_db()
+			db.connect()
+			conn = db._conn
+			db.close()
+
+			db = self.new_db()
+			db.connect()
+			self.assertIsNot(db._conn, conn)
+			db.close()
+
+
 class TestConcurrency(IntegrationTestCase):
 	@timeout(5, "There shouldn't be any lock wait")
 	def test_skip_locking(self):
@@ -1156,6 +1273,10 @@ def bad_nested_hook(doc, *args, **kwargs):
 
 
 class TestSqlIterator(IntegrationTestCase):
+	def setUp(self):
+		# without writes in the transaction, queries can run while iterating on all databases
+		frappe.db.rollback()
+
 	def test_db_sql_iterator(self):
 		test_queries = [
 			"select * from `tabCountry` order by name",
@@ -1182,11 +1303,108 @@ class TestSqlIterator(IntegrationTestCase):
 				msg=f"{query=} results not same as iterator",
 			)
 
-	@run_only_if(db_type_is.MARIADB)
 	def test_unbuffered_cursor(self):
 		with frappe.db.unbuffered_cursor():
 			self.test_db_sql_iterator()
 
+	def test_get_all_iterator(self):
+		kwargs = {"fields": ["name", "code"], "filters": {"code": ("is", "set")}, "order_by": "name"}
+
+		result = frappe.get_all("Country", as_iterator=True, batch_size=10, **kwargs)
+		self.assertNotIsInstance(result, list)
+		self.assertEqual(list(result), frappe.get_all("Country", **kwargs))
+
+		self.assertEqual(
+			list(frappe.get_all("Country", pluck="name", as_iterator=True, order_by="name")),
+			frappe.get_all("Country", pluck="name", order_by="name"),
+		)
+
+	def test_query_builder_iterator(self):
+		query = frappe.qb.get_query("Country", fields=["name", "code"], order_by="name")
+		self.assertEqual(list(query.run(as_dict=True, as_iterator=True)), query.run(as_dict=True))
+
+		with self.assertRaises(frappe.ValidationError):
+			frappe.qb.get_query("DocType", fields=["name", {"fields": ["fieldname"]}]).run(
+				as_dict=True, as_iterator=True
+			)
+
+	def test_queries_while_iterating(self):
+		names = frappe.get_all("Country", pluck="name", order_by="name", limit=50)
+		rows = frappe.get_all(
+			"Country", pluck="name", order_by="name", limit=50, as_iterator=True, batch_size=10
+		)
+		for name in rows:
+			self.assertEqual(frappe.db.get_value("Country", name), name)
+			names.remove(name)
+
+		self.assertEqual(names, [])
+
+		# nested iterators
+		names = frappe.get_all("Country", pluck="name", order_by="name", limit=5)
+		codes = frappe.get_all("Country", pluck="code", order_by="name", limit=5)
+		seen = []
+		for name in frappe.get_all("Country", pluck="name", order_by="name", limit=5, as_iterator=True):
+			inner = frappe.get_all("Country", pluck="code", order_by="name", limit=5, as_iterator=True)
+			self.assertEqual(list(inner), codes)
+			seen.append(name)
+
+		self.assertEqual(seen, names)
+
+	def test_commit_while_iterating(self):
+		names = frappe.get_all("Country", pluck="name", order_by="name", limit=20)
+		seen = []
+		for name in frappe.db.sql_iterator(
+			"select name from `tabCountry` order by name limit 20", pluck=True, batch_size=5
+		):
+			frappe.db.commit()
+			seen.append(name)
+
+		self.assertEqual(seen, names)
+
+	@run_only_if(db_type_is.MARIADB)
+	def test_queries_while_iterating_after_writes(self):
+		frappe.db.sql("update `tabCountry` set code = code where name = 'India'")
+		rows = frappe.db.sql_iterator("select name from `tabCountry` order by name limit 20", pluck=True)
+		next(rows)
+		self.assertRaises(frappe.ValidationError, frappe.db.get_value, "Country", "India")
+		rows.close()
+
+	def test_as_dict_rows(self):
+		query = "select name, code from `tabCountry` order by name limit 5"
+		expected = frappe.db.sql(query, as_dict=True)
+		rows = frappe.db.sql(query, as_dict="rows")
+
+		self.assertEqual([row.as_dict() for row in rows], expected)
+		self.assertEqual([dict(row) for row in rows], expected)
+		row = rows[0]
+		self.assertEqual(row.name, expected[0].name)
+		self.assertEqual(row["code"], expected[0].code)
+		self.assertEqual(row[0], expected[0].name)
+		self.assertIsNone(row.missing_column)
+		self.assertIn("code", row)
+		self.assertIs(type(row), type(rows[1]))
+		self.assertRaises(AttributeError, setattr, row, "name", "changed")
+		self.assertEqual(pickle.loads(pickle.dumps(row)), row)
+
+		update = {"source": "test"}
+		self.assertEqual(frappe.db.sql(query, as_dict="rows", update=update)[0].source, "test")
+		self.assertEqual(list(frappe.db.sql_iterator(query, as_dict="rows", batch_size=2)), rows)
+
+		kwargs = {"fields": ["name", "code"], "order_by": "name", "limit": 5}
+		self.assertEqual([r.as_dict() for r in frappe.get_all("Country", as_dict="rows", **kwargs)], expected)
+		qb_query = frappe.qb.get_query("Country", fields=["name", "code"], order_by="name", limit=5)
+		self.assertEqual([r.as_dict() for r in qb_query.run(as_dict="rows")], expected)
+
+	def test_as_dict_rows_columns_shadow_attributes(self):
+		query = "select count(*) as count, 2 as `index`, 'x' as `values` from `tabCountry`"
+		row = frappe.db.sql(query, as_dict="rows")[0]
+
+		self.assertEqual(row.count, frappe.db.count("Country"))
+		self.assertEqual(row.index, 2)
+		self.assertEqual(row.values, "x")
+		self.assertEqual(row._values(), (row.count, 2, "x"))
+		self.assertEqual(row._as_dict(), {"count": row.count, "index": 2, "values": "x"})
+
 
 class ExtIntegrationTestCase(IntegrationTestCase):
 	def assertSqlException(self):
@@ -580,6 +580,32 @@ class TestDBQuery(IntegrationTestCase):
 		self.assertFalse({"name": "Level 2 B"} in data)
 		update("Nested DocType", "All", 0, "if_owner", 1)
 
+	def test_user_permission_subquery(self):
+		frappe.set_user("Administrator")
+		create_nested_doctype()
+		create_nested_doctype_records()
+		clear_user_permissions_for_doctype("Nested DocType")
+		add_user_permission("Nested DocType", "Level 1 A", "test2@example.com")
+
+		from frappe.core.page.permission_manager.permission_manager import update
+
+		update("Nested DocType", "All", 0, "if_owner", 0)
+
+		with self.set_user("test2@example.com"):
+			expected = DatabaseQuery("Nested DocType").execute(order_by="name")
+			with patch("frappe.model.db_query.USER_PERMISSION_SUBQUERY_THRESHOLD", 0):
+				query = DatabaseQuery("Nested DocType")
+				query.add_user_permissions(frappe.permissions.get_user_permissions("test2@example.com"))
+				self.assertIn("tabUser Permission", query.match_conditions[0])
+
+				frappe.clear_cache(doctype="Nested DocType")
+				data = DatabaseQuery("Nested DocType").execute(order_by="name")
+
+		self.assertEqual(data, expected)
+		self.assertIn({"name": "Level 2 A"}, data)
+		self.assertNotIn({"name": "Level 1 B"}, data)
+		update("Nested DocType", "All", 0, "if_owner", 1)
+
 	def test_filter_sanitizer(self):
 		self.assertRaises(
 			frappe.DataError,
@@ -696,6 +722,12 @@ class TestDBQuery(IntegrationTestCase):
 				order_by="timestamp(modified)",
 			)
 
+	def test_hierarchy_filters_use_subquery(self):
+		frappe.set_user("Administrator")
+		query = frappe.get_all("Nested DocType", {"name": ("descendants of", "Level 1 A")}, run=False)
+		self.assertIn("select tree.name from `tabNested DocType` tree", query)
+		self.assertNotIn("Level 2 A", query)
+
 	def test_of_not_of_descendant_ancestors(self):
 		frappe.set_user("Administrator")
 		clear_user_permissions_for_doctype("Nested DocType")
@@ -1,5 +1,7 @@
+from unittest.mock import patch
+
 import frappe
-from frappe.deferred_insert import deferred_insert, save_to_db
+from frappe.deferred_insert import deferred_insert, insert_records, save_to_db
 from frappe.tests import IntegrationTestCase
 
 
@@ -16,3 +18,29 @@ class TestDeferredInsert(IntegrationTestCase):
 		frappe.clear_cache()  # deferred_insert cache keys are supposed to be persistent
 		save_to_db()
 		self.assertTrue(frappe.db.exists("Route History", route_history))
+
+	def test_bulk_deferred_insert(self):
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for _ in range(250)]
+		for i in range(0, len(routes), 10):
+			deferred_insert("Route History", routes[i : i + 10])
+
+		# invalid record only fails itself, rest of its chunk is inserted one by one
+		invalid_route = {"route": frappe.generate_hash(), "user": "non-existent-user@example.com"}
+		deferred_insert("Route History", [invalid_route])
+
+		save_to_db()
+		self.assertEqual(
+			frappe.db.count("Route History", {"route": ("in", [r["route"] for r in routes])}), len(routes)
+		)
+		self.assertFalse(frappe.db.exists("Route History", {"route": invalid_route["route"]}))
+
+	def test_failed_chunk_runs_after_insert_once(self):
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for _ in range(3)]
+		invalid_route = {"route": frappe.generate_hash(), "user": "non-existent-user@example.com"}
+
+		with patch("frappe.deferred_insert._run_after_insert_methods") as run_after_insert:
+			insert_records([*routes, invalid_route], "Route History")
+
+		# records of the failed chunk are inserted with `Document.insert`, which runs them itself
+		run_after_insert.assert_not_called()
+		self.assertEqual(frappe.db.count("Route History", {"route": ("in", [r["route"] for r in routes])}), 3)
@@ -93,6 +93,72 @@ class TestDocument(IntegrationTestCase):
 		self.assertTrue(d.name.startswith("EV"))
 		self.assertEqual(frappe.db.get_value("Event", d.name, "subject"), "test-doc-test-event 2")
 
+	def test_get_docs(self):
+		users = frappe.get_all("User", pluck="name", order_by="creation", limit=5)
+		users.reverse()
+
+		child_doctypes = {df.options for df in frappe.get_meta("User").get_table_fields()}
+		with self.assertQueryCount(1 + len(child_doctypes)):
+			docs = frappe.get_docs("User", users)
+
+		self.assertEqual([d.name for d in docs], users)
+		for doc in docs:
+			expected = frappe.get_doc("User", doc.name)
+			self.assertEqual(doc.as_dict(), expected.as_dict())
+
+		self.assertEqual(frappe.get_docs("User", []), [])
+		self.assertRaises(frappe.DoesNotExistError, frappe.get_docs, "User", [*users, "_missing_user_"])
+
+	def test_get_docs_uses_controller_constructor(self):
+		files = [
+			frappe.get_doc(
+				{"doctype": "File", "file_name": f"test-get-docs-{i}.txt", "content": "test", "is_private": 1}
+			).insert()
+			for i in range(2)
+		]
+
+		docs = frappe.get_docs("File", [f.name for f in files])
+		for doc in docs:
+			# set by `File.__init__`
+			self.assertEqual(doc.content, b"")
+			self.assertFalse(doc.decode)
+			self.assertEqual(doc.as_dict(), frappe.get_doc("File", doc.name).as_dict())
+
+	def test_bulk_insert_validated(self):
+		events = [
+			{"subject": f"test-bulk-insert-validated {i}", "starts_on": "2014-01-01", "event_type": "Public"}
+			for i in range(3)
+		]
+		docs = frappe.bulk_insert_validated("Event", events)
+
+		self.assertEqual(len(docs), 3)
+		for doc, event in zip(docs, events, strict=True):
+			self.assertTrue(doc.name.startswith("EV"))
+			self.assertFalse(doc.is_new())
+			self.assertEqual(frappe.db.get_value("Event", doc.name, "subject"), event["subject"])
+
+		# links are validated
+		self.assertRaises(
+			frappe.LinkValidationError,
+			frappe.bulk_insert_validated,
+			"ToDo",
+			[{"description": "test", "allocated_to": "_missing_user_"}],
+		)
+
+		# mandatory fields are validated
+		self.assertRaises(frappe.MandatoryError, frappe.bulk_insert_validated, "Event", [{"subject": "test"}])
+
+		# names can't be taken twice
+		self.assertRaises(
+			frappe.DuplicateEntryError,
+			frappe.bulk_insert_validated,
+			"Role",
+			[{"role_name": "_Test Bulk Insert Role"}] * 2,
+		)
+		self.assertRaises(
+			frappe.DuplicateEntryError, frappe.bulk_insert_validated, "Role", [{"role_name": "Guest"}]
+		)
+
 	def test_update(self):
 		d = self.test_insert()
 		d.subject = "subject changed"
@@ -1,6 +1,9 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import time
+from unittest.mock import patch
+
 import frappe
 import frappe.monitor
 from frappe.monitor import MONITOR_REDIS_KEY, get_trace_id
@@ -88,3 +91,68 @@ class TestMonitor(IntegrationTestCase):
 		frappe.db.sql("select 1")
 		self.assertIn(get_trace_id(), str(frappe.db.last_query))
 		frappe.monitor.stop(response)
+
+	def test_buffered_entries(self):
+		set_request(method="GET", path="/api/method/frappe.ping")
+		response = build_response("json")
+
+		with patch.dict(frappe.conf, {"monitor_buffer_size": 3}):
+			for _ in range(2):
+				frappe.monitor.start()
+				frappe.monitor.stop(response)
+			self.assertEqual(frappe.cache.llen(MONITOR_REDIS_KEY), 0)
+
+			frappe.monitor.start()
+			frappe.monitor.stop(response)
+			self.assertEqual(frappe.cache.llen(MONITOR_REDIS_KEY), 3)
+
+	def test_buffered_entries_flushed_on_timer(self):
+		set_request(method="GET", path="/api/method/frappe.ping")
+		response = build_response("json")
+
+		with (
+			patch.dict(frappe.conf, {"monitor_buffer_size": 3}),
+			patch.object(frappe.monitor, "MONITOR_BUFFER_TIME", 0.1),
+		):
+			for _ in range(2):
+				frappe.monitor.start()
+				frappe.monitor.stop(response)
+			self.assertEqual(frappe.cache.llen(MONITOR_REDIS_KEY), 0)
+
+			# no more requests, entries are pushed anyway
+			time.sleep(0.5)
+			self.assertEqual(frappe.cache.llen(MONITOR_REDIS_KEY), 2)
+
+	def test_percentiles(self):
+		frappe.monitor.reset_percentiles()
+		set_request(method="GET", path="/api/method/frappe.ping")
+		response = build_response("json")
+
+		with patch.dict(frappe.conf, {"monitor_percentiles": 1}):
+			for _ in range(10):
+				frappe.monitor.start()
+				frappe.monitor.stop(response)
+
+		stats = frappe.monitor.get_percentiles("/api/method/frappe.ping")["/api/method/frappe.ping"]
+		self.assertEqual(stats["count"], 10)
+		self.assertTrue(stats["p50"] <= stats["p95"] <= stats["p99"])
+		frappe.monitor.reset_percentiles()
+
+	def test_flush_buffer_uses_buffered_settings(self):
+		frappe.monitor.reset_percentiles()
+		set_request(method="GET", path="/api/method/frappe.ping")
+		response = build_response("json")
+
+		with patch.dict(frappe.conf, {"monitor_buffer_size": 10, "monitor_percentiles": 1}):
+			for _ in range(2):
+				frappe.monitor.start()
+				frappe.monitor.stop(response)
+
+		# flushed at exit, when site config is no longer available
+		with patch.object(frappe.local, "conf", None):
+			frappe.monitor.flush_buffer()
+
+		self.assertEqual(frappe.cache.llen(MONITOR_REDIS_KEY), 2)
+		stats = frappe.monitor.get_percentiles("/api/method/frappe.ping")["/api/method/frappe.ping"]
+		self.assertEqual(stats["count"], 2)
+		frappe.monitor.reset_percentiles()
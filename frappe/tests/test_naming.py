@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 
 import time
+from unittest.mock import patch
 from uuid import UUID
 
 import uuid_utils
@@ -13,11 +14,14 @@ from frappe.model.naming import (
 	InvalidNamingSeriesError,
 	InvalidUUIDValue,
 	NamingSeries,
+	_autonomous_transaction,
 	append_number_if_name_exists,
 	determine_consecutive_week_number,
 	getseries,
 	make_autoname,
 	parse_naming_series,
+	preallocate_series,
+	release_series_block,
 	revert_series_if_last,
 )
 from frappe.query_builder.utils import db_type_is
@@ -148,6 +152,76 @@ class TestNaming(IntegrationTestCase):
 
 		self.assertEqual(todo.name, f"TODO-{week}-{series}")
 
+	def test_preallocate_series(self):
+		series = "TEST-PREALLOCATE-"
+		frappe.db.delete("Series", {"name": series})
+
+		with preallocate_series(10):
+			names = [getseries(series, 3) for _ in range(3)]
+			self.assertEqual(frappe.db.get_value("Series", series, "current", order_by=None), 10)
+
+		self.assertEqual(names, ["001", "002", "003"])
+		# unused numbers are given back
+		self.assertEqual(frappe.db.get_value("Series", series, "current", order_by=None), 3)
+		self.assertEqual(getseries(series, 3), "004")
+		frappe.db.delete("Series", {"name": series})
+
+	def test_series_block_allocation(self):
+		if frappe.db.db_type == "sqlite":
+			self.skipTest("Block allocation is not used for SQLite")
+
+		series = f"TEST-BLOCK-{frappe.generate_hash(length=5)}-"
+		with patch.dict(frappe.conf, {"naming_series_block_size": {"TEST-BLOCK-": 5}}):
+			self.assertEqual([getseries(series, 3) for _ in range(2)], ["001", "002"])
+
+			# block is reserved and committed separately from current transaction
+			self.assertEqual(get_committed_series_value(series), 5)
+
+			self.assertEqual(release_series_block(series), 3)
+			self.assertEqual(get_committed_series_value(series), 2)
+			self.assertEqual(getseries(series, 3), "003")
+
+		frappe.db.delete("Series", {"name": series})
+		frappe.db.commit()
+
+	def test_revert_series_with_block_allocation(self):
+		if frappe.db.db_type == "sqlite":
+			self.skipTest("Block allocation is not used for SQLite")
+
+		series = f"TEST-BLOCK-{frappe.generate_hash(length=5)}-"
+		with patch.dict(frappe.conf, {"naming_series_block_size": {"TEST-BLOCK-": 2}}):
+			self.assertEqual([getseries(series, 3) for _ in range(2)], ["001", "002"])
+
+			# deleting the last document and inserting another one in the same transaction must not
+			# wait on the series row, which is locked by the separate transaction reserving a block
+			revert_series_if_last(f"{series}.###", f"{series}002")
+			self.assertEqual(getseries(series, 3), "003")
+
+			current = frappe.db.get_value("Series", series, "current", order_by=None)
+			self.assertEqual(current, 4)
+			release_series_block(series)
+
+		frappe.db.delete("Series", {"name": series})
+		frappe.db.commit()
+
+	def test_series_block_allocation_after_update_counter(self):
+		if frappe.db.db_type == "sqlite":
+			self.skipTest("Block allocation is not used for SQLite")
+
+		self.addCleanup(frappe.db.rollback)
+		with patch.dict(frappe.conf, {"naming_series_block_size": {"EV": 5}}):
+			series = NamingSeries("EV.#####")
+			current = series.get_current_value() + 10
+			series.update_counter(current)
+
+			# series row is locked by this transaction, numbers are reserved in it instead of
+			# waiting on that lock in a separate transaction
+			event = frappe.get_doc(
+				doctype="Event", subject="test series lock", starts_on=now_datetime(), event_type="Public"
+			).insert()
+			self.assertEqual(event.name, f"EV{current + 1:05d}")
+			self.assertEqual(series.get_current_value(), current + 1)
+
 	def test_revert_series(self):
 		from datetime import datetime
 
@@ -450,3 +524,8 @@ def parse_naming_series_variable(doc, variable):
 
 def make_invalid_todo():
 	frappe.get_doc({"doctype": "ToDo", "description": "Test"}).insert(set_name="ToDo")
+
+
+def get_committed_series_value(key: str) -> int:
+	with _autonomous_transaction() as db:
+		return db.sql("SELECT `current` FROM `tabSeries` WHERE `name`=%s", (key,))[0][0]
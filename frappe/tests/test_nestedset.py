@@ -148,6 +148,20 @@ class TestNestedSet(IntegrationTestCase):
 		rebuild_tree(TEST_DOCTYPE)
 		self.test_basic_tree()
 
+	def test_rebuild_tree_dry_run(self):
+		rebuild_tree(TEST_DOCTYPE)
+		self.assertEqual(rebuild_tree(TEST_DOCTYPE, dry_run=True), [])
+
+		# corrupt the tree, dry run must only report changes
+		frappe.db.set_value(TEST_DOCTYPE, "Child 1", {"lft": 0, "rgt": 0}, update_modified=False)
+		changes = rebuild_tree(TEST_DOCTYPE, dry_run=True)
+		self.assertEqual([change.name for change in changes], ["Child 1"])
+		self.assertEqual((changes[0].lft, changes[0].rgt), (0, 0))
+		self.assertEqual(frappe.db.get_value(TEST_DOCTYPE, "Child 1", "lft"), 0)
+
+		rebuild_tree(TEST_DOCTYPE)
+		self.test_basic_tree()
+
 	def test_move_group_into_another(self):
 		old_lft, old_rgt = frappe.db.get_value(TEST_DOCTYPE, "Parent 2", ["lft", "rgt"])
 
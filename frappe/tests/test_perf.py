@@ -136,7 +136,34 @@ class TestPerformance(IntegrationTestCase):
 		EXPECTED_RPS = 140  # measured on GHA
 		FAILURE_THREASHOLD = 0.1
 
-		req_count = 1000
+		rps = self.measure_basic_req_per_seconds()
+
+		self.assertGreaterEqual(
+			rps,
+			EXPECTED_RPS * (1 - FAILURE_THREASHOLD),
+			"Possible performance regression in basic /api/Resource list  requests",
+		)
+
+	def test_req_per_seconds_with_connection_pool(self):
+		"""Same as `test_req_per_seconds_basic` but with database connection pooling enabled."""
+		from frappe.installer import update_site_config
+
+		FAILURE_THREASHOLD = 0.1
+
+		baseline_rps = self.measure_basic_req_per_seconds()
+
+		update_site_config("db_connection_pool_size", 4)
+		self.addCleanup(update_site_config, "db_connection_pool_size", "None")
+		pooled_rps = self.measure_basic_req_per_seconds()
+
+		print(f"Connection pooling: {baseline_rps} -> {pooled_rps} requests per seconds")
+		self.assertGreaterEqual(
+			pooled_rps,
+			baseline_rps * (1 - FAILURE_THREASHOLD),
+			"Connection pooling shouldn't make basic /api/Resource list requests slower",
+		)
+
+	def measure_basic_req_per_seconds(self, req_count=1000) -> float:
 		client = FrappeClient(self.HOST, "Administrator", self.ADMIN_PASSWORD)
 
 		start = time.perf_counter()
@@ -147,11 +174,7 @@ class TestPerformance(IntegrationTestCase):
 		rps = req_count / (end - start)
 
 		print(f"Completed {req_count} in {end - start} @ {rps} requests per seconds")
-		self.assertGreaterEqual(
-			rps,
-			EXPECTED_RPS * (1 - FAILURE_THREASHOLD),
-			"Possible performance regression in basic /api/Resource list  requests",
-		)
+		return rps
 
 	def test_homepage_resolver(self):
 		paths = ["/", "/app"]
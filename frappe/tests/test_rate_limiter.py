@@ -2,14 +2,15 @@
 # License: MIT. See LICENSE
 
 import time
+from unittest.mock import patch
 
 from werkzeug.wrappers import Response
 
 import frappe
 import frappe.rate_limiter
-from frappe.rate_limiter import RateLimiter
+from frappe.rate_limiter import RateLimiter, consume_token
 from frappe.tests import IntegrationTestCase
-from frappe.utils import cint
+from frappe.utils import cint, set_request
 
 
 class TestRateLimiter(IntegrationTestCase):
@@ -117,3 +118,35 @@ class TestRateLimiter(IntegrationTestCase):
 		time.sleep(1.1)
 		self.assertFalse(frappe.cache.exists(limiter.key, shared=True))
 		frappe.cache.delete(limiter.key)
+
+	def test_token_bucket(self):
+		key = f"rl:test:{frappe.generate_hash()}"
+		for remaining in (2, 1, 0):
+			allowed, tokens = consume_token(key, 3, 3600)
+			self.assertTrue(allowed)
+			self.assertAlmostEqual(tokens, remaining, places=2)
+
+		allowed, _tokens = consume_token(key, 3, 3600)
+		self.assertFalse(allowed)
+
+		# refilled at 3 tokens per second
+		key = f"rl:test:{frappe.generate_hash()}"
+		for _ in range(3):
+			consume_token(key, 3, 1)
+		self.assertFalse(consume_token(key, 3, 1)[0])
+		time.sleep(0.5)
+		self.assertTrue(consume_token(key, 3, 1)[0])
+
+	def test_rate_limit_policy(self):
+		frappe.set_user("Administrator")
+		set_request(method="GET", path="/api/method/frappe.ping")
+		cmd = "frappe.ping"
+		policies = {cmd: {"limit": 2, "seconds": 3600, "per": "user"}}
+		frappe.cache.delete_value(f"rl:policy:{cmd}:Administrator:3600")
+
+		with patch.dict(frappe.conf, {"rate_limit_policies": policies}):
+			frappe.rate_limiter.apply_policy(cmd)
+			frappe.rate_limiter.apply_policy(cmd)
+			self.assertRaises(frappe.RateLimitExceededError, frappe.rate_limiter.apply_policy, cmd)
+
+		frappe.cache.delete_value(f"rl:policy:{cmd}:Administrator:3600")
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.realtime import flush_pending_progress, flush_realtime_log, publish_progress
+from frappe.tests import IntegrationTestCase
+
+
+class TestRealtime(IntegrationTestCase):
+	def tearDown(self):
+		frappe.realtime.clear_realtime_log()
+
+	def test_updates_coalesced_after_commit(self):
+		for modified in ("2025-01-01", "2025-01-02"):
+			frappe.publish_realtime(
+				"doc_update",
+				{"modified": modified, "doctype": "ToDo", "name": "todo-1"},
+				doctype="ToDo",
+				docname="todo-1",
+				after_commit=True,
+			)
+		for name in ("todo-1", "todo-2", "todo-1"):
+			frappe.publish_realtime("list_update", {"doctype": "ToDo", "name": name}, after_commit=True)
+
+		with patch("frappe.realtime.emit_batch_via_redis") as emit_batch:
+			flush_realtime_log()
+
+		messages = emit_batch.call_args.args[0]
+		self.assertEqual(len(messages), 3)
+		self.assertEqual(messages[0][1]["modified"], "2025-01-02")
+		self.assertEqual([m[1]["name"] for m in messages[1:]], ["todo-1", "todo-2"])
+
+	def test_progress_is_throttled(self):
+		with patch("frappe.realtime.publish_realtime") as publish:
+			for percent in range(0, 101, 10):
+				publish_progress(percent, title="Importing", task_id="throttle-test")
+
+		percents = [c.kwargs["message"]["percent"] for c in publish.call_args_list]
+		self.assertEqual(percents, [0, 100])
+
+	def test_last_throttled_progress_is_published(self):
+		with patch("frappe.realtime.publish_realtime") as publish:
+			for i in range(10):
+				publish_progress(i * 100 / 10, title="Importing", task_id="pending-test")
+			flush_pending_progress()
+
+		percents = [c.kwargs["message"]["percent"] for c in publish.call_args_list]
+		self.assertEqual(percents, [0, 90])
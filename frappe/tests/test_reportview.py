@@ -1,8 +1,19 @@
 # Copyright (c) 2019, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import time
+from unittest.mock import patch
+
 import frappe
-from frappe.desk.reportview import export_query, extract_fieldnames
+from frappe.desk.reportview import (
+	COUNT_REFRESH_INTERVAL,
+	clear_stats_cache,
+	export_query,
+	extract_fieldnames,
+	get_estimated_count,
+	get_group_counts,
+	refresh_count,
+)
 from frappe.tests import IntegrationTestCase
 
 
@@ -87,3 +98,98 @@ class TestReportview(IntegrationTestCase):
 		self.assertEqual(extract_fieldnames("`tabChild DocType`.`fiedname`")[0], "tabChild DocType.fiedname")
 
 		self.assertEqual(extract_fieldnames("sum(1)"), [])
+
+	def test_estimated_count(self):
+		frappe.local.form_dict = frappe._dict(doctype="DocType", filters={"module": "Core"})
+
+		with patch("frappe.enqueue") as enqueue:
+			result = get_estimated_count()
+
+		# filtered counts can't be estimated, exact count is computed in background
+		self.assertTrue(result["estimated"])
+		self.assertIsNone(result["count"])
+
+		kwargs = enqueue.call_args.kwargs
+		self.assertEqual(kwargs["job_id"], result["key"])
+		with patch("frappe.publish_realtime") as publish:
+			refresh_count(kwargs["args"], kwargs["user"], kwargs["key"])
+
+		count = frappe.db.count("DocType", {"module": "Core"})
+		self.assertEqual(publish.call_args.args[1]["count"], count)
+
+		with patch("frappe.enqueue") as enqueue:
+			result = get_estimated_count()
+
+		self.assertFalse(result["estimated"])
+		self.assertEqual(result["count"], count)
+		enqueue.assert_not_called()
+
+		# stale counts are served while they are refreshed
+		with patch("frappe.desk.reportview.time.time", return_value=time.time() + COUNT_REFRESH_INTERVAL):
+			with patch("frappe.enqueue") as enqueue:
+				result = get_estimated_count()
+
+		self.assertTrue(result["estimated"])
+		self.assertEqual(result["count"], count)
+		enqueue.assert_called_once()
+		frappe.cache.delete_value(result["key"])
+
+	def test_estimated_count_with_child_table_filter(self):
+		frappe.local.form_dict = frappe._dict(
+			doctype="DocType",
+			filters=[["DocField", "fieldtype", "=", "Data"]],
+			fields=[],
+			distinct=True,
+		)
+
+		with patch("frappe.enqueue") as enqueue:
+			get_estimated_count()
+
+		kwargs = enqueue.call_args.kwargs
+		with patch("frappe.publish_realtime") as publish:
+			refresh_count(kwargs["args"], kwargs["user"], kwargs["key"])
+
+		# doctypes are counted once, not once per matching field
+		count = len(
+			frappe.get_all("DocType", filters=[["DocField", "fieldtype", "=", "Data"]], distinct=True)
+		)
+		self.assertEqual(publish.call_args.args[1]["count"], count)
+		frappe.cache.delete_value(kwargs["key"])
+
+	def test_estimated_count_of_child_table_checks_parent_permission(self):
+		frappe.local.form_dict = frappe._dict(doctype="Has Role")
+
+		with self.set_user("Guest"), patch("frappe.enqueue") as enqueue:
+			self.assertRaises(frappe.PermissionError, get_estimated_count)
+		enqueue.assert_not_called()
+
+		frappe.local.form_dict = frappe._dict(doctype="Has Role", parent_doctype="User")
+		with patch("frappe.enqueue"):
+			self.assertIn("count", get_estimated_count())
+
+	def test_group_counts_single_query(self):
+		clear_stats_cache("DocType")
+		filters = {"module": ("in", ["Core", "Desk"])}
+
+		with patch("frappe.db.sql", wraps=frappe.db.sql) as sql:
+			counts = get_group_counts("DocType", ["module", "issingle"], filters)
+			self.assertEqual(get_group_counts("DocType", ["module", "issingle"], filters), counts)
+
+		# both columns are counted with one query, second call is served from cache
+		self.assertEqual(len([c for c in sql.call_args_list if "union all" in str(c.args[0])]), 1)
+		self.assertEqual(set(counts["issingle"]), {0, 1})
+		for column in ("module", "issingle"):
+			for value, count in counts[column].items():
+				self.assertEqual(count, frappe.db.count("DocType", {**filters, column: value}))
+
+		clear_stats_cache("DocType")
+
+	def test_group_counts_mixed_column_types(self):
+		clear_stats_cache("DocType")
+		# numeric column after two columns which are NULL in the first part of the union
+		columns = ["module", "document_type", "issingle"]
+		counts = get_group_counts("DocType", columns)
+
+		self.assertEqual(set(counts["issingle"]), {0, 1})
+		self.assertEqual(sum(counts["issingle"].values()), frappe.db.count("DocType"))
+		clear_stats_cache("DocType")
@@ -7,10 +7,14 @@ import frappe
 from frappe.core.doctype.scheduled_job_type.scheduled_job_type import ScheduledJobType, sync_jobs
 from frappe.tests import IntegrationTestCase
 from frappe.utils import add_days, get_datetime
+from frappe.utils.background_jobs import get_redis_conn
 from frappe.utils.doctor import purge_pending_jobs
 from frappe.utils.scheduler import (
 	DEFAULT_SCHEDULER_TICK,
+	SHARD_LEASE_KEY,
+	_acquire_shard_leases,
 	enqueue_events,
+	get_site_shard,
 	is_dormant,
 	schedule_jobs_based_on_activity,
 	sleep_duration,
@@ -58,6 +62,43 @@ class TestScheduler(IntegrationTestCase):
 			# 1st job is in the queue (or running), don't enqueue it again
 			self.assertFalse(job.enqueue())
 
+	def test_enqueued_jobs_checked_in_batch(self):
+		frappe.db.sql("update `tabScheduled Job Type` set last_execution = '2010-01-01 00:00:00'")
+		job = get_test_job()
+
+		with patch(
+			"frappe.utils.scheduler.get_enqueued_job_ids", return_value={job.rq_job_id}
+		) as get_enqueued_job_ids:
+			enqueued_jobs = enqueue_events()
+
+		get_enqueued_job_ids.assert_called_once()
+		self.assertNotIn(job.method, enqueued_jobs)
+		self.assertIn("frappe.desk.notifications.clear_notifications", enqueued_jobs)
+
+	def test_site_shard(self):
+		sites = [f"site{i}.localhost" for i in range(50)]
+		shards = {site: get_site_shard(site, 4) for site in sites}
+
+		self.assertEqual(shards, {site: get_site_shard(site, 4) for site in sites})
+		self.assertEqual(set(shards.values()), {0, 1, 2, 3})
+		self.assertTrue(all(get_site_shard(site, 1) == 0 for site in sites))
+
+	@patch("frappe.utils.scheduler._shard_leases", set())
+	@patch("frappe.utils.scheduler._free_shards", set())
+	def test_scheduler_takes_over_unserved_shards(self):
+		redis_conn = get_redis_conn()
+		keys = [SHARD_LEASE_KEY.format(shard) for shard in range(3)]
+		redis_conn.delete(*keys)
+		self.addCleanup(redis_conn.delete, *keys)
+
+		leased, unserved = _acquire_shard_leases(redis_conn, 3, 60)
+		self.assertEqual(len(leased), 1)
+		self.assertEqual(unserved, {0, 1, 2} - leased)
+
+		leased, unserved = _acquire_shard_leases(redis_conn, 3, 60)
+		self.assertEqual(leased, {0, 1, 2})
+		self.assertFalse(unserved)
+
 	@patch.object(frappe.utils.frappecloud, "on_frappecloud", return_value=True)
 	@patch.dict(frappe.conf, {"developer_mode": 0})
 	def test_is_dormant(self, _mock):
@@ -306,6 +306,37 @@ class TestSQLiteSearchAPI(IntegrationTestCase):
 		# Should return empty results or minimal results
 		self.assertLessEqual(len(results["results"]), 1)
 
+	def test_symspell_spelling_correction(self):
+		"""Test spelling correction with SymSpell delete index."""
+		from frappe.search.sqlite_search import get_edit_distance, get_symspell_deletes
+
+		self.assertEqual(get_edit_distance("python", "pyhton", 2), 1)
+		self.assertEqual(get_edit_distance("python", "pascal", 2), 3)
+		self.assertTrue(get_symspell_deletes("porgramming") & get_symspell_deletes("programming"))
+
+		class SymSpellSearch(TestSQLiteSearch):
+			INDEX_NAME = "test_symspell_search.db"
+			SPELLING_CORRECTION_BACKEND = "symspell"
+
+		search = SymSpellSearch()
+		search.build_index()
+		self.addCleanup(search.drop_index)
+
+		self.assertEqual(search._find_similar_words("programing")[0], "programming")
+		self.assertEqual(search._find_similar_words("porgramming")[0], "programming")
+		self.assertEqual(
+			search.search("programing")["summary"]["corrected_words"], {"programing": "programming"}
+		)
+
+		# Delete index is kept up to date with vocabulary
+		note = frappe.get_doc({"doctype": "Note", "title": "Kangaroo", "content": "Kangaroo facts"}).insert()
+		self.test_notes.append(note)
+		search.index_doc("Note", note.name)
+		self.assertEqual(search._find_similar_words("kangaro")[0], "kangaroo")
+
+		search.remove_doc("Note", note.name)
+		self.assertEqual(search._find_similar_words("kangaro"), [])
+
 	def test_document_indexing_operations(self):
 		"""Test individual document indexing and removal operations."""
 		self.search.build_index()
@@ -355,6 +386,91 @@ class TestSQLiteSearchAPI(IntegrationTestCase):
 		finally:
 			new_note.delete()
 
+	def test_build_index_pagination(self):
+		"""Test that records are read in pages for full rebuilds."""
+		pages = list(self.search._iter_document_pages("Note", page_size=2))
+		names = [doc.name for page in pages for doc in page]
+
+		self.assertTrue(all(len(page) <= 2 for page in pages))
+		self.assertEqual(len(names), len(set(names)))
+		self.assertEqual(len(names), self.search._count_documents("Note"))
+		self.assertTrue(all(doc.doctype == "Note" for page in pages for doc in page))
+
+		self.search.build_index()
+		results = self.search.search("Python")
+		self.assertIn(self.test_notes[0].name, [r["name"] for r in results["results"]])
+		self.assertTrue(self.search.sql("SELECT 1 FROM search_vocabulary LIMIT 1", read_only=True))
+
+	def test_large_filters_use_metadata_table(self):
+		"""Test that long filter lists are applied through the metadata table."""
+		self.search.build_index()
+
+		def count(table):
+			return self.search.sql(f"SELECT COUNT(*) FROM {table}", read_only=True)[0][0]
+
+		self.assertEqual(count("search_fts"), count("search_metadata"))
+
+		owners = [f"user{i}@example.com" for i in range(500)]
+		results = self.search.search("Python", filters={"owner": [*owners, "Administrator"]})
+		self.assertIn(self.test_notes[0].name, [r["name"] for r in results["results"]])
+
+		results = self.search.search("Python", filters={"owner": owners})
+		self.assertEqual(results["results"], [])
+
+		# Metadata is kept in sync with incremental updates
+		self.search.remove_doc("Note", self.test_notes[0].name)
+		self.assertEqual(count("search_fts"), count("search_metadata"))
+		results = self.search.search("Python", filters={"owner": [*owners, "Administrator"]})
+		self.assertNotIn(self.test_notes[0].name, [r["name"] for r in results["results"]])
+
+	def test_index_queue(self):
+		"""Test queued index updates and incremental vocabulary updates."""
+		from frappe.search.sqlite_search import (
+			INDEX_QUEUE_KEY,
+			REMOVE,
+			process_index_queue,
+			queue_index_update,
+		)
+
+		self.search.build_index()
+		frappe.cache.delete_value(INDEX_QUEUE_KEY)
+
+		def vocabulary(word):
+			return self.search.sql(
+				"SELECT frequency FROM search_vocabulary WHERE word = ?", (word,), read_only=True
+			)
+
+		note = frappe.get_doc(
+			{"doctype": "Note", "title": "Queued Zeppelin", "content": "Zeppelin flies over the harbour"}
+		).insert()
+		self.test_notes.append(note)
+
+		with patch("frappe.search.sqlite_search.get_search_classes", return_value=[TestSQLiteSearch]):
+			queue_index_update("Note", note.name)
+			queue_index_update("Note", note.name)
+			self.assertEqual(frappe.cache.llen(INDEX_QUEUE_KEY), 2)
+			self.assertFalse(vocabulary("zeppelin"))
+
+			process_index_queue()
+			self.assertEqual(frappe.cache.llen(INDEX_QUEUE_KEY), 0)
+
+			results = self.search.search("Zeppelin")
+			self.assertEqual([r["name"] for r in results["results"]], [note.name])
+			self.assertEqual(vocabulary("zeppelin")[0][0], 2)
+			self.assertTrue(self.search._find_similar_words("zepelin"))
+
+			note.db_set("content", "Airship over the harbour")
+			queue_index_update("Note", note.name)
+			process_index_queue()
+			self.assertEqual(vocabulary("zeppelin")[0][0], 1)
+			self.assertEqual(vocabulary("airship")[0][0], 1)
+
+			queue_index_update("Note", note.name, REMOVE)
+			process_index_queue()
+			self.assertFalse(self.search.search("Zeppelin")["results"])
+			self.assertFalse(vocabulary("zeppelin"))
+			self.assertFalse(vocabulary("airship"))
+
 	def test_search_result_summary_and_metadata(self):
 		"""Test search result summary and metadata information."""
 		self.search.build_index()
@@ -171,7 +171,9 @@ def get_all_translations(lang: str) -> dict[str, str]:
 		return all_translations
 
 	try:
-		return frappe.cache.hget(MERGED_TRANSLATION_KEY, lang, generator=_merge_translations)
+		return frappe.cache.hget(
+			MERGED_TRANSLATION_KEY, lang, generator=_merge_translations, single_flight=True
+		)
 	except Exception:
 		# People mistakenly call translation function on global variables
 		# where locals are not initialized, translations don't make much sense there
@@ -665,6 +665,25 @@ def is_job_enqueued(job_id: str) -> bool:
 	return get_job_status(job_id) in (JobStatus.QUEUED, JobStatus.STARTED)
 
 
+def get_enqueued_job_ids(job_ids: list[str]) -> set[str]:
+	"""Return job ids which are queued or running, same as `is_job_enqueued` for many jobs.
+
+	Statuses of all jobs are read in a single pipelined Redis call."""
+	if not job_ids:
+		return set()
+
+	pipeline = get_redis_conn().pipeline(transaction=False)
+	for job_id in job_ids:
+		pipeline.hget(Job.key_for(create_job_id(job_id)), "status")
+
+	enqueued_statuses = {JobStatus.QUEUED.value.encode(), JobStatus.STARTED.value.encode()}
+	return {
+		job_id
+		for job_id, status in zip(job_ids, pipeline.execute(), strict=True)
+		if status in enqueued_statuses
+	}
+
+
 def get_job_status(job_id: str) -> JobStatus | None:
 	"""Get RQ job status, returns None if job is not found."""
 	if job := get_job(job_id):
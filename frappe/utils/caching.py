@@ -1,8 +1,9 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. Check LICENSE
 
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from collections.abc import Callable
 from contextlib import suppress
 from functools import wraps
@@ -13,6 +14,12 @@ import frappe
 _SITE_CACHE = defaultdict(dict)
 _KWD_MARK = object()  # sentinel for separating args from kwargs
 
+# Locks of `site_cache` keys being computed with `single_flight=True`, removed once cached.
+_SITE_CACHE_LOCKS: dict[tuple, threading.Lock] = {}
+
+# Value stored by `redis_cache` with `stale_ttl`, served as is until `fresh_until` (epoch).
+_StaleableValue = namedtuple("_StaleableValue", ["value", "fresh_until"])
+
 
 def __generate_request_cache_key(args: tuple, kwargs: dict) -> tuple:
 	"""Generate a key for the cache."""
@@ -75,7 +82,7 @@ def request_cache(func: Callable) -> Callable:
 	return wrapper
 
 
-def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
+def site_cache(ttl: int | None = None, maxsize: int | None = None, single_flight: bool = False) -> Callable:
 	"""
 	Decorator to cache method calls across requests.
 
@@ -86,6 +93,9 @@ def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
 	It offers a light-weight cache for the current process without the additional
 	overhead of serializing / deserializing Python objects.
 
+	With `single_flight=True`, threads calling the function with the same arguments at the same
+	time wait for the first one to compute the value instead of computing it again.
+
 	Note: This cache isn't shared among workers. If you need to share data across
 	workers, use redis (frappe.cache API) instead.
 
@@ -149,6 +159,21 @@ def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
 				# NOTE: This is just a cache miss or dictionary was modified while reading it
 				pass
 
+			if not single_flight:
+				return compute(function_cache, arguments_key, args, kwargs)
+
+			lock_key = (func, arguments_key)
+			with _SITE_CACHE_LOCKS.setdefault(lock_key, threading.Lock()):
+				with suppress(KeyError, RuntimeError):
+					# computed by another thread while we were waiting
+					return function_cache[arguments_key]
+
+				try:
+					return compute(function_cache, arguments_key, args, kwargs)
+				finally:
+					_SITE_CACHE_LOCKS.pop(lock_key, None)
+
+		def compute(function_cache, arguments_key, args, kwargs):
 			if hasattr(func, "maxsize") and len(function_cache) >= func.maxsize:
 				# Note: This implements FIFO eviction policy
 				with suppress(RuntimeError):
@@ -167,13 +192,24 @@ def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
 	return time_cache_wrapper
 
 
-def redis_cache(ttl: int | None = 3600, user: str | bool | None = None, shared: bool = False) -> Callable:
+def redis_cache(
+	ttl: int | None = 3600,
+	user: str | bool | None = None,
+	shared: bool = False,
+	*,
+	single_flight: bool = False,
+	stale_ttl: int | None = None,
+) -> Callable:
 	"""Decorator to cache method calls and its return values in Redis
 
 	args:
 	        ttl: time to expiry in seconds, defaults to 1 hour
 	        user: `true` should cache be specific to session user.
 	        shared: `true` should cache be shared across sites
+	        single_flight: `true` if on a cache miss only one process should call the function,
+	                others wait for its result instead of calling it too.
+	        stale_ttl: seconds for which an expired value is still served while one process
+	                computes the new value in its place (stale-while-revalidate).
 	"""
 
 	def wrapper(func: Callable | None = None) -> Callable:
@@ -188,19 +224,56 @@ def redis_cache(ttl: int | None = 3600, user: str | bool | None = None, shared:
 		@wraps(func)
 		def redis_cache_wrapper(*args, **kwargs):
 			func_call_key = f"{func_key}::{hash(__generate_request_cache_key(args, kwargs))}"
+
+			def generate():
+				val = func(*args, **kwargs)
+				ttl = getattr(func, "ttl", 3600)
+				if stale_ttl:
+					frappe.cache.set_value(
+						func_call_key,
+						_StaleableValue(val, time.time() + ttl),
+						expires_in_sec=ttl + stale_ttl,
+						user=user,
+						shared=shared,
+					)
+				else:
+					frappe.cache.set_value(func_call_key, val, expires_in_sec=ttl, user=user, shared=shared)
+				return val
+
+			def lookup():
+				val = frappe.cache.get_value(func_call_key, user=user, shared=shared, use_local_cache=False)
+				if not stale_ttl:
+					return val
+				return val.value if isinstance(val, _StaleableValue) else None
+
 			cached_val = frappe.cache.get_value(func_call_key, user=user, shared=shared)
+			if stale_ttl and not isinstance(cached_val, _StaleableValue):
+				# Cached before `stale_ttl` was set, regenerate it in the new format.
+				cached_val = None
 			if cached_val is not None:
-				return cached_val
+				if not stale_ttl:
+					return cached_val
+				if time.time() < cached_val.fresh_until:
+					return cached_val.value
+
+				# Stale: one process computes the new value, others keep serving the old one.
+				key = frappe.cache.make_key(func_call_key, user=user, shared=shared)
+				if not (token := frappe.cache.try_lock(key)):
+					return cached_val.value
+				try:
+					return generate()
+				finally:
+					frappe.cache.release_lock(key, token)
 
 			# Edge Case: None can mean two things: cache miss or the result itself is `None`
 			# RedisWrapper doesn't give us any way to handle this cleanly.
-			if frappe.cache.exists(func_call_key, user=user, shared=shared):
+			if not stale_ttl and frappe.cache.exists(func_call_key, user=user, shared=shared):
 				return None
 
-			val = func(*args, **kwargs)
-			ttl = getattr(func, "ttl", 3600)
-			frappe.cache.set_value(func_call_key, val, expires_in_sec=ttl, user=user, shared=shared)
-			return val
+			if single_flight:
+				key = frappe.cache.make_key(func_call_key, user=user, shared=shared)
+				return frappe.cache.single_flight(key, lookup, generate)
+			return generate()
 
 		return redis_cache_wrapper
 
@@ -15,10 +15,14 @@ from collections.abc import Iterator
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.query_builder import Order
+from frappe.query_builder import Case
 from frappe.query_builder.functions import Coalesce, Max
 from frappe.query_builder.terms import SubQuery
 from frappe.query_builder.utils import DocType
+from frappe.utils.data import cstr
+
+# Nodes updated with a single query when rebuilding a tree
+REBUILD_CHUNK_SIZE = 500
 
 
 class NestedSetRecursionError(frappe.ValidationError):
@@ -118,16 +122,11 @@ def update_move_node(doc: Document, parent_field: str):
 		(Table.lft >= doc.lft) & (Table.rgt <= doc.rgt)
 	).run()
 
-	# shift left
+	# shift left nodes on the right and only rgts of ancestors, in a single pass
 	diff = doc.rgt - doc.lft + 1
-	frappe.qb.update(Table).set(Table.lft, Table.lft - diff).set(Table.rgt, Table.rgt - diff).where(
-		Table.lft > doc.rgt
-	).run()
-
-	# shift left rgts of ancestors whose only rgts must shift
-	frappe.qb.update(Table).set(Table.rgt, Table.rgt - diff).where(
-		(Table.lft < doc.lft) & (Table.rgt > doc.rgt)
-	).run()
+	frappe.qb.update(Table).set(
+		Table.lft, Case().when(Table.lft > doc.rgt, Table.lft - diff).else_(Table.lft)
+	).set(Table.rgt, Table.rgt - diff).where(Table.rgt > doc.rgt).run()
 
 	if parent:
 		# re-query value due to computation above
@@ -139,18 +138,11 @@ def update_move_node(doc: Document, parent_field: str):
 			.run(as_dict=True)[0]
 		)
 
-		# set parent lft, rgt
-		frappe.qb.update(Table).set(Table.rgt, Table.rgt + diff).where(Table.name == parent).run()
-
-		# shift right at new parent
-		frappe.qb.update(Table).set(Table.lft, Table.lft + diff).set(Table.rgt, Table.rgt + diff).where(
-			Table.lft > new_parent.rgt
-		).run()
-
-		# shift right rgts of ancestors whose only rgts must shift
-		frappe.qb.update(Table).set(Table.rgt, Table.rgt + diff).where(
-			(Table.lft < new_parent.lft) & (Table.rgt > new_parent.rgt)
-		).run()
+		# make room in new parent: shift right nodes on its right and only rgts of parent and its
+		# ancestors, in a single pass
+		frappe.qb.update(Table).set(
+			Table.lft, Case().when(Table.lft > new_parent.rgt, Table.lft + diff).else_(Table.lft)
+		).set(Table.rgt, Table.rgt + diff).where(Table.rgt >= new_parent.rgt).run()
 
 		new_diff = new_parent.rgt - doc.lft
 	else:
@@ -165,8 +157,13 @@ def update_move_node(doc: Document, parent_field: str):
 
 
 @frappe.whitelist()
-def rebuild_tree(doctype: str) -> None:
-	"""Call rebuild_node for all root nodes."""
+def rebuild_tree(doctype: str, dry_run: bool = False) -> list[dict] | None:
+	"""Recompute `lft` and `rgt` of all nodes reachable from root nodes.
+
+	The whole tree is read in a single query and numbered in memory, only nodes whose values change
+	are written back with bulk updates. Roots and children are numbered in order of their names.
+
+	:param dry_run: Don't write anything, return changes as `{name, lft, rgt, new_lft, new_rgt}`."""
 	# Check for perm if called from client-side
 	if frappe.request and frappe.local.form_dict.cmd == "rebuild_tree":
 		frappe.only_for("System Manager")
@@ -180,23 +177,56 @@ def rebuild_tree(doctype: str) -> None:
 
 	parent_field = meta.nsm_parent_field or f"parent_{frappe.scrub(doctype)}"
 
-	# get all roots
-	right = 1
 	table = DocType(doctype)
-	column = getattr(table, parent_field)
-	result = (
-		frappe.qb.from_(table)
-		.where((column == "") | (column.isnull()))
-		.orderby(table.name, order=Order.asc)
-		.select(table.name)
-	).run()
+	query = frappe.qb.from_(table).select(table.name, table[parent_field], table.lft, table.rgt)
 
-	frappe.db.auto_commit_on_many_writes = 1
+	children: dict[str, list[str]] = {}
+	current: dict[str, tuple[int, int]] = {}
+	for name, parent, lft, rgt in frappe.db.sql_iterator(query, as_list=True):
+		# parent is a string even if names are integers (autoincrement)
+		children.setdefault(cstr(parent), []).append(name)
+		current[name] = (lft, rgt)
 
-	for r in result:
-		right = rebuild_node(doctype, r[0], right, parent_field)
+	changes = [
+		frappe._dict(name=name, lft=current[name][0], rgt=current[name][1], new_lft=lft, new_rgt=rgt)
+		for name, lft, rgt in _number_nodes(children)
+		if current[name] != (lft, rgt)
+	]
 
+	if dry_run:
+		return changes
+
+	frappe.db.auto_commit_on_many_writes = 1
+	frappe.db.bulk_update(
+		doctype,
+		{change.name: {"lft": change.new_lft, "rgt": change.new_rgt} for change in changes},
+		chunk_size=REBUILD_CHUNK_SIZE,
+		update_modified=False,
+	)
 	frappe.db.auto_commit_on_many_writes = 0
+	frappe.clear_document_cache(doctype)
+
+
+def _number_nodes(children: dict[str, list[str]]) -> Iterator[tuple[str, int, int]]:
+	"""Yield `(name, lft, rgt)` of nodes in a depth first walk from root nodes, without recursion."""
+	counter = 0
+	# (name, lft, iterator over remaining children)
+	stack: list[tuple[str, int, Iterator[str]]] = []
+	roots = iter(sorted(children.get("", ())))
+
+	while True:
+		siblings = stack[-1][2] if stack else roots
+		if (child := next(siblings, None)) is not None:
+			counter += 1
+			stack.append((child, counter, iter(sorted(children.get(cstr(child), ())))))
+			continue
+
+		if not stack:
+			return
+
+		name, lft, _children = stack.pop()
+		counter += 1
+		yield name, lft, counter
 
 
 def rebuild_node(doctype, parent, left, parent_field):
@@ -272,7 +302,9 @@ class NestedSet(Document):
 
 		# Clear user permissions cache, otherwise user can't access the new document
 		if frappe.db.exists("User Permission", {"user": frappe.session.user, "allow": self.doctype}):
-			frappe.cache.hdel("user_permissions", frappe.session.user)
+			from frappe.core.doctype.user_permission.user_permission import clear_user_permissions_cache
+
+			clear_user_permissions_cache(frappe.session.user)
 
 	def on_update(self):
 		update_nsm(self)
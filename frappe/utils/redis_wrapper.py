@@ -5,8 +5,10 @@ import pickle
 import re
 import threading
 import time
-from collections import namedtuple
+from collections import Counter, OrderedDict, namedtuple
+from collections.abc import Callable
 from contextlib import suppress
+from typing import Any
 
 import redis
 import redis.exceptions
@@ -14,12 +16,52 @@ from redis.commands.search import Search
 from redis.exceptions import ResponseError
 
 import frappe
-from frappe.utils import cstr
+from frappe.utils import cint, cstr
 
 # 5 is faster than default which is 4.
 # Python uses old protocol for backward compatibility, we don't support anything <3.10.
 DEFAULT_PICKLE_PROTOCOL = 5
 
+# Rows cached by `ClientCache.get_row`, missing rows are cached for much shorter duration.
+ROW_CACHE_TTL = 60 * 60
+NEGATIVE_ROW_CACHE_TTL = 60
+# Tolerated difference between clocks of processes which invalidate and cache rows.
+ROW_CACHE_CLOCK_SKEW = 5
+
+# Cache a row unless it was invalidated after the snapshot it was read from.
+# KEYS: row, row invalidation time, DocType invalidation time. ARGV: row, snapshot time, ttl
+SET_ROW_SCRIPT = """
+local row_invalidated_at = tonumber(redis.call('GET', KEYS[2])) or 0
+local doctype_invalidated_at = tonumber(redis.call('GET', KEYS[3])) or 0
+if math.max(row_invalidated_at, doctype_invalidated_at) >= tonumber(ARGV[2]) then
+	return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+
+# Limits of `ClientCache`, can be changed with `client_cache_max_bytes` and `client_cache_quotas`
+# in common site config.
+CLIENT_CACHE_MAX_SIZE = 4096
+CLIENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Share of `max_bytes` a key namespace can use, namespace is the key prefix before "::".
+CLIENT_CACHE_QUOTAS = {"document_cache": 0.25}
+
+# Single-flight generation of cache values, see `RedisWrapper.single_flight`.
+# The lock expires on its own if the process holding it dies while generating.
+SINGLE_FLIGHT_LOCK_TTL = 30
+SINGLE_FLIGHT_WAIT = 10
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Keys being generated by current thread, to not wait on our own lock when generators recurse.
+_single_flight_keys = threading.local()
+
+
+def _get_lock_key(key) -> str:
+	if isinstance(key, bytes):
+		key = key.decode()
+	return f"{key}|single_flight"
+
 
 class RedisearchWrapper(Search):
 	def sugadd(self, key, *suggestions, **kwargs):
@@ -76,13 +118,24 @@ class RedisWrapper(redis.Redis):
 		with suppress(redis.exceptions.ConnectionError):
 			self.set(name=key, value=pickle.dumps(val, protocol=DEFAULT_PICKLE_PROTOCOL), ex=expires_in_sec)
 
-	def get_value(self, key, generator=None, user=None, expires=False, shared=False, *, use_local_cache=True):
+	def get_value(
+		self,
+		key,
+		generator=None,
+		user=None,
+		expires=False,
+		shared=False,
+		*,
+		use_local_cache=True,
+		single_flight=False,
+	):
 		"""Return cache value. If not found and generator function is
 		        given, call the generator.
 
 		:param key: Cache key.
 		:param generator: Function to be called to generate a value if `None` is returned.
 		:param expires: If the key is supposed to be with an expiry, don't store it in frappe.local
+		:param single_flight: Call generator in only one process at a time, others wait for its value.
 		"""
 		original_key = key
 		key = self.make_key(key, user, shared)
@@ -103,14 +156,95 @@ class RedisWrapper(redis.Redis):
 
 			if not expires:
 				if val is None and generator:
-					val = generator()
-					self.set_value(original_key, val, user=user, shared=shared)
+
+					def generate():
+						val = generator()
+						self.set_value(original_key, val, user=user, shared=shared)
+						return val
+
+					if single_flight:
+						val = self.single_flight(key, lambda: self._get_unpickled(key), generate)
+					else:
+						val = generate()
 
 				else:
 					local_cache[key] = val
 
 		return val
 
+	def _get_unpickled(self, key):
+		with suppress(redis.exceptions.ConnectionError):
+			if (val := self.get(key)) is not None:
+				return pickle.loads(val)
+
+	def try_lock(self, key, ttl: int = SINGLE_FLIGHT_LOCK_TTL) -> str | None:
+		"""Take a short lived lock named after a cache key, return lock token if acquired.
+
+		:param key: Cache key, as returned by `make_key`.
+		:param ttl: Seconds after which the lock is released even if `release_lock` is never called.
+		"""
+		token = frappe.generate_hash()
+		try:
+			if self.set(_get_lock_key(key), token, nx=True, ex=ttl):
+				return token
+		except redis.exceptions.ConnectionError:
+			# Without Redis there is nobody to coordinate with.
+			return token
+
+	def release_lock(self, key, token: str) -> None:
+		lock_key = _get_lock_key(key)
+		with suppress(redis.exceptions.ConnectionError):
+			# Only release our own lock, it might have expired and been taken by someone else.
+			if self.get(lock_key) == token.encode():
+				self.delete(lock_key)
+
+	def single_flight(
+		self,
+		key,
+		lookup: Callable[[], Any],
+		generator: Callable[[], Any],
+		*,
+		wait: float = SINGLE_FLIGHT_WAIT,
+	):
+		"""Call `generator` for a missing cache key in only one process at a time.
+
+		The first caller takes a lock on the key and calls `generator`, which should store the
+		value where `lookup` can find it. Other callers don't generate the value again, they poll
+		`lookup` until it returns something other than None. If the value doesn't show up in
+		`wait` seconds or the lock is released without it, they call `generator` themselves.
+
+		:param key: Cache key, as returned by `make_key`.
+		:param lookup: Return the cached value or None if it is not available (yet).
+		:param generator: Generate, store and return the value.
+		"""
+		held = _single_flight_keys.__dict__.setdefault("keys", set())
+		if key in held:
+			return generator()
+
+		if token := self.try_lock(key):
+			held.add(key)
+			try:
+				return generator()
+			finally:
+				held.discard(key)
+				self.release_lock(key, token)
+
+		lock_key = _get_lock_key(key)
+		deadline = time.monotonic() + wait
+		while time.monotonic() < deadline:
+			time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+			if (val := lookup()) is not None:
+				return val
+			try:
+				if not super().exists(lock_key):
+					break
+			except redis.exceptions.ConnectionError:
+				break
+
+		if (val := lookup()) is not None:
+			return val
+		return generator()
+
 	def expire_key(self, key, time, *, user=None, shared=False):
 		key = self.make_key(key, user, shared)
 		try:
@@ -165,11 +299,11 @@ class RedisWrapper(redis.Redis):
 	def lpush(self, key, value):
 		return super().lpush(self.make_key(key), value)
 
-	def rpush(self, key, value):
-		return super().rpush(self.make_key(key), value)
+	def rpush(self, key, *values):
+		return super().rpush(self.make_key(key), *values)
 
-	def lpop(self, key):
-		return super().lpop(self.make_key(key))
+	def lpop(self, key, count: int | None = None):
+		return super().lpop(self.make_key(key), count)
 
 	def rpop(self, key):
 		return super().rpop(self.make_key(key))
@@ -227,7 +361,7 @@ class RedisWrapper(redis.Redis):
 		value = super().hgetall(self.make_key(name))
 		return {key: pickle.loads(value) for key, value in value.items()}
 
-	def hget(self, name, key, generator=None, shared=False):
+	def hget(self, name, key, generator=None, shared=False, *, single_flight=False):
 		_name = self.make_key(name, shared=shared)
 
 		local_cache = frappe.local.cache
@@ -250,10 +384,27 @@ class RedisWrapper(redis.Redis):
 			value = pickle.loads(value)
 			local_cache[_name][key] = value
 		elif generator:
-			value = generator()
-			self.hset(name, key, value, shared=shared)
+
+			def generate():
+				value = generator()
+				self.hset(name, key, value, shared=shared)
+				return value
+
+			if single_flight:
+				value = self.single_flight(
+					f"{_name.decode() if isinstance(_name, bytes) else _name}|{key}",
+					lambda: self._hget_unpickled(_name, key),
+					generate,
+				)
+			else:
+				value = generate()
 		return value
 
+	def _hget_unpickled(self, name, key):
+		with suppress(redis.exceptions.ConnectionError):
+			if (value := super().hget(name, key)) is not None:
+				return pickle.loads(value)
+
 	def hdel(
 		self,
 		name: str,
@@ -427,9 +578,44 @@ class _TrackedConnection(redis.Connection):
 				raise
 
 
-CachedValue = namedtuple("CachedValue", ["value", "expiry"])
+def get_row_cache_key(doctype: str, name: str) -> str:
+	return f"row_cache::{doctype}::{name}"
+
+
+def get_row_invalidation_key(doctype: str, name: str | None = None) -> str:
+	if name is None:
+		return f"row_cache_invalidated::{doctype}"
+	return f"row_cache_invalidated::{doctype}::{name}"
+
+
+def get_cache_namespace(key: bytes | str) -> str:
+	"""Return namespace of a cache key, e.g. `doctype_meta` for `doctype_meta::ToDo`."""
+	if isinstance(key, bytes):
+		key = key.decode(errors="replace")
+	if "|" in key:
+		# strip site prefix added by `make_key`
+		key = key.split("|", 1)[1]
+	return key.split("::", 1)[0]
+
+
+CachedValue = namedtuple("CachedValue", ["value", "expiry", "size", "namespace"], defaults=(0, None))
 CacheStatistics = namedtuple(
-	"CacheStatistics", ["hits", "misses", "capacity", "used", "utilization", "hit_ratio", "healthy"]
+	"CacheStatistics",
+	[
+		"hits",
+		"misses",
+		"capacity",
+		"used",
+		"utilization",
+		"hit_ratio",
+		"healthy",
+		"max_bytes",
+		"used_bytes",
+		"evictions",
+		"rejections",
+		"namespaces",
+	],
+	defaults=(0, 0, 0, 0, None),
 )
 _PLACEHOLDER_VALUE = CachedValue(value=None, expiry=-1)
 
@@ -449,7 +635,8 @@ class ClientCache:
 		- Cache keys that are read frequently, e.g. every request or at least >10% of the requests.
 		- Cache values are not huge, consider avg size of ~4kb per value. You can deviate here and
 		  there but not go crazy with caching large values in this cache.
-		- We have hardcoded 10 minutes "local" ttl and max 1024 keys.
+		- We have hardcoded 10 minutes "local" ttl and max 4096 keys. Memory is limited by the
+		  pickled size of values, 64MB by default (`client_cache_max_bytes` in common site config).
 			You're not supposed to work with these numbers, not change them.
 		- Same keys can be accessed with `frappe.cache` too, but that won't implement invalidation.
 		- Invalidate things as usual using `delete_value`. Local invalidation should be instant.
@@ -460,16 +647,42 @@ class ClientCache:
 		  default Redis cache behaviour.
 		- Never use `frappe.cache`'s request local cache along with client-side cache. Two
 		  different copies of same key are a big source of data races.
-		- This cache uses simple FIFO eviction policy. Make sure your access patterns don't cause
-		  the worst case behaviour for this policy. E.g. looping over `maxsize` items repeatedly.
+		- This cache evicts least recently used keys first. Namespaces (key prefix before "::")
+		  can be limited to a share of the memory with `client_cache_quotas`, e.g. documents
+		  cached by `get_doc` can't use more than 25% by default, so they don't evict metas.
 	"""
 
-	def __init__(self, maxsize: int = 1024, ttl=10 * 60, monitor: RedisWrapper | None = None) -> None:
-		self.maxsize = maxsize or 1024  # Expect 1024 * 4kb objects ~ 4MB
+	def __init__(
+		self,
+		maxsize: int = CLIENT_CACHE_MAX_SIZE,
+		ttl=10 * 60,
+		monitor: RedisWrapper | None = None,
+		*,
+		max_bytes: int | None = None,
+		quotas: dict[str, float] | None = None,
+	) -> None:
+		self.maxsize = maxsize or CLIENT_CACHE_MAX_SIZE
+		self.max_bytes = (
+			max_bytes or cint(frappe.conf.get("client_cache_max_bytes")) or CLIENT_CACHE_MAX_BYTES
+		)
+		if quotas is None:
+			quotas = CLIENT_CACHE_QUOTAS | (frappe.conf.get("client_cache_quotas") or {})
+		self.quotas: dict[str, int] = {
+			namespace: int(share * self.max_bytes) for namespace, share in quotas.items() if share
+		}
 		self.local_ttl = ttl
 		# This guards writes to self.cache, reads are done without a lock.
 		self.lock = threading.RLock()
-		self.cache: dict[bytes, CachedValue] = {}
+		# Evicted in LRU order, see `_store`.
+		self.cache: OrderedDict[bytes, CachedValue] = OrderedDict()
+		self.used_bytes = 0
+		self.namespace_bytes: Counter[str] = Counter()
+		self.evictions: Counter[str] = Counter()
+		self.rejections = 0
+
+		# Database rows looked up by primary key, see `get_row`. Evicted in LRU order.
+		self.rows: OrderedDict[bytes, CachedValue] = OrderedDict()
+		self._set_row_script = None
 
 		self.invalidator = frappe.cache
 		self.healthy = True
@@ -500,15 +713,17 @@ class ClientCache:
 		)
 		self.invalidator_thread = self.run_invalidator_thread()
 
-	def get_value(self, key, *, shared=False, generator=None):
+	def get_value(self, key, *, shared=False, generator=None, single_flight=False):
 		if not self.healthy:
-			return self.redis.get_value(key, shared=shared, generator=generator)
+			return self.redis.get_value(key, shared=shared, generator=generator, single_flight=single_flight)
 
 		key = self.redis.make_key(key, shared=shared)
 		try:
 			val = self.cache[key]
 			if time.monotonic() < val.expiry:
 				self.hits += 1
+				with self.lock, suppress(KeyError):
+					self.cache.move_to_end(key)
 				return val.value
 		except KeyError:
 			pass
@@ -517,42 +732,89 @@ class ClientCache:
 
 		# Store a placeholder value to detect race between GET and parallel invalidation.
 		with self.lock:
+			self._discard(key)
 			self.cache[key] = _PLACEHOLDER_VALUE
 
-		val = self.redis.get_value(key, shared=True, use_local_cache=not self.healthy)
+		pickled = None
+		with suppress(redis.exceptions.ConnectionError):
+			pickled = self.redis.get(key)
 
 		# Note: We should not "cache" the cache-misses in client cache.
 		# This cache is long lived and "misses" are not tracked by redis so they'll never get
 		# invalidated.
-		if val is None:
-			if generator:
+		if pickled is None:
+			if not generator:
+				return None
+
+			def generate():
 				val = generator()
 				self.set_value(key, val, shared=True)
 				return val
-			else:
-				return None
 
-		self.ensure_max_size()
+			if single_flight:
+				# Values generated by another process are read from Redis on next access.
+				return self.redis.single_flight(key, lambda: self.redis._get_unpickled(key), generate)
+			return generate()
+
+		val = pickle.loads(pickled)
 		with self.lock:
 			# Note: If our placeholder value is not present then it's possible that value we just
 			# got is invalidated, so we should not store it in local cache.
 			if key in self.cache:
-				self.cache[key] = CachedValue(value=val, expiry=time.monotonic() + self.local_ttl)
+				self._store(key, val, len(pickled))
 
 		return val
 
 	def set_value(self, key, val, *, shared=False):
 		key = self.redis.make_key(key, shared=shared)
-		self.ensure_max_size()
-		self.redis.set_value(key, val, shared=True)
+		pickled = pickle.dumps(val, protocol=DEFAULT_PICKLE_PROTOCOL)
+		with suppress(redis.exceptions.ConnectionError):
+			self.redis.set(key, pickled)
 		with self.lock:
-			self.cache[key] = CachedValue(value=val, expiry=time.monotonic() + self.local_ttl)
+			self._store(key, val, len(pickled))
 		# XXX: We need to tell redis that we indeed read this key we just wrote
 		# This is an edge case:
 		# - Client A writes a key and reads it again from local cache
 		# - Client B overwrites this key, but since client A never "read" it from Redis, Redis
 		#   doesn't send invalidation.
-		_ = self.redis.get_value(key, shared=True, use_local_cache=not self.healthy)
+		with suppress(redis.exceptions.ConnectionError):
+			self.redis.get(key)
+
+	def _store(self, key: bytes, val, size: int) -> None:
+		"""Store value in local cache, evicting least recently used keys to make room for it.
+
+		Must be called with `self.lock` held."""
+		self._discard(key)
+		namespace = get_cache_namespace(key)
+		quota = self.quotas.get(namespace, self.max_bytes)
+		if size > min(quota, self.max_bytes):
+			# Don't let a single value flush the whole cache, it is still served from Redis.
+			self.rejections += 1
+			return
+
+		while self.namespace_bytes[namespace] + size > quota and self._evict(namespace):
+			pass
+		while (len(self.cache) >= self.maxsize or self.used_bytes + size > self.max_bytes) and self._evict():
+			pass
+
+		self.cache[key] = CachedValue(val, time.monotonic() + self.local_ttl, size, namespace)
+		self.used_bytes += size
+		self.namespace_bytes[namespace] += size
+
+	def _evict(self, namespace: str | None = None) -> bool:
+		"""Evict least recently used key, optionally of a namespace. Must be called with `self.lock` held."""
+		for key, val in self.cache.items():
+			if namespace is None or val.namespace == namespace:
+				self._discard(key)
+				self.evictions[val.namespace or ""] += 1
+				return True
+		return False
+
+	def _discard(self, key: bytes) -> None:
+		"""Remove key from local cache. Must be called with `self.lock` held."""
+		if (val := self.cache.pop(key, None)) and val.size:
+			self.used_bytes -= val.size
+			self.namespace_bytes[val.namespace] -= val.size
 
 	def get_doc(self, doctype: str, name: str | None = None):
 		"""Utility to fetch and store documents in client cache.
@@ -565,23 +827,127 @@ class ClientCache:
 		key = frappe.get_document_cache_key(doctype, name)
 		return self.get_value(key, generator=lambda: frappe.get_doc(doctype, name))
 
-	def ensure_max_size(self):
-		if len(self.cache) >= self.maxsize:
-			with self.lock, suppress(RuntimeError):
-				self.cache.pop(next(iter(self.cache)), None)
+	def get_row(
+		self,
+		doctype: str,
+		name: str,
+		generator: Callable[[], dict | None],
+		*,
+		maxsize: int,
+		snapshot_time: float,
+	) -> dict | None:
+		"""Return a database row from worker memory, call `generator` to fetch it on cache miss.
+
+		Rows are shared across workers through Redis and invalidated using client side tracking.
+		Missing rows (`generator` returned `None`) are cached too, but only for a minute.
+		Local store is limited to `maxsize` rows, least recently used rows are evicted first.
+
+		`snapshot_time` is the latest time at which the transaction `generator` reads in could have
+		started. A row read from an older snapshot can predate a commit whose invalidation already
+		ran, it is returned but not cached if the row was invalidated after that time.
+		"""
+		if not self.healthy:
+			return generator()
+
+		key = self.redis.make_key(get_row_cache_key(doctype, name))
+		val = self.rows.get(key)
+		if val and time.monotonic() < val.expiry:
+			self.hits += 1
+			with self.lock, suppress(KeyError):
+				self.rows.move_to_end(key)
+			return val.value
+
+		self.misses += 1
+
+		# Store a placeholder value to detect race between GET and parallel invalidation.
+		with self.lock:
+			self.rows[key] = _PLACEHOLDER_VALUE
+
+		cached = None
+		with suppress(redis.exceptions.ConnectionError):
+			cached = self.redis.get(key)
+
+		if cached is not None:
+			row = pickle.loads(cached)
+		else:
+			row = generator()
+			if not self._set_row(doctype, name, key, row, snapshot_time):
+				with self.lock:
+					if self.rows.get(key) is _PLACEHOLDER_VALUE:
+						del self.rows[key]
+				return row
+
+		ttl = self.local_ttl if row is not None else NEGATIVE_ROW_CACHE_TTL
+		with self.lock:
+			if key in self.rows:
+				self.rows[key] = CachedValue(value=row, expiry=time.monotonic() + ttl)
+				self.rows.move_to_end(key)
+			while len(self.rows) > maxsize:
+				self.rows.popitem(last=False)
+
+		return row
+
+	def _set_row(self, doctype: str, name: str, key: bytes, row: dict | None, snapshot_time: float) -> bool:
+		snapshot_time -= ROW_CACHE_CLOCK_SKEW
+		if time.time() - snapshot_time >= ROW_CACHE_TTL:
+			# invalidation times expired since, can't tell if the row is stale
+			return False
+
+		if not self._set_row_script or self._set_row_script.registered_client is not self.redis:
+			self._set_row_script = self.redis.register_script(SET_ROW_SCRIPT)
+
+		ttl = ROW_CACHE_TTL if row is not None else NEGATIVE_ROW_CACHE_TTL
+		keys = [
+			key,
+			self.redis.make_key(get_row_invalidation_key(doctype, name)),
+			self.redis.make_key(get_row_invalidation_key(doctype)),
+		]
+		try:
+			args = [pickle.dumps(row, protocol=DEFAULT_PICKLE_PROTOCOL), snapshot_time, ttl]
+			if not self._set_row_script(keys=keys, args=args):
+				return False
+			# Read it back to start tracking the key, see `set_value`.
+			self.redis.get(key)
+		except redis.exceptions.ConnectionError:
+			return False
+
+		return True
+
+	def delete_rows(self, rows: list[tuple[str, str | None]]):
+		"""Invalidate rows cached using `get_row`.
+
+		Invalidation times are kept for `ROW_CACHE_TTL`, rows read before them aren't cached again.
+
+		:param rows: List of (doctype, name) pairs, name `None` invalidates all rows of DocType."""
+		keys = []
+		pipeline = self.redis.pipeline()
+		invalidated_at = time.time()
+		for doctype, name in rows:
+			if name is None:
+				keys.extend(self.redis.get_keys(get_row_cache_key(doctype, "")))
+			else:
+				keys.append(self.redis.make_key(get_row_cache_key(doctype, name)))
+			invalidation_key = self.redis.make_key(get_row_invalidation_key(doctype, name))
+			pipeline.set(invalidation_key, invalidated_at, ex=ROW_CACHE_TTL)
+
+		pipeline.execute()
+		self.redis.delete_value(keys, shared=True, make_keys=False)
+		with self.lock:
+			for key in keys:
+				self.rows.pop(key, None)
 
 	def delete_value(self, key, *, shared=False):
 		key = self.redis.make_key(key, shared=shared)
 		self.redis.delete_value(key, shared=True)
 		with self.lock:
-			self.cache.pop(key, None)
+			self._discard(key)
 
 	def delete_keys(self, pattern):
 		keys = self.redis.get_keys(pattern)
 		self.redis.delete_value(keys, shared=True, make_keys=False)
 		with self.lock:
 			for key in keys:
-				self.cache.pop(key, None)
+				self._discard(key)
 
 	def run_invalidator_thread(self):
 		self._watcher = self.invalidator.pubsub()
@@ -619,7 +985,8 @@ class ClientCache:
 			return
 		with self.lock:
 			for key in message["data"]:
-				self.cache.pop(key, None)
+				self._discard(key)
+				self.rows.pop(key, None)
 
 	def _handle_persistent_cache_invalidation(self, message):
 		import frappe.utils.caching
@@ -649,18 +1016,38 @@ class ClientCache:
 	def clear_cache(self):
 		with self.lock:
 			self.cache.clear()
+			self.rows.clear()
+			self.used_bytes = 0
+			self.namespace_bytes.clear()
 
 	@property
 	def statistics(self) -> CacheStatistics:
+		namespaces = {}
+		for val in list(self.cache.values()):
+			if val.namespace is not None:
+				stats = namespaces.setdefault(val.namespace, {"keys": 0, "bytes": 0})
+				stats["keys"] += 1
+				stats["bytes"] += val.size
+
+		for namespace, stats in namespaces.items():
+			stats["quota"] = self.quotas.get(namespace)
+			stats["evictions"] = self.evictions[namespace]
+
 		return CacheStatistics(
 			hits=self.hits,
 			misses=self.misses,
 			capacity=self.maxsize,
 			used=len(self.cache),
 			healthy=self.healthy,
-			utilization=round(len(self.cache) / self.maxsize, 2),
+			utilization=round(max(len(self.cache) / self.maxsize, self.used_bytes / self.max_bytes), 2),
 			hit_ratio=round(self.hits / (self.hits + self.misses), 2) if self.hits else None,
+			max_bytes=self.max_bytes,
+			used_bytes=self.used_bytes,
+			evictions=self.evictions.total(),
+			rejections=self.rejections,
+			namespaces=namespaces,
 		)
 
 	def reset_statistics(self):
-		self.hits = self.misses = 0
+		self.hits = self.misses = self.rejections = 0
+		self.evictions.clear()
@@ -9,9 +9,12 @@ Events:
 """
 
 import datetime
+import json
 import os
 import random
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import NoReturn
 
 from croniter import CroniterBadCronError
@@ -19,12 +22,21 @@ from filelock import FileLock, Timeout
 
 import frappe
 from frappe.utils import cint, get_bench_path, get_datetime, get_sites, now_datetime
-from frappe.utils.background_jobs import set_niceness
+from frappe.utils.background_jobs import get_enqueued_job_ids, get_redis_conn, set_niceness
 from frappe.utils.caching import redis_cache
 
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 DEFAULT_SCHEDULER_TICK = 4 * 60
 
+# Sharding of sites across scheduler processes, enabled with `scheduler_shards` in common site config.
+# Every process holds a lease on one shard in Redis and only enqueues events of sites in it.
+SHARD_LEASE_KEY = "scheduler_shard_lease|{}"
+TICK_METRICS_KEY = "scheduler_tick_metrics"
+
+_shard_token = None  # value of leases held by this process
+_shard_leases: set[int] = set()  # shards leased by this process
+_free_shards: set[int] = set()  # shards without lease in the previous tick
+
 
 def cprint(*args, **kwargs):
 	"""Prints only if called from STDOUT"""
@@ -42,18 +54,22 @@ def start_scheduler() -> NoReturn:
 	tick = get_scheduler_tick()
 	set_niceness()
 
-	lock_path = _get_scheduler_lock_file()
+	# Sharded schedulers coordinate with leases in Redis, possibly across machines
+	if get_scheduler_shards() <= 1:
+		lock_path = _get_scheduler_lock_file()
 
-	try:
-		lock = FileLock(lock_path)
-		lock.acquire(blocking=False)
-	except Timeout:
-		frappe.logger("scheduler").debug("Scheduler already running")
-		return
+		try:
+			lock = FileLock(lock_path)
+			lock.acquire(blocking=False)
+		except Timeout:
+			frappe.logger("scheduler").debug("Scheduler already running")
+			return
 
 	while True:
-		time.sleep(sleep_duration(tick))
-		enqueue_events_for_all_sites()
+		duration = sleep_duration(tick)
+		scheduled_at = time.time() + duration
+		time.sleep(duration)
+		enqueue_events_for_all_sites(scheduled_at=scheduled_at)
 
 
 def _get_scheduler_lock_file() -> True:
@@ -91,20 +107,120 @@ def sleep_duration(tick):
 	return (next_execution - now).total_seconds()
 
 
-def enqueue_events_for_all_sites() -> None:
+def enqueue_events_for_all_sites(scheduled_at: float | None = None) -> None:
 	"""Loop through sites and enqueue events that are not already queued"""
+	scheduled_at = scheduled_at or time.time()
 
 	with frappe.init_site():
 		sites = get_sites()
+		conf = frappe.get_conf()
+		shards = get_scheduler_shards()
+		workers = max(cint(conf.scheduler_workers), 1)
+		redis_conn = get_redis_conn()
+
+	leased = unserved = None
+	if shards > 1:
+		leased, unserved = _acquire_shard_leases(redis_conn, shards, get_scheduler_tick())
+		if unserved:
+			frappe.logger("scheduler").warning(
+				f"Scheduler shards {sorted(unserved)} are not served by any scheduler, "
+				"they will be taken over in the next tick"
+			)
+		if not leased:
+			frappe.logger("scheduler").debug("No free scheduler shard, skipping tick")
+			return
+		sites = [site for site in sites if get_site_shard(site, shards) in leased]
 
 	# Sites are sorted in alphabetical order, shuffle to randomize priorities
 	random.shuffle(sites)
 
-	for site in sites:
-		try:
-			enqueue_events_for_site(site=site)
-		except Exception:
-			frappe.logger("scheduler").debug(f"Failed to enqueue events for site: {site}", exc_info=True)
+	if workers > 1:
+		with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduler") as executor:
+			for _ in executor.map(_enqueue_events_for_site_safely, sites):
+				pass
+	else:
+		for site in sites:
+			_enqueue_events_for_site_safely(site)
+
+	_record_tick_metrics(redis_conn, leased, scheduled_at, len(sites), unserved)
+
+
+def _enqueue_events_for_site_safely(site: str) -> None:
+	try:
+		enqueue_events_for_site(site=site)
+	except Exception:
+		frappe.logger("scheduler").debug(f"Failed to enqueue events for site: {site}", exc_info=True)
+
+
+def get_scheduler_shards() -> int:
+	return max(cint(frappe.get_conf().scheduler_shards), 1)
+
+
+def get_site_shard(site: str, shards: int) -> int:
+	"""Shard of a site, stable across processes and restarts."""
+	return zlib.crc32(site.encode()) % shards
+
+
+def _acquire_shard_leases(redis_conn, shards: int, tick: int) -> tuple[set[int], set[int]]:
+	"""Renew leases on shards held by this process and take free ones.
+
+	A process without a shard takes one free shard right away. Shards which stay free for a whole
+	tick, e.g. because there are fewer schedulers than shards or a scheduler died, are taken over by
+	any process. Leases outlive a few ticks so that running schedulers keep their shards.
+
+	Return shards leased by this process and shards which are still not leased by any process."""
+	global _shard_token, _free_shards
+
+	ttl = 3 * tick
+	_shard_token = _shard_token or frappe.generate_hash()
+	token = _shard_token.encode()
+
+	keys = [SHARD_LEASE_KEY.format(shard) for shard in range(shards)]
+	holders = redis_conn.mget(keys)
+
+	for shard in list(_shard_leases):
+		if shard < shards and holders[shard] == token:
+			redis_conn.expire(keys[shard], ttl)
+		else:
+			_shard_leases.discard(shard)
+
+	free = [shard for shard, holder in enumerate(holders) if holder is None]
+	random.shuffle(free)
+	for shard in free:
+		if _shard_leases and shard not in _free_shards:
+			continue
+		if redis_conn.set(keys[shard], _shard_token, nx=True, ex=ttl):
+			_shard_leases.add(shard)
+
+	unserved = {shard for shard, holder in enumerate(redis_conn.mget(keys)) if holder is None}
+	_free_shards = unserved
+	return set(_shard_leases), unserved
+
+
+def _record_tick_metrics(
+	redis_conn, shards: set[int] | None, scheduled_at: float, sites: int, unserved: set[int] | None = None
+) -> None:
+	"""Record how late the tick finished compared to when it was supposed to start."""
+	finished_at = time.time()
+	metrics = {
+		"lag": round(finished_at - scheduled_at, 3),
+		"sites": sites,
+		"finished_at": finished_at,
+		"unserved_shards": sorted(unserved or ()),
+	}
+	frappe.logger("scheduler").info({"event": "scheduler_tick", "shards": sorted(shards or ()), **metrics})
+
+	try:
+		for shard in shards or (0,):
+			redis_conn.hset(TICK_METRICS_KEY, str(shard), json.dumps(metrics))
+	except Exception:
+		frappe.logger("scheduler").debug("Failed to record scheduler tick metrics", exc_info=True)
+
+
+def get_scheduler_tick_metrics() -> dict[str, dict]:
+	"""Return metrics of the last tick of every scheduler shard, lag is in seconds."""
+	metrics = get_redis_conn().hgetall(TICK_METRICS_KEY)
+	return {shard.decode(): json.loads(value) for shard, value in metrics.items()}
 
 
 def enqueue_events_for_site(site: str) -> None:
@@ -113,6 +229,10 @@ def enqueue_events_for_site(site: str) -> None:
 
 	try:
 		frappe.init(site)
+		if frappe.local.conf.scheduler_keep_db_connections:
+			# Keep an idle connection per site in the connection pool between ticks
+			frappe.local.conf.setdefault("db_connection_pool_size", 1)
+			frappe.local.conf.setdefault("db_connection_pool_idle_timeout", get_scheduler_tick() + 60)
 		frappe.connect()
 		if is_scheduler_inactive():
 			return
@@ -131,19 +251,35 @@ def enqueue_events_for_site(site: str) -> None:
 
 def enqueue_events() -> list[str] | None:
 	if schedule_jobs_based_on_activity():
-		enqueued_jobs = []
 		all_jobs = frappe.get_all("Scheduled Job Type", filters={"stopped": 0}, fields="*")
 		random.shuffle(all_jobs)
+
+		due_jobs = []
 		for job_type in all_jobs:
 			job_type = frappe.get_doc(doctype="Scheduled Job Type", **job_type)
 			try:
-				if job_type.enqueue():
-					enqueued_jobs.append(job_type.method)
+				if job_type.is_event_due():
+					due_jobs.append(job_type)
 			except CroniterBadCronError:
 				frappe.logger("scheduler").error(
 					f"Invalid Job on {frappe.local.site} - {job_type.name}", exc_info=True
 				)
 
+		# Check all due jobs in queue with a single Redis call
+		jobs_in_queue = get_enqueued_job_ids([job_type.rq_job_id for job_type in due_jobs])
+
+		enqueued_jobs = []
+		for job_type in due_jobs:
+			if job_type.rq_job_id in jobs_in_queue:
+				frappe.logger("scheduler").error(
+					f"Skipped queueing {job_type.method} because it was found in queue "
+					f"for {frappe.local.site}"
+				)
+				continue
+
+			job_type.enqueue_job()
+			enqueued_jobs.append(job_type.method)
+
 		return enqueued_jobs
 
 
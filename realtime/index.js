@@ -69,6 +69,15 @@ function get_app_handlers(app) {
 realtime.on("connection", on_connection);
 // =======================
 
+function emit_message(namespace, message) {
+	if (message.room) {
+		io.of(namespace).to(message.room).emit(message.event, message.message);
+	} else {
+		// publish to ALL sites only used for things like build event.
+		realtime.emit(message.event, message.message);
+	}
+}
+
 // Consume events sent from python via redis pub-sub channel.
 const subscriber = get_redis_subscriber();
 
@@ -77,11 +86,11 @@ const subscriber = get_redis_subscriber();
 	subscriber.subscribe("events", (message) => {
 		message = JSON.parse(message);
 		let namespace = "/" + message.namespace;
-		if (message.room) {
-			io.of(namespace).to(message.room).emit(message.event, message.message);
+		if (message.batch) {
+			// many messages of a site published together, e.g. after a transaction is committed
+			message.batch.forEach((m) => emit_message(namespace, m));
 		} else {
-			// publish to ALL sites only used for things like build event.
-			realtime.emit(message.event, message.message);
+			emit_message(namespace, message);
 		}
 	});
 })();